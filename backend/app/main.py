@@ -1,9 +1,49 @@
 """FastAPI main application entry point."""
 
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routes import accounts, transactions, chat, analytics
+from app.middleware import CompressionMiddleware, HTTPCacheMiddleware, MetricsMiddleware, ProfilingMiddleware
+from app.models.account import Account
+from app.models.transaction import EnrichedTransaction, Transaction, TransactionCategory
+from app.routes import accounts, transactions, chat, analytics, debug
+from app.services.aggregates import TransactionAggregates
+from app.services.data_version import set_data_source
+from app.services.metrics import registry
+from app.services.query_cache import query_cache_stats
+from app.services.shared_store import SharedRows, file_lock, model_columns, private_stores, shared_store_dir
+from app.services.snapshot import SnapshotError, load_snapshot, source_fingerprint, write_snapshot
+
+# Binary snapshot of the loaded stores, mapped on the next start instead of
+# reloading the fixtures (unset = always load them, or share one in
+# SHARED_STORE_DIR when that is set)
+DATA_SNAPSHOT_PATH = os.getenv("DATA_SNAPSHOT_PATH")
+
+# Modules generating the startup data; editing any of them invalidates the snapshot
+_FIXTURE_SOURCES = sorted((Path(__file__).resolve().parents[1] / "tests" / "fixtures").glob("mock_*.py"))
+
+# Code the snapshot contents depend on: row models, the enriched transform,
+# the rollup tables, the file format and this module's save and restore
+_APP = Path(__file__).resolve().parent
+_CODE_SOURCES = sorted(_APP.glob("models/*.py")) + [
+    _APP / "routes" / "analytics.py",
+    _APP / "services" / "aggregates.py",
+    _APP / "services" / "shared_store.py",
+    _APP / "services" / "snapshot.py",
+    _APP / "main.py",
+]
+
+
+def data_source_fingerprint() -> str:
+    """Fingerprint of everything a data snapshot is built from: fixtures, code and stored columns."""
+    columns = {model.__name__: model_columns(model) for model in (Transaction, EnrichedTransaction, Account)}
+    return source_fingerprint(_FIXTURE_SOURCES + _CODE_SOURCES, extra=json.dumps(columns, sort_keys=True))
 
 app = FastAPI(
     title="Finance Dashboard API",
@@ -11,7 +51,19 @@ app = FastAPI(
     version="1.0.0",
 )
 
-# Configure CORS
+# Answer repeated data queries from ETags and cached response bodies
+app.add_middleware(HTTPCacheMiddleware)
+
+# Server-Timing phase breakdown, and cProfile on "X-Profile: 1" when enabled
+app.add_middleware(ProfilingMiddleware)
+
+# Compress large responses (cached ones arrive already compressed)
+app.add_middleware(CompressionMiddleware)
+
+# Per-route request counts, latency, response sizes and in-flight requests
+app.add_middleware(MetricsMiddleware)
+
+# Configure CORS (outermost, so cached and 304 responses carry CORS headers)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Configure appropriately for production
@@ -25,11 +77,106 @@ app.include_router(accounts.router, prefix="/api/v1", tags=["accounts"])
 app.include_router(transactions.router, prefix="/api/v1", tags=["transactions"])
 app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
 app.include_router(analytics.router, prefix="/api/v1", tags=["analytics"])
+app.include_router(debug.router, prefix="/debug", tags=["debug"])
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Load enriched mock data on application startup."""
+def save_data_snapshot(path: str, source: str) -> None:
+    """
+    Write the loaded stores and their rollup tables to a snapshot.
+    
+    Args:
+        path: Snapshot file
+        source: Fingerprint of the data the stores were loaded from
+    """
+    tables = {
+        "transactions": (
+            [trans.model_dump() for trans in transactions._mock_transactions],
+            model_columns(Transaction),
+        ),
+        "enriched-transactions": (
+            [trans.model_dump() for trans in analytics._mock_enriched_transactions],
+            model_columns(EnrichedTransaction),
+        ),
+        "accounts": (
+            [acc.model_dump() for acc in accounts._mock_accounts],
+            model_columns(Account),
+        ),
+    }
+    for name, table in analytics._trend_aggregates.to_tables().items():
+        tables[f"aggregates.{name}"] = table
+    
+    # Transactions valued up to the oldest of the latest snapshots are
+    # ignored by balance reconstruction; only later ones are replayed
+    latest = {}
+    for acc in accounts._mock_accounts:
+        latest[acc.iban] = max(latest.get(acc.iban, acc.date), acc.date)
+    meta = {"reconstruct_from": min(latest.values()) if latest else None}
+    write_snapshot(path, tables, source=source, meta=meta)
+
+
+def load_data_snapshot(path: str, source: str) -> int:
+    """
+    Load the stores from a snapshot written by save_data_snapshot.
+    
+    Stores are mapped rather than parsed: rows are read from the snapshot
+    columns on access, and the rollup tables are restored as stored.
+    
+    Args:
+        path: Snapshot file
+        source: Fingerprint of the current source data
+    
+    Returns:
+        Number of transactions applied after the latest balance snapshots
+    
+    Raises:
+        SnapshotError: The snapshot is missing, corrupt, stale or cannot be restored
+    """
+    snapshot = load_snapshot(path, source)
+    try:
+        return _restore_stores(snapshot)
+    except Exception as error:
+        # A snapshot with a valid checksum can still lack a table or column
+        # the current code expects: rebuild it rather than fail to start
+        raise SnapshotError(f"cannot restore {path}: {error!r}") from error
+
+
+def _restore_stores(snapshot) -> int:
+    """Set the stores from the tables of a snapshot written by save_data_snapshot."""
+    tables = snapshot.tables
+    aggregates = TransactionAggregates.from_tables(
+        {name[len("aggregates."):]: table for name, table in tables.items() if name.startswith("aggregates.")},
+        TransactionCategory,
+    )
+    transactions.set_mock_transactions(SharedRows(tables["transactions"], Transaction))
+    analytics.set_mock_enriched_transactions(
+        SharedRows(tables["enriched-transactions"], EnrichedTransaction), aggregates
+    )
+    accounts.set_mock_accounts(SharedRows(tables["accounts"], Account))
+    
+    # Without balance snapshots there is nothing to reconstruct from
+    reconstruct_from = snapshot.meta.get("reconstruct_from")
+    if reconstruct_from is None:
+        return accounts.ingest_transactions([])
+    stored = tables["transactions"]
+    pending = stored.between("value_date", reconstruct_from, "9999-12-31")
+    return accounts.ingest_transactions(stored.records(pending))
+
+
+def _snapshot_path() -> Optional[str]:
+    """Data snapshot file: DATA_SNAPSHOT_PATH, else one in the shared store directory."""
+    if DATA_SNAPSHOT_PATH:
+        return DATA_SNAPSHOT_PATH
+    directory = shared_store_dir()
+    return os.path.join(directory, "data.snap") if directory else None
+
+
+def _load_fixtures() -> int:
+    """
+    Load the fixture data into the stores.
+    
+    Returns:
+        Number of transactions applied after the latest balance snapshots
+    """
     try:
         from tests.fixtures import (
             MOCK_ACCOUNTS_TIMELINE_30_DAYS,
@@ -44,6 +191,9 @@ async def startup_event():
         # Load 60-day timeline data for balance charts (Dec 2025 - Jan 2026)
         accounts.set_mock_accounts(MOCK_ACCOUNTS_TIMELINE_30_DAYS)
         
+        # Derive fresh balances from transactions posted after the latest snapshots
+        reconstructed = accounts.ingest_transactions(MOCK_TRANSACTIONS_ENRICHED)
+        
         # Validate data loaded successfully
         if not MOCK_TRANSACTIONS_ENRICHED:
             raise RuntimeError("MOCK_TRANSACTIONS_ENRICHED is empty")
@@ -53,18 +203,60 @@ async def startup_event():
         print("✓ Loaded enriched mock data:")
         print(f"  - {len(MOCK_TRANSACTIONS_ENRICHED)} enriched transactions")
         print(f"  - {len(MOCK_ACCOUNTS_TIMELINE_30_DAYS)} account balance records (60-day timeline)")
+        print(f"  - {reconstructed} transactions applied after the latest balance snapshots")
         
         # Display date range
         transaction_dates = [t["operation_date"] for t in MOCK_TRANSACTIONS_ENRICHED]
         account_dates = [a["date"] for a in MOCK_ACCOUNTS_TIMELINE_30_DAYS]
         print(f"  - Transactions: {min(transaction_dates)} to {max(transaction_dates)}")
         print(f"  - Account balances: {min(account_dates)} to {max(account_dates)}")
+        return reconstructed
     except Exception as e:
         print(f"⚠ ERROR: Could not load enriched mock data: {e}")
         print("  API will not function correctly without data.")
         raise  # Fail fast to prevent running with empty data
 
 
+@app.on_event("startup")
+async def startup_event():
+    """Load enriched mock data on application startup."""
+    source = data_source_fingerprint()
+    _load_stores(source)
+    # Workers and restarts holding the same data then hand out the same ETags
+    set_data_source(source)
+
+
+def _load_stores(source: str) -> None:
+    """Load the stores from the data snapshot, if any, or from the fixtures."""
+    path = _snapshot_path()
+    if not path:
+        _load_fixtures()
+        return
+    
+    # Workers starting together wait for the first one to build the snapshot,
+    # then map it: fixtures are generated and transformed once in all
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(Path(f"{path}.lock")):
+        try:
+            reconstructed = load_data_snapshot(path, source)
+        except SnapshotError as e:
+            print(f"  Rebuilding data snapshot: {e}")
+        else:
+            print(f"✓ Mapped data snapshot {path}:")
+            print(f"  - {len(analytics._mock_enriched_transactions)} enriched transactions")
+            print(f"  - {len(accounts._mock_accounts)} account balance records")
+            print(f"  - {reconstructed} transactions applied after the latest balance snapshots")
+            return
+        
+        with private_stores():
+            _load_fixtures()
+        save_data_snapshot(path, source)
+        print(f"  - Saved data snapshot to {path}")
+        if shared_store_dir():
+            # Map it like the other workers instead of keeping private copies
+            load_data_snapshot(path, source)
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -75,3 +267,15 @@ async def root():
 async def health():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss statistics of the query-result caches, by route."""
+    return {"query_caches": query_cache_stats()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
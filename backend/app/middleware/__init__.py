@@ -0,0 +1,14 @@
+"""ASGI middleware package."""
+
+from .caching import HTTPCacheMiddleware, CACHEABLE_PATHS
+from .compression import CompressionMiddleware
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+
+__all__ = [
+    "HTTPCacheMiddleware",
+    "CACHEABLE_PATHS",
+    "CompressionMiddleware",
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
+]
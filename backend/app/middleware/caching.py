@@ -0,0 +1,265 @@
+"""HTTP response caching with ETags tied to the data version."""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode
+
+from ..services.data_version import current_data_version, data_tag
+from ..services.metrics import http_cache_requests
+from .compression import MINIMUM_SIZE, SUPPORTED_ENCODINGS, compress, is_compressible, request_encoding
+
+
+# GET endpoints whose responses only depend on the query and the store data
+CACHEABLE_PATHS = (
+    "/api/v1/bank-account-balances",
+    "/api/v1/bank-account-balances/series",
+    "/api/v1/bank-account-balances/as-of",
+    "/api/v1/bank-account-balances/reconstructed",
+    "/api/v1/bank-transactions",
+    "/api/v1/balance-summary",
+    "/api/v1/balance-summary/grouped",
+    "/api/v1/transactions/enriched",
+    "/api/v1/transactions/trends",
+    "/api/v1/transactions/trends/series",
+    "/api/v1/transactions/categories/breakdown",
+    "/api/v1/categories",
+)
+
+# Response headers recomputed for every replay of a cached body; the
+# endpoint's other headers are stored with the body
+_REPLAY_HEADERS = frozenset((b"content-length", b"content-encoding", b"etag", b"vary", b"cache-control"))
+
+
+@dataclass
+class CachedResponse:
+    """Serialized response kept in the cache."""
+
+    etag: str
+    body: bytes
+    headers: list[tuple[bytes, bytes]]
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        """Bytes held by the raw body and its compressed variants."""
+        return len(self.body) + sum(len(data) for data in self.encoded.values())
+
+
+class ResponseCache:
+    """Bounded LRU of serialized responses, limited by entry count and bytes."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: int) -> Optional[CachedResponse]:
+        """Return a cached response of the current data version, if any."""
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, version: int, entry: CachedResponse) -> None:
+        """Store a response, evicting least recently used ones over the limits."""
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            self._check_version(version)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self._evict()
+
+    def add_encoding(self, key: str, entry: CachedResponse, encoding: str, data: bytes) -> None:
+        """Attach a compressed variant to a cached response."""
+        with self._lock:
+            if encoding in entry.encoded:
+                return
+            entry.encoded[encoding] = data
+            if self._entries.get(key) is entry:
+                self._bytes += len(data)
+                self._evict()
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until within the limits."""
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+    def _check_version(self, version: int) -> None:
+        """Drop entries computed from an older data version."""
+        if version != self._version:
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+
+
+def cache_key(path: str, query_string: bytes) -> str:
+    """
+    Build a cache key from a path and its normalized query parameters.
+
+    Parameters are sorted by name; repeated parameters keep their relative
+    order since it can be meaningful (e.g. aligned as-of dates).
+    """
+    params = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    params.sort(key=lambda item: item[0])
+    return f"{path}?{urlencode(params)}"
+
+
+def compute_etag(key: str, tag: str) -> str:
+    """Strong ETag of a cache key for the data identified by a data tag."""
+    digest = hashlib.sha1(f"{tag}:{key}".encode("utf-8")).hexdigest()[:24]
+    return f'"{digest}"'
+
+
+def representation_etag(etag: str, encoding: Optional[str]) -> str:
+    """ETag of a content-encoded representation of a response."""
+    return f'{etag[:-1]}-{encoding}"' if encoding else etag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """True if an If-None-Match header value matches an ETag."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class HTTPCacheMiddleware:
+    """
+    Answer repeated GET requests from ETags and an in-process response cache.
+
+    The ETag of a request is derived from its path, normalized query and the
+    data tag (the data version plus a per-process nonce, see
+    `data_tag`), so it is known before any computation: a matching
+    If-None-Match gets a 304 immediately, and a cached body is replayed
+    without running the endpoint. Entries of older data versions are
+    dropped as soon as the version changes.
+
+    Compressed variants of a cached body are stored next to the raw bytes
+    the first time a client negotiates them, so hot responses are not
+    recompressed on every hit. Each encoding gets its own ETag.
+    """
+
+    def __init__(
+        self,
+        app,
+        paths=CACHEABLE_PATHS,
+        cache: Optional[ResponseCache] = None,
+        minimum_size: int = MINIMUM_SIZE,
+    ):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.minimum_size = minimum_size
+        self.cache = cache or ResponseCache(
+            max_entries=int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "256")),
+            max_bytes=int(os.getenv("HTTP_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+        )
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or scope["path"] not in self.paths
+            or scope.get("profile_id") is not None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        version = current_data_version()
+        key = cache_key(scope["path"], scope.get("query_string", b""))
+        etag = compute_etag(key, data_tag(version))
+        encoding = request_encoding(scope)
+
+        request_headers = dict(scope.get("headers", []))
+        if_none_match = request_headers.get(b"if-none-match")
+        if if_none_match:
+            if_none_match = if_none_match.decode("latin-1")
+            for candidate in (None, *SUPPORTED_ENCODINGS):
+                matched = representation_etag(etag, candidate)
+                if etag_matches(if_none_match, matched):
+                    http_cache_requests.inc(result="not_modified")
+                    validators = [(b"etag", matched.encode("latin-1")), (b"cache-control", b"no-cache")]
+                    await send({"type": "http.response.start", "status": 304, "headers": validators})
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+
+        entry = self.cache.get(key, version)
+        if entry is not None:
+            http_cache_requests.inc(result="hit")
+            await self._send_entry(send, key, entry, encoding, b"HIT")
+            return
+
+        start_message = None
+        chunks = []
+
+        async def capture(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+
+        body = b"".join(chunks)
+        if start_message is None:
+            return
+        if start_message["status"] != 200:
+            http_cache_requests.inc(result="bypass")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        stored = [(name, value) for name, value in start_message.get("headers", []) if name not in _REPLAY_HEADERS]
+        http_cache_requests.inc(result="miss")
+        entry = CachedResponse(etag=etag, body=body, headers=stored)
+        self.cache.put(key, version, entry)
+        await self._send_entry(send, key, entry, encoding, b"MISS")
+
+    async def _send_entry(self, send, key: str, entry: CachedResponse, encoding: Optional[str], status: bytes) -> None:
+        """Send a cached response, compressed if negotiated, with its validators."""
+        body = entry.body
+        headers = list(entry.headers)
+        if encoding is not None and len(body) >= self.minimum_size and is_compressible(headers):
+            data = entry.encoded.get(encoding)
+            if data is None:
+                data = compress(body, encoding)
+                self.cache.add_encoding(key, entry, encoding, data)
+            body = data
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+        else:
+            encoding = None
+        if encoding is not None or is_compressible(entry.headers):
+            headers.append((b"vary", b"Accept-Encoding"))
+
+        headers += [
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"etag", representation_etag(entry.etag, encoding).encode("latin-1")),
+            (b"cache-control", b"no-cache"),
+            (b"x-cache", status),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,139 @@
+"""Response compression with Accept-Encoding negotiation."""
+
+import gzip
+import os
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+# Responses smaller than this are sent as-is
+MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+
+# Encodings we can produce, in order of preference
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Media types worth compressing
+_COMPRESSIBLE_TYPES = (b"application/json", b"text/")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the preferred supported encoding accepted by a client.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+
+    Returns:
+        "br" or "gzip", or None to send the identity encoding
+    """
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body with an encoding returned by negotiate_encoding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def is_compressible(headers: list[tuple[bytes, bytes]]) -> bool:
+    """True if a response is a compressible media type not already encoded."""
+    content_type = b""
+    for name, value in headers:
+        if name == b"content-encoding":
+            return False
+        if name == b"content-type":
+            content_type = value
+    return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+def request_encoding(scope) -> Optional[str]:
+    """Encoding negotiated from a request's Accept-Encoding header."""
+    for name, value in scope.get("headers", []):
+        if name == b"accept-encoding":
+            return negotiate_encoding(value.decode("latin-1"))
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Compress complete responses above a size threshold.
+
+    Responses that already carry a Content-Encoding (e.g. precompressed
+    bodies replayed by the HTTP cache) are passed through, and streamed
+    responses are never buffered, so event streams keep flowing.
+    """
+
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = request_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                passthrough = not is_compressible(message.get("headers", []))
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = [
+                (name, value) for name, value in start_message.get("headers", [])
+                if name not in (b"content-length", b"vary")
+            ]
+            headers.append((b"vary", b"Accept-Encoding"))
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streamed or small: send unchanged
+                passthrough = True
+                if not message.get("more_body", False):
+                    headers.append((b"content-length", str(len(body)).encode("latin-1")))
+                await send({**start_message, "headers": headers})
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+            headers.append((b"content-length", str(len(body)).encode("latin-1")))
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, compressing_send)
@@ -0,0 +1,75 @@
+"""Per-route HTTP request metrics."""
+
+import time
+
+from ..services.metrics import (
+    http_request_duration,
+    http_requests,
+    http_requests_in_flight,
+    http_response_size,
+)
+from .caching import CACHEABLE_PATHS
+
+
+class MetricsMiddleware:
+    """
+    Record request counts, latency, response size and in-flight requests.
+
+    Requests are labelled with their route template (e.g.
+    /api/v1/chat/history/{session_id}) to keep label cardinality bounded.
+    Requests answered before routing (HTTP cache hits and 304s) are
+    labelled with their path, which is fixed for cacheable endpoints;
+    anything else unrouted is labelled "unmatched".
+    """
+
+    def __init__(self, app, static_paths=CACHEABLE_PATHS):
+        self.app = app
+        self.static_paths = frozenset(static_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        size = 0
+
+        async def measuring_send(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc(method=method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, measuring_send)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec(method=method)
+            route = self._route_label(scope)
+            http_requests.inc(method=method, route=route, status=status)
+            http_request_duration.observe(elapsed, method=method, route=route)
+            http_response_size.observe(size, method=method, route=route)
+
+    def _route_label(self, scope) -> str:
+        """Route template of a request, bounded to known routes."""
+        route = scope.get("route")
+        if route is not None and hasattr(route, "path"):
+            # Router prefixes may or may not be part of the route's own path:
+            # rebuild the full template from the concrete request path
+            template = getattr(route, "path_format", route.path)
+            try:
+                concrete = template.format(**scope.get("path_params", {}))
+            except (KeyError, IndexError, ValueError):
+                return template
+            path = scope["path"]
+            if path.endswith(concrete):
+                return path[:len(path) - len(concrete)] + template
+            return template
+        if scope["path"] in self.static_paths:
+            return scope["path"]
+        return "unmatched"
@@ -0,0 +1,87 @@
+"""Server-Timing phase headers and opt-in per-request profiling."""
+
+import cProfile
+import time
+
+from ..services.profiling import (
+    new_profile_id,
+    profile_artifact,
+    profile_store,
+    profiling_enabled,
+    server_timing_header,
+    start_phase_timing,
+)
+from ..services.query_cache import bypass_query_caches
+
+
+# Request header asking for a profile of the request
+PROFILE_HEADER = b"x-profile"
+
+
+class ProfilingMiddleware:
+    """
+    Report where request time goes.
+
+    Every request collects the phases timed with services.profiling.span
+    (store lookup, filtering, aggregation) and returns them in a
+    Server-Timing header, along with "serialize" (time to the response
+    start not covered by a phase: validation, serialization and framework
+    overhead) and "total".
+
+    When profiling is enabled (PROFILING_ENABLED or the admin switch), a
+    request sent with an "X-Profile: 1" header also runs under cProfile;
+    the artifact is stored and its id returned in X-Profile-Id. Profiled
+    requests bypass the HTTP response and query caches. Note that cProfile sees every
+    coroutine run on the event loop meanwhile.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._profiling = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        phases = start_phase_timing()
+        profile_id = None
+        requested = dict(scope.get("headers", [])).get(PROFILE_HEADER, b"0") not in (b"", b"0")
+        if requested and profiling_enabled() and not self._profiling:
+            # One profiler at a time: concurrent requests run unprofiled
+            profile_id = new_profile_id()
+
+        start = time.perf_counter()
+
+        async def timing_send(message):
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - start
+                timings = dict(phases)
+                timings["serialize"] = max(elapsed - sum(phases.values()), 0.0)
+                timings["total"] = elapsed
+                headers = [
+                    *message.get("headers", []),
+                    (b"server-timing", server_timing_header(timings).encode("latin-1")),
+                ]
+                if profile_id is not None:
+                    headers.append((b"x-profile-id", profile_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        if profile_id is None:
+            await self.app(scope, receive, timing_send)
+            return
+
+        # Let the response and query caches step aside so the endpoint actually runs
+        scope["profile_id"] = profile_id
+        bypass_query_caches()
+        self._profiling = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, timing_send)
+        finally:
+            profiler.disable()
+            self._profiling = False
+            bypass_query_caches(False)
+            profile_store.add(profile_artifact(profiler, profile_id, scope, time.perf_counter() - start))
@@ -1,6 +1,17 @@
 """Models package."""
 
-from .account import Account, AccountResponse, AccountQueryParams, BalanceSummary
+from .account import (
+    Account,
+    BalanceRecord,
+    AccountResponse,
+    AccountQueryParams,
+    BalanceSummary,
+    ReconstructedBalance,
+    BalancePoint,
+    BalanceSeries,
+    BalanceGroup,
+    GroupedBalanceSummary,
+)
 from .transaction import (
     Transaction,
     TransactionResponse,
@@ -8,18 +19,26 @@ from .transaction import (
     TransactionCategory,
     EnrichedTransaction,
 )
+from .dimensions import AccountInfo
 from .chat import ChatMessage, ChatSession, ChatRequest, ChatResponse
 
 __all__ = [
     "Account",
+    "BalanceRecord",
     "AccountResponse",
     "AccountQueryParams",
     "BalanceSummary",
+    "ReconstructedBalance",
+    "BalancePoint",
+    "BalanceSeries",
+    "BalanceGroup",
+    "GroupedBalanceSummary",
     "Transaction",
     "TransactionResponse",
     "TransactionQueryParams",
     "TransactionCategory",
     "EnrichedTransaction",
+    "AccountInfo",
     "ChatMessage",
     "ChatSession",
     "ChatRequest",
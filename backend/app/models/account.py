@@ -3,20 +3,60 @@
 from datetime import date
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field, model_validator
+
+from .dates import date_ordinal
+from .dimensions import account_dimension, intern_account
 
 
 class Account(BaseModel):
-    """Bank account model."""
+    """Bank account balance model.
 
-    account_description: str = Field(..., description="Account description")
-    iban: str = Field(..., description="International Bank Account Number")
-    holder_company_name: str = Field(..., description="Account holder company name")
+    The account strings live once in the account dimension: records keep
+    its `account_id` and join them back when serialized.
+    """
+
+    account_id: int = Field(..., exclude=True, description="Account identifier in the account dimension")
     date: str = Field(..., description="Date of the balance (YYYY-MM-DD)")
     value_balance: float = Field(..., description="Account balance value")
-    currency: str = Field(..., description="Currency code (e.g., EUR, USD)")
     allowed_overdraft: float = Field(default=0.0, description="Allowed overdraft amount")
 
+    # `date` as a day ordinal, parsed once when the record is validated
+    _date_ordinal: int = PrivateAttr(default=0)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _intern_account(cls, data):
+        return intern_account(data, "account_description", "holder_company_name")
+
+    def model_post_init(self, __context) -> None:
+        self._date_ordinal = date_ordinal(self.date)
+
+    @computed_field(description="Account description")
+    @property
+    def account_description(self) -> str:
+        return account_dimension.get(self.account_id).account
+
+    @computed_field(description="International Bank Account Number")
+    @property
+    def iban(self) -> str:
+        return account_dimension.get(self.account_id).iban
+
+    @computed_field(description="Account holder company name")
+    @property
+    def holder_company_name(self) -> str:
+        return account_dimension.get(self.account_id).company
+
+    @computed_field(description="Currency code (e.g., EUR, USD)")
+    @property
+    def currency(self) -> str:
+        return account_dimension.get(self.account_id).currency
+
+    @property
+    def date_ordinal(self) -> int:
+        """Day ordinal of the balance date, for integer comparisons."""
+        return self._date_ordinal
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -31,6 +71,18 @@ class Account(BaseModel):
         }
 
 
+class BalanceRecord(BaseModel):
+    """Balance record as loaded into the store (request body of new balances)."""
+
+    account_description: str = Field(..., description="Account description")
+    iban: str = Field(..., description="International Bank Account Number")
+    holder_company_name: str = Field(..., description="Account holder company name")
+    date: str = Field(..., description="Date of the balance (YYYY-MM-DD)")
+    value_balance: float = Field(..., description="Account balance value")
+    currency: str = Field(..., description="Currency code (e.g., EUR, USD)")
+    allowed_overdraft: float = Field(default=0.0, description="Allowed overdraft amount")
+
+
 class AccountResponse(BaseModel):
     """Account response model with renamed fields."""
 
@@ -43,6 +95,34 @@ class AccountResponse(BaseModel):
     allowed_overdraft: float = Field(default=0.0, description="Allowed overdraft amount")
 
 
+class ReconstructedBalance(AccountResponse):
+    """Account balance derived from the latest snapshot and later transactions."""
+
+    source: str = Field(..., description="'snapshot' or 'reconstructed' from transactions")
+    anchor_date: str = Field(..., description="Date of the snapshot the balance is anchored on")
+    transactions_applied: int = Field(default=0, description="Transactions applied since the anchor")
+    intraday: list[float] = Field(default_factory=list, description="Running balance after each movement of the day")
+
+
+class BalancePoint(BaseModel):
+    """Single point of a balance time series."""
+
+    date: str = Field(..., description="Date of the balance (YYYY-MM-DD)")
+    balance: float = Field(..., description="Account balance value")
+
+
+class BalanceSeries(BaseModel):
+    """Downsampled balance time series for one account."""
+
+    account: str = Field(..., description="Account description")
+    iban: str = Field(..., description="International Bank Account Number")
+    company: str = Field(..., description="Account holder company name")
+    currency: str = Field(..., description="Currency code")
+    allowed_overdraft: float = Field(default=0.0, description="Allowed overdraft amount")
+    total_points: int = Field(..., description="Number of snapshots before downsampling")
+    points: list[BalancePoint] = Field(default_factory=list, description="Downsampled balance points")
+
+
 class AccountQueryParams(BaseModel):
     """Query parameters for account endpoint."""
 
@@ -78,3 +158,48 @@ class BalanceSummary(BaseModel):
                 "accounts": [],
             }
         }
+
+
+class BalanceGroup(BaseModel):
+    """Balance statistics for one group of accounts."""
+
+    key: str = Field(..., description="Group value (company name, currency code or account IBAN)")
+    currency: str = Field(..., description="Currency of the amounts, or MIXED if unconverted currencies differ")
+    account_count: int = Field(..., description="Number of balance records in the group")
+    total_balance: float = Field(..., description="Sum of balances")
+    highest_balance: float = Field(..., description="Highest balance")
+    lowest_balance: float = Field(..., description="Lowest balance")
+    average_balance: float = Field(..., description="Average balance")
+    total_overdraft_allowed: float = Field(default=0.0, description="Total allowed overdraft")
+
+
+class GroupedBalanceSummary(BaseModel):
+    """Balance summaries grouped by company, currency and account."""
+
+    date: str = Field(..., description="Date of the summary (YYYY-MM-DD)")
+    currency: Optional[str] = Field(None, description="Reporting currency, if amounts were converted")
+    groups: dict[str, list[BalanceGroup]] = Field(
+        default_factory=dict, description="Group summaries keyed by grouping dimension"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "date": "2026-01-15",
+                "currency": "EUR",
+                "groups": {
+                    "company": [
+                        {
+                            "key": "ACME Corporation",
+                            "currency": "EUR",
+                            "account_count": 2,
+                            "total_balance": 650000.50,
+                            "highest_balance": 500000.00,
+                            "lowest_balance": 150000.50,
+                            "average_balance": 325000.25,
+                            "total_overdraft_allowed": 10000.0,
+                        }
+                    ],
+                },
+            }
+        }
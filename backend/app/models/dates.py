@@ -0,0 +1,41 @@
+"""Date parsing shared by the models and the query filters.
+
+Dates are exchanged as YYYY-MM-DD strings but compared as day ordinals
+(`date.toordinal()`): rows parse theirs once when they are validated, and
+query parameters go through the same memoized parser, so filters compare
+integers instead of calling `strptime` per row.
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+@lru_cache(maxsize=16384)
+def date_ordinal(value: str) -> int:
+    """
+    Day ordinal of a YYYY-MM-DD date (memoized).
+
+    Raises:
+        ValueError: The value is not a valid date in that format
+    """
+    return datetime.strptime(value, DATE_FORMAT).toordinal()
+
+
+@lru_cache(maxsize=16384)
+def parse_date(value: str) -> date:
+    """
+    `date` of a YYYY-MM-DD date (memoized).
+
+    Raises:
+        ValueError: The value is not a valid date in that format
+    """
+    return date.fromordinal(date_ordinal(value))
+
+
+@lru_cache(maxsize=16384)
+def ordinal_date(ordinal: int) -> str:
+    """YYYY-MM-DD date of a day ordinal (memoized)."""
+    return date.fromordinal(ordinal).isoformat()
@@ -0,0 +1,171 @@
+"""Account and category dimensions shared by the fact rows.
+
+Balance and transaction rows used to repeat the account description, IBAN,
+holder company and currency as strings on every record. They now carry a
+small integer `account_id` into the account dimension, and the strings are
+joined back when the rows are serialized. Categories are interned the same
+way, so every enriched transaction of a category shares one instance.
+
+Both dimensions are append-only: an ID, once handed out, always designates
+the same account strings. A renamed account gets a new ID, so rows loaded
+earlier keep serializing the strings they were loaded with; listings go
+through the IDs the live stores use, one per IBAN.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, Field
+
+
+class TransactionCategory(BaseModel):
+    """Transaction category classification."""
+
+    id: str = Field(..., description="Category unique identifier")
+    name: str = Field(..., description="Category display name")
+    icon: Optional[str] = Field(None, description="Icon identifier for UI")
+    color: Optional[str] = Field(None, description="Color code for UI (e.g., #FF5733)")
+    description: Optional[str] = Field(None, description="Category description")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": "salary",
+                "name": "Salaire",
+                "icon": "money-bill-wave",
+                "color": "#28a745",
+                "description": "Revenus salariaux",
+            }
+        }
+
+
+class AccountInfo(BaseModel):
+    """Account metadata held once in the account dimension."""
+
+    id: int = Field(..., description="Account identifier in the dimension")
+    account: str = Field(..., description="Account description")
+    iban: str = Field(..., description="International Bank Account Number")
+    company: str = Field(..., description="Account holder company name")
+    currency: str = Field(..., description="Currency code")
+
+
+AccountKey = Tuple[str, str, str, str]
+
+
+class AccountDimension:
+    """Append-only table of accounts addressed by small integer IDs."""
+
+    def __init__(self):
+        self._accounts: List[AccountInfo] = []
+        self._ids: Dict[AccountKey, int] = {}
+        self._in_use: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def intern(self, account: str, iban: str, company: str, currency: str) -> int:
+        """ID of an account, adding it to the dimension on first sight."""
+        key = (account, iban, company, currency)
+        account_id = self._ids.get(key)
+        if account_id is not None:
+            return account_id
+        with self._lock:
+            account_id = self._ids.get(key)
+            if account_id is None:
+                account_id = len(self._accounts)
+                self._accounts.append(
+                    AccountInfo(id=account_id, account=account, iban=iban, company=company, currency=currency)
+                )
+                self._ids[key] = account_id
+        return account_id
+
+    def get(self, account_id: int) -> AccountInfo:
+        """Account of an ID handed out by `intern`."""
+        return self._accounts[account_id]
+
+    def all(self) -> List[AccountInfo]:
+        """Every account of the dimension, in ID order."""
+        return list(self._accounts)
+
+    def use(self, store: str, ids: Dict[str, int], replace: bool = True) -> None:
+        """
+        Record the account ID each IBAN of a store refers to.
+
+        Args:
+            store: Store name
+            ids: Account ID by IBAN
+            replace: Forget the IBANs previously recorded for the store
+        """
+        with self._lock:
+            self._in_use[store] = dict(ids) if replace else {**self._in_use.get(store, {}), **ids}
+
+    def in_use(self) -> List[AccountInfo]:
+        """
+        Accounts referred to by the live stores, one per IBAN, in ID order.
+
+        When stores disagree on the strings of an IBAN, the most recently
+        interned ones are listed.
+        """
+        latest: Dict[str, int] = {}
+        for ids in list(self._in_use.values()):
+            for iban, account_id in ids.items():
+                latest[iban] = max(latest.get(iban, account_id), account_id)
+        return [self._accounts[account_id] for account_id in sorted(latest.values())]
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+
+class CategoryDimension:
+    """Shared `TransactionCategory` instances, one per distinct category."""
+
+    def __init__(self):
+        self._categories: Dict[tuple, TransactionCategory] = {}
+        self._lock = threading.Lock()
+
+    def intern(
+        self, category: Union[TransactionCategory, dict, None]
+    ) -> Optional[TransactionCategory]:
+        """Shared instance equal to `category` (None stays None)."""
+        if category is None:
+            return None
+        if isinstance(category, TransactionCategory):
+            key = tuple(category.__dict__.values())
+        else:
+            key = tuple(category.get(name) for name in TransactionCategory.model_fields)
+        shared = self._categories.get(key)
+        if shared is not None:
+            return shared
+        with self._lock:
+            shared = self._categories.get(key)
+            if shared is None:
+                if not isinstance(category, TransactionCategory):
+                    category = TransactionCategory(**category)
+                shared = self._categories[key] = category
+        return shared
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+
+account_dimension = AccountDimension()
+category_dimension = CategoryDimension()
+
+
+def intern_account(data, description: str, company: str):
+    """
+    Add the `account_id` of a raw row, interning its account strings.
+
+    Args:
+        data: Raw row (other inputs are passed through to validation)
+        description: Key of the account description in the row
+        company: Key of the holder company name in the row
+
+    Raises:
+        ValueError: A field of the account is missing
+    """
+    if not isinstance(data, dict) or "account_id" in data:
+        return data
+    try:
+        account_id = account_dimension.intern(data[description], data["iban"], data[company], data["currency"])
+    except KeyError as exc:
+        raise ValueError(f"missing account field {exc}") from None
+    return {**data, "account_id": account_id}
@@ -3,21 +3,68 @@
 from datetime import date
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field, model_validator
+
+from .dates import date_ordinal
+from .dimensions import TransactionCategory, account_dimension, category_dimension, intern_account
 
 
 class Transaction(BaseModel):
-    """Bank transaction model."""
+    """Bank transaction model.
 
-    account_description: str = Field(..., description="Account description")
-    iban: str = Field(..., description="International Bank Account Number")
-    holder_company_name: str = Field(..., description="Account holder company name")
+    The account strings live once in the account dimension: records keep
+    its `account_id` and join them back when serialized.
+    """
+
+    account_id: int = Field(..., exclude=True, description="Account identifier in the account dimension")
     operation_date: str = Field(..., description="Operation date (YYYY-MM-DD)")
     value_date: str = Field(..., description="Value date (YYYY-MM-DD)")
     amount: float = Field(..., description="Transaction amount")
-    currency: str = Field(..., description="Currency code (e.g., EUR, USD)")
     is_debit: bool = Field(..., description="True if transaction is a debit")
 
+    # Dates as day ordinals, parsed once when the record is validated
+    _operation_ordinal: int = PrivateAttr(default=0)
+    _value_ordinal: int = PrivateAttr(default=0)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _intern_account(cls, data):
+        return intern_account(data, "account_description", "holder_company_name")
+
+    def model_post_init(self, __context) -> None:
+        self._operation_ordinal = date_ordinal(self.operation_date)
+        self._value_ordinal = date_ordinal(self.value_date)
+
+    @computed_field(description="Account description")
+    @property
+    def account_description(self) -> str:
+        return account_dimension.get(self.account_id).account
+
+    @computed_field(description="International Bank Account Number")
+    @property
+    def iban(self) -> str:
+        return account_dimension.get(self.account_id).iban
+
+    @computed_field(description="Account holder company name")
+    @property
+    def holder_company_name(self) -> str:
+        return account_dimension.get(self.account_id).company
+
+    @computed_field(description="Currency code (e.g., EUR, USD)")
+    @property
+    def currency(self) -> str:
+        return account_dimension.get(self.account_id).currency
+
+    @property
+    def operation_ordinal(self) -> int:
+        """Day ordinal of the operation date, for integer comparisons."""
+        return self._operation_ordinal
+
+    @property
+    def value_ordinal(self) -> int:
+        """Day ordinal of the value date, for integer comparisons."""
+        return self._value_ordinal
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -53,42 +100,68 @@ class TransactionQueryParams(BaseModel):
     to_date: str = Field(..., description="End date (YYYY-MM-DD)")
 
 
-class TransactionCategory(BaseModel):
-    """Transaction category classification."""
-
-    id: str = Field(..., description="Category unique identifier")
-    name: str = Field(..., description="Category display name")
-    icon: Optional[str] = Field(None, description="Icon identifier for UI")
-    color: Optional[str] = Field(None, description="Color code for UI (e.g., #FF5733)")
-    description: Optional[str] = Field(None, description="Category description")
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "salary",
-                "name": "Salaire",
-                "icon": "money-bill-wave",
-                "color": "#28a745",
-                "description": "Revenus salariaux",
-            }
-        }
-
-
 class EnrichedTransaction(BaseModel):
-    """Transaction with enriched data (category, labels)."""
+    """Transaction with enriched data (category, labels).
 
-    account: str = Field(..., description="Account description")
-    iban: str = Field(..., description="International Bank Account Number")
-    company: str = Field(..., description="Account holder company name")
+    Like `Transaction`, records keep an `account_id` into the account
+    dimension; categories are the shared instances of the category dimension.
+    """
+
+    account_id: int = Field(..., exclude=True, description="Account identifier in the account dimension")
     operation_date: str = Field(..., description="Operation date (YYYY-MM-DD)")
     value_date: str = Field(..., description="Value date (YYYY-MM-DD)")
     amount: float = Field(..., description="Transaction amount")
-    currency: str = Field(..., description="Currency code")
     is_debit: bool = Field(..., description="True if transaction is a debit")
     category: Optional[TransactionCategory] = Field(None, description="Transaction category")
     merchant: Optional[str] = Field(None, description="Detected merchant name")
     tags: list[str] = Field(default_factory=list, description="Custom tags")
 
+    # Dates as day ordinals, parsed once when the record is validated
+    _operation_ordinal: int = PrivateAttr(default=0)
+    _value_ordinal: int = PrivateAttr(default=0)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _intern_dimensions(cls, data):
+        data = intern_account(data, "account", "company")
+        if isinstance(data, dict) and data.get("category") is not None:
+            data = {**data, "category": category_dimension.intern(data["category"])}
+        return data
+
+    def model_post_init(self, __context) -> None:
+        self._operation_ordinal = date_ordinal(self.operation_date)
+        self._value_ordinal = date_ordinal(self.value_date)
+
+    @computed_field(description="Account description")
+    @property
+    def account(self) -> str:
+        return account_dimension.get(self.account_id).account
+
+    @computed_field(description="International Bank Account Number")
+    @property
+    def iban(self) -> str:
+        return account_dimension.get(self.account_id).iban
+
+    @computed_field(description="Account holder company name")
+    @property
+    def company(self) -> str:
+        return account_dimension.get(self.account_id).company
+
+    @computed_field(description="Currency code")
+    @property
+    def currency(self) -> str:
+        return account_dimension.get(self.account_id).currency
+
+    @property
+    def operation_ordinal(self) -> int:
+        """Day ordinal of the operation date, for integer comparisons."""
+        return self._operation_ordinal
+
+    @property
+    def value_ordinal(self) -> int:
+        """Day ordinal of the value date, for integer comparisons."""
+        return self._value_ordinal
+
     class Config:
         json_schema_extra = {
             "example": {
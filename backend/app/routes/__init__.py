@@ -1,5 +1,5 @@
 """Routes package."""
 
-from . import accounts, transactions, chat, analytics
+from . import accounts, transactions, chat, analytics, debug
 
-__all__ = ["accounts", "transactions", "chat", "analytics"]
+__all__ = ["accounts", "transactions", "chat", "analytics", "debug"]
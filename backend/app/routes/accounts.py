@@ -1,22 +1,112 @@
 """Account API routes."""
 
-from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from fastapi import APIRouter, Query, HTTPException
+from pydantic import ValidationError
 
-from app.models.account import Account, AccountResponse
+from app.models.account import (
+    Account,
+    AccountResponse,
+    BalanceRecord,
+    BalancePoint,
+    BalanceSeries,
+    ReconstructedBalance,
+)
+from app.models.dates import date_ordinal, ordinal_date
+from app.models.dimensions import AccountInfo, account_dimension
+from app.models.transaction import Transaction
+from app.services.alerts import AlertEngine
+from app.services.balances import BalanceIndex
+from app.services.broadcast import Broadcaster
+from app.services.data_version import bump_data_version
+from app.services.downsampling import DOWNSAMPLING_METHODS, downsample
+from app.services.profiling import span
+from app.services.query_cache import cached_query
+from app.services.reconstruction import BalanceReconstructor
+from app.services.shared_store import SharedRows, account_ids, is_shared, share_rows, shared_store_dir
 
 router = APIRouter()
 
-# In-memory storage for mock data (replace with actual database in production)
+# In-memory storage for mock data (replace with actual database in production);
+# a SharedRows view of a memory-mapped segment when SHARED_STORE_DIR is set
 _mock_accounts: List[Account] = []
 
+# Same snapshots partitioned by IBAN and sorted by date
+_balance_index = BalanceIndex()
 
-def set_mock_accounts(accounts: List[dict]):
-    """Set mock account data for testing."""
-    global _mock_accounts
-    _mock_accounts = [Account(**acc) for acc in accounts]
+# Balances derived from transactions posted after the latest snapshots
+_reconstructor = BalanceReconstructor()
+
+# Low balance alerts evaluated once per balance record as it is loaded
+alert_engine = AlertEngine()
+
+# Alert transitions pushed to streaming subscribers
+alert_broadcaster = Broadcaster()
+alert_engine.add_listener(alert_broadcaster.publish)
+
+
+def set_mock_accounts(accounts: Union[List[dict], SharedRows]):
+    """Set mock account data for testing (a SharedRows store is used as is)."""
+    global _mock_accounts, _balance_index
+    if is_shared(accounts):
+        _mock_accounts = accounts
+    elif shared_store_dir():
+        _mock_accounts = share_rows("accounts", accounts, Account)
+    else:
+        _mock_accounts = [Account(**acc) for acc in accounts]
+    _balance_index = BalanceIndex(_mock_accounts)
+    _reconstructor.reanchor(_balance_index)
+    alert_engine.reset()
+    # One account at a time, so a shared store is never materialized whole
+    for iban in _balance_index.ibans:
+        alert_engine.ingest(_balance_index.records(iban), notify=False)
+    account_dimension.use("accounts", account_ids(_mock_accounts, "account_description", "holder_company_name"))
+    bump_data_version()
+
+
+def append_mock_accounts(accounts: List[dict]) -> List[dict]:
+    """Load new balance records on top of the existing ones.
+    
+    Alert transitions produced by the new records are pushed to the
+    alert stream subscribers. Accounts receiving a record older than
+    their latest one have their alert timeline re-evaluated.
+    
+    Returns:
+        Alert transitions produced by the new records.
+    
+    Raises:
+        RuntimeError: Stores are shared across workers (SHARED_STORE_DIR),
+            which makes them read-only: rows added by one worker would not
+            be seen by the others.
+    """
+    if shared_store_dir():
+        raise RuntimeError("stores shared across workers are read-only")
+    new_accounts = [Account(**acc) for acc in accounts]
+    backdated = {acc.iban for acc in new_accounts if alert_engine.is_backdated(acc)}
+    _mock_accounts.extend(new_accounts)
+    for account in new_accounts:
+        _balance_index.add(account)
+    _reconstructor.reanchor(_balance_index)
+    transitions = alert_engine.ingest(acc for acc in new_accounts if acc.iban not in backdated)
+    for iban in backdated:
+        transitions.extend(alert_engine.reevaluate(iban, _balance_index.records(iban)))
+    account_dimension.use(
+        "accounts", account_ids(new_accounts, "account_description", "holder_company_name"), replace=False
+    )
+    bump_data_version()
+    return transitions
+
+
+def ingest_transactions(transactions: List[dict]) -> int:
+    """Feed new transactions to the balance reconstruction engine.
+    
+    Returns:
+        Number of transactions applied after the latest snapshots.
+    """
+    applied = _reconstructor.ingest(Transaction(**trans) for trans in transactions)
+    bump_data_version()
+    return applied
 
 
 def _transform_to_response(account: Account) -> AccountResponse:
@@ -32,36 +122,72 @@ def _transform_to_response(account: Account) -> AccountResponse:
     )
 
 
-@router.get("/bank-account-balances", response_model=List[AccountResponse])
-async def get_account_balances(
-    date: Optional[str] = Query(None, description="Single date query (YYYY-MM-DD)"),
-    start_date: Optional[str] = Query(None, description="Start date for range query"),
-    end_date: Optional[str] = Query(None, description="End date for range query"),
-):
-    """Get bank account balances.
+@cached_query("bank-account-balances")
+def query_account_balances(
+    date: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    as_of: bool = False,
+    iban: Optional[List[str]] = None,
+) -> List[AccountResponse]:
+    """Query account balances from the in-memory store.
     
-    Supports two modes:
-    - Single date: ?date=2026-01-15
-    - Date range: ?start_date=2026-01-01&end_date=2026-01-31
+    Plain-function counterpart of the route, for in-process callers.
+    Results are cached per parameters and data version; treat them as
+    read-only.
+    
+    Args:
+        date: Single date query (YYYY-MM-DD).
+        start_date: Start date for range query.
+        end_date: End date for range query.
+        as_of: With `date`, return each account's latest balance on or before it.
+        iban: Account IBANs to keep (all accounts if empty); balances are
+            then read from the IBAN partitions of the balance index.
     
     Returns:
         List of account balances with transformed field names.
     """
-    if date:
+    if date and as_of:
+        # Forward-filled lookup: latest snapshot per IBAN on or before the date
+        try:
+            day = date_ordinal(date)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+        
+        with span("store"):
+            filtered_accounts = _balance_index.snapshot_as_of(day, iban or None)
+    elif date:
         # Single date query
-        filtered_accounts = [acc for acc in _mock_accounts if acc.date == date]
+        with span("store"):
+            if iban:
+                # Same exact string match as without the IBAN filter
+                try:
+                    day = date_ordinal(date)
+                except ValueError:
+                    filtered_accounts = []
+                else:
+                    filtered_accounts = [
+                        acc for acc in _balance_index.select(iban, day, day) if acc.date == date
+                    ]
+            elif is_shared(_mock_accounts):
+                filtered_accounts = _mock_accounts.equal("date", date)
+            else:
+                filtered_accounts = [acc for acc in _mock_accounts if acc.date == date]
     elif start_date and end_date:
         # Date range query
         try:
-            start = datetime.strptime(start_date, "%Y-%m-%d")
-            end = datetime.strptime(end_date, "%Y-%m-%d")
+            start = date_ordinal(start_date)
+            end = date_ordinal(end_date)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
         
-        filtered_accounts = [
-            acc for acc in _mock_accounts
-            if start <= datetime.strptime(acc.date, "%Y-%m-%d") <= end
-        ]
+        with span("store"):
+            if iban:
+                filtered_accounts = _balance_index.select(iban, start, end)
+            elif is_shared(_mock_accounts):
+                filtered_accounts = _mock_accounts.between("date", ordinal_date(start), ordinal_date(end))
+            else:
+                filtered_accounts = [acc for acc in _mock_accounts if start <= acc.date_ordinal <= end]
     else:
         raise HTTPException(
             status_code=400,
@@ -70,3 +196,207 @@ async def get_account_balances(
     
     # Transform to response format
     return [_transform_to_response(acc) for acc in filtered_accounts]
+
+
+@router.get("/accounts", response_model=List[AccountInfo])
+async def get_accounts():
+    """List the accounts of the loaded balances and transactions.
+    
+    Served from the account IDs recorded when the stores were loaded,
+    without scanning balances or transactions.
+    
+    Returns:
+        One account per IBAN, in ID order, with the metadata shared by its rows.
+    """
+    return account_dimension.in_use()
+
+
+@router.get("/bank-account-balances", response_model=List[AccountResponse])
+async def get_account_balances(
+    date: Optional[str] = Query(None, description="Single date query (YYYY-MM-DD)"),
+    start_date: Optional[str] = Query(None, description="Start date for range query"),
+    end_date: Optional[str] = Query(None, description="End date for range query"),
+    as_of: bool = Query(False, description="Forward-fill: latest balance on or before 'date'"),
+    iban: Optional[List[str]] = Query(None, description="Account IBAN, repeatable (all accounts if omitted)"),
+):
+    """Get bank account balances.
+    
+    Supports three modes:
+    - Single date: ?date=2026-01-15
+    - As-of date: ?date=2026-01-17&as_of=true (latest balance on or before the date)
+    - Date range: ?start_date=2026-01-01&end_date=2026-01-31
+    
+    Each mode accepts repeatable `iban` filters, e.g.
+    ?date=2026-01-15&iban=FR76...&iban=FR76...
+    
+    Returns:
+        List of account balances with transformed field names.
+    """
+    return query_account_balances(date, start_date, end_date, as_of, iban)
+
+
+@router.post("/bank-account-balances")
+async def post_account_balances(records: List[BalanceRecord]):
+    """Load new balance records on top of the existing ones.
+    
+    The records go through the alert engine; the transitions they
+    produce are pushed to the /alerts/stream subscribers.
+    
+    Args:
+        records: New balance records.
+    
+    Returns:
+        Number of records loaded and the alert transitions they produced.
+    
+    Raises:
+        HTTPException: 409 when stores are shared across workers (read-only)
+    """
+    try:
+        transitions = append_mock_accounts([record.model_dump() for record in records])
+    except ValidationError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    except RuntimeError:
+        raise HTTPException(
+            status_code=409, detail="Balances cannot be posted while stores are shared across workers"
+        )
+    
+    return {"loaded": len(records), "transitions": transitions}
+
+
+@router.get("/bank-account-balances/as-of")
+async def get_account_balances_as_of(
+    dates: List[str] = Query(..., description="Lookup dates (YYYY-MM-DD), repeatable"),
+):
+    """Get forward-filled balances of every account for many dates at once.
+    
+    Args:
+        dates: Dates to look up; each account's latest balance on or before
+            every date is returned.
+    
+    Returns:
+        Mapping of IBAN to balances aligned with the requested dates
+        (null where the account has no snapshot yet).
+    """
+    try:
+        days = [date_ordinal(value) for value in dates]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    balances = {}
+    for iban in _balance_index.ibans:
+        records = _balance_index.as_of_many(iban, days)
+        balances[iban] = [
+            _transform_to_response(acc).model_dump() if acc is not None else None
+            for acc in records
+        ]
+    
+    return {"dates": dates, "balances": balances}
+
+
+@router.get("/bank-account-balances/series", response_model=List[BalanceSeries])
+async def get_balance_series(
+    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    points: int = Query(300, ge=2, le=5000, description="Maximum number of points per account"),
+    method: str = Query("lttb", description="Downsampling method: lttb or minmax"),
+):
+    """Get per-account balance series downsampled for charting.
+    
+    Each IBAN partition of the sorted store is sliced to the date range and
+    reduced to at most `points` points, so long horizons stay small.
+    
+    Args:
+        start_date: Start date for the series.
+        end_date: End date for the series.
+        points: Maximum number of points kept per account.
+        method: Downsampling method (lttb or minmax).
+    
+    Returns:
+        One balance series per account with data in the range.
+    """
+    try:
+        start = date_ordinal(start_date)
+        end = date_ordinal(end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    if start > end:
+        raise HTTPException(status_code=400, detail="start_date must be before or equal to end_date")
+    if method not in DOWNSAMPLING_METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid method. Use one of: {', '.join(DOWNSAMPLING_METHODS)}"
+        )
+    
+    series = []
+    for iban in _balance_index.ibans:
+        records = _balance_index.range(iban, start, end)
+        if not records:
+            continue
+        
+        xy = [(acc.date_ordinal, acc.value_balance) for acc in records]
+        kept = downsample(xy, points, method)
+        latest = records[-1]
+        
+        series.append(BalanceSeries(
+            account=latest.account_description,
+            iban=iban,
+            company=latest.holder_company_name,
+            currency=latest.currency,
+            allowed_overdraft=latest.allowed_overdraft,
+            total_points=len(records),
+            points=[BalancePoint(date=records[i].date, balance=records[i].value_balance) for i in kept],
+        ))
+    
+    return series
+
+
+@router.get("/bank-account-balances/reconstructed", response_model=List[ReconstructedBalance])
+async def get_reconstructed_balances(
+    date: str = Query(..., description="Balance date (YYYY-MM-DD)"),
+    intraday: bool = Query(False, description="Include running balances after each movement"),
+):
+    """Get balances derived from the latest snapshot plus later transactions.
+    
+    Dates up to the snapshot use the stored balances (forward-filled);
+    later dates add the signed amounts of transactions by value date.
+    
+    Args:
+        date: Date of the end-of-day balances.
+        intraday: Include the running balance after each movement of the day.
+    
+    Returns:
+        List of reconstructed balances, one per anchored account.
+    """
+    try:
+        day = date_ordinal(date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    balances = []
+    for iban in _reconstructor.ibans:
+        anchor = _reconstructor.anchor(iban)
+        if day <= anchor.date_ordinal:
+            snapshot = _balance_index.as_of(iban, day)
+            if snapshot is None:
+                continue
+            response = _transform_to_response(snapshot)
+            balances.append(ReconstructedBalance(
+                **response.model_dump(),
+                source="snapshot",
+                anchor_date=snapshot.date,
+            ))
+            continue
+        
+        response = _transform_to_response(anchor)
+        response.date = date
+        response.balance = _reconstructor.end_of_day(iban, day)
+        balances.append(ReconstructedBalance(
+            **response.model_dump(),
+            source="reconstructed",
+            anchor_date=anchor.date,
+            transactions_applied=_reconstructor.applied_count(iban, day),
+            intraday=_reconstructor.intraday(iban, day) if intraday else [],
+        ))
+    
+    return balances
@@ -1,83 +1,221 @@
 """Analytics and enrichment endpoints."""
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List
+import json
+import math
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional, List, Union
 from datetime import datetime
 
-from ..models.account import BalanceSummary
+from ..models.account import BalanceSummary, GroupedBalanceSummary
+from ..models.dates import date_ordinal, ordinal_date, parse_date
+from ..models.dimensions import account_dimension
 from ..models.transaction import EnrichedTransaction, TransactionCategory
-from ..routes.accounts import get_account_balances
-from ..routes.transactions import get_transactions
+from ..routes.accounts import query_account_balances, alert_engine, alert_broadcaster
 from ..services.analytics import (
     calculate_balance_summary,
+    calculate_grouped_balance_summary,
     detect_low_balance_alerts,
+    BALANCE_GROUP_FIELDS,
     calculate_transaction_trends,
 )
 from ..services.enrichment import enrich_transaction, filter_transactions, CATEGORIES
+from ..services.aggregates import TransactionAggregates, GRANULARITIES, GROUP_BY_FIELDS
+from ..services.fx import get_fx_rates
+from ..services.data_version import bump_data_version
+from ..services.metrics import query_rows_returned, query_rows_scanned
+from ..services.partitions import IbanPartitions
+from ..services.profiling import span
+from ..services.query_cache import cached_query, run_query
+from ..services.shared_store import SharedRows, account_ids, is_shared, share_rows, shared_store_dir
 
 router = APIRouter()
 
-# In-memory storage for enriched mock data
+# In-memory storage for enriched mock data; a SharedRows view of a
+# memory-mapped segment when SHARED_STORE_DIR is set
 _mock_enriched_transactions: List[EnrichedTransaction] = []
 
+# Same transactions partitioned by IBAN and sorted by operation date
+_partitions = IbanPartitions()
+
+# Rollup tables maintained alongside the enriched transactions
+_trend_aggregates = TransactionAggregates()
+
+# Seconds between keep-alive comments on idle alert streams
+_ALERT_STREAM_HEARTBEAT = 15.0
+
+
+def set_mock_enriched_transactions(
+    transactions: Union[List[dict], SharedRows],
+    aggregates: Optional[TransactionAggregates] = None,
+):
+    """
+    Set mock enriched transaction data for testing.
+    
+    Args:
+        transactions: Enriched transactions, as dicts, or a SharedRows
+            store (used as is, e.g. restored from a snapshot)
+        aggregates: Rollup tables of these transactions, when already
+            built; computed from the transactions otherwise
+    """
+    global _mock_enriched_transactions, _partitions, _trend_aggregates
+    if is_shared(transactions):
+        _mock_enriched_transactions = transactions
+        _partitions = IbanPartitions(transactions, "operation_date")
+        _trend_aggregates = aggregates or TransactionAggregates.from_transactions(transactions)
+        account_dimension.use("enriched-transactions", account_ids(transactions, "account", "company"))
+        bump_data_version()
+        return
 
-def set_mock_enriched_transactions(transactions: List[dict]):
-    """Set mock enriched transaction data for testing."""
-    global _mock_enriched_transactions
     print(f"  [analytics] Transforming {len(transactions)} transactions...")
     # Transform field names from mock data format to EnrichedTransaction model
-    transformed = []
-    for i, trans in enumerate(transactions):
-        try:
-            trans_copy = trans.copy()
-            # Rename fields if they exist in old format
-            if 'account_description' in trans_copy:
-                trans_copy['account'] = trans_copy.pop('account_description')
-            if 'holder_company_name' in trans_copy:
-                trans_copy['company'] = trans_copy.pop('holder_company_name')
-            
-            # Convert nested category dict to TransactionCategory object
-            if 'category' in trans_copy and isinstance(trans_copy['category'], dict):
-                trans_copy['category'] = TransactionCategory(**trans_copy['category'])
-            
-            transformed.append(EnrichedTransaction(**trans_copy))
-        except Exception as e:
-            print(f"    [analytics] Error transforming transaction {i}: {e}")
-            print(f"    [analytics] Transaction keys: {list(trans.keys())}")
-            raise
+    renamed = []
+    for trans in transactions:
+        trans_copy = trans.copy()
+        # Rename fields if they exist in old format
+        if 'account_description' in trans_copy:
+            trans_copy['account'] = trans_copy.pop('account_description')
+        if 'holder_company_name' in trans_copy:
+            trans_copy['company'] = trans_copy.pop('holder_company_name')
+        renamed.append(trans_copy)
+    
+    if shared_store_dir():
+        # Validated once by the worker building the segment, then shared
+        transformed = share_rows("enriched-transactions", renamed, EnrichedTransaction)
+    else:
+        transformed = []
+        for i, trans_copy in enumerate(renamed):
+            try:
+                # Category dicts resolve to the shared instances of the category dimension
+                transformed.append(EnrichedTransaction(**trans_copy))
+            except Exception as e:
+                print(f"    [analytics] Error transforming transaction {i}: {e}")
+                print(f"    [analytics] Transaction keys: {list(transactions[i].keys())}")
+                raise
     _mock_enriched_transactions = transformed
+    _partitions = IbanPartitions(transformed, "operation_date")
+    _trend_aggregates = aggregates or TransactionAggregates.from_transactions(transformed)
+    account_dimension.use("enriched-transactions", account_ids(transformed, "account", "company"))
+    bump_data_version()
     print(f"  [analytics] Successfully stored {len(_mock_enriched_transactions)} enriched transactions")
 
 
+@cached_query("balance-summary")
+def query_balance_summary(
+    date: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    currency: Optional[str] = None,
+    as_of: bool = False,
+) -> BalanceSummary:
+    """
+    Compute the balance summary of a date or date range.
+    
+    Plain-function counterpart of the route, for in-process callers.
+    Results are cached per parameters and data version.
+    
+    Args:
+        date: Single date for balance snapshot
+        start_date: Start date for range (requires end_date)
+        end_date: End date for range (requires start_date)
+        currency: Optional reporting currency
+        as_of: With `date`, use each account's latest balance on or before it
+        
+    Returns:
+        BalanceSummary with aggregated statistics
+    """
+    accounts = query_account_balances(date, start_date, end_date, as_of)
+    with span("aggregate"):
+        return calculate_balance_summary(accounts, date or start_date, currency)
+
+
+@cached_query("balance-summary/grouped")
+def query_grouped_balance_summary(
+    date: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    group_by: Optional[List[str]] = None,
+    currency: Optional[str] = None,
+) -> GroupedBalanceSummary:
+    """
+    Compute balance statistics grouped by company, currency and account.
+    
+    Results are cached per parameters and data version.
+    
+    Returns:
+        GroupedBalanceSummary with one list of group statistics per dimension
+    """
+    accounts = query_account_balances(date, start_date, end_date)
+    with span("aggregate"):
+        return calculate_grouped_balance_summary(accounts, group_by, date or start_date, currency)
+
+
 @router.get("/balance-summary", response_model=BalanceSummary)
 async def get_balance_summary(
     date: Optional[str] = Query(None, description="Date for summary (YYYY-MM-DD)"),
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    currency: Optional[str] = Query(None, description="Reporting currency (e.g., EUR); amounts are converted with dated FX rates"),
 ):
     """
     Get aggregated balance summary with statistics.
     
+    Computed off the event loop; concurrent identical requests share one
+    computation.
+    
     Args:
         date: Single date for balance snapshot
         start_date: Start date for range (requires end_date)
         end_date: End date for range (requires start_date)
+        currency: Optional reporting currency
         
     Returns:
         BalanceSummary with aggregated statistics
     """
+    _currency_converter(currency)
     try:
-        # Reuse existing account endpoint to get balances
-        accounts = await get_account_balances(date, start_date, end_date)
-        
-        # Calculate summary
-        summary = calculate_balance_summary(accounts, date or start_date)
-        
-        return summary
+        return await run_query(query_balance_summary, date, start_date, end_date, currency)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur calcul du résumé: {str(e)}")
 
 
+@router.get("/balance-summary/grouped", response_model=GroupedBalanceSummary)
+async def get_grouped_balance_summary(
+    date: Optional[str] = Query(None, description="Date for summary (YYYY-MM-DD)"),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    group_by: Optional[List[str]] = Query(None, description="Grouping dimensions: company, currency, account (repeatable)"),
+    currency: Optional[str] = Query(None, description="Reporting currency (e.g., EUR); amounts are converted with dated FX rates"),
+):
+    """
+    Get balance statistics grouped by company, currency and account.
+    
+    All requested groupings are computed in a single pass over the balances.
+    
+    Args:
+        date: Single date for balance snapshot
+        start_date: Start date for range (requires end_date)
+        end_date: End date for range (requires start_date)
+        group_by: Grouping dimensions (all by default)
+        currency: Optional reporting currency
+        
+    Returns:
+        GroupedBalanceSummary with one list of group statistics per dimension
+    """
+    invalid = [dimension for dimension in group_by or [] if dimension not in BALANCE_GROUP_FIELDS]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"group_by invalide: {', '.join(invalid)}. Valeurs: {', '.join(BALANCE_GROUP_FIELDS)}"
+        )
+    _currency_converter(currency)
+    try:
+        return await run_query(query_grouped_balance_summary, date, start_date, end_date, group_by, currency)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur calcul du résumé groupé: {str(e)}")
+
+
 @router.get("/alerts")
 async def get_alerts(
     threshold: float = Query(0.1, description="Alert threshold percentage (0.0-1.0)"),
@@ -86,18 +224,29 @@ async def get_alerts(
     """
     Get low balance alerts for accounts.
     
+    Alerts are computed from the latest balances on or before the date.
+    At the default threshold, the alert engine (which evaluates balances
+    once as they are loaded) narrows the lookup to the accounts in alert.
+    
     Args:
         threshold: Alert threshold as percentage of overdraft (default 0.1 = 10%)
-        date: Date for alerts (defaults to today if not provided)
+        date: Date for alerts (defaults to today)
         
     Returns:
         List of alert objects
     """
+    alert_date = date or datetime.now().strftime("%Y-%m-%d")
+    try:
+        day = date_ordinal(alert_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Format de date invalide. Utilisez YYYY-MM-DD")
     try:
-        # Get current account balances
-        from datetime import datetime
-        alert_date = date or datetime.now().strftime("%Y-%m-%d")
-        accounts = await get_account_balances(date=alert_date)
+        if math.isclose(threshold, alert_engine.threshold_percentage):
+            ibans = alert_engine.alerting_ibans(day)
+            accounts = query_account_balances(date=alert_date, as_of=True, iban=ibans) if ibans else []
+        else:
+            # Get latest known balances on or before the alert date
+            accounts = query_account_balances(date=alert_date, as_of=True)
         
         # Detect alerts
         alerts = detect_low_balance_alerts(accounts, threshold)
@@ -107,6 +256,144 @@ async def get_alerts(
         raise HTTPException(status_code=500, detail=f"Erreur détection des alertes: {str(e)}")
 
 
+@router.get("/alerts/history")
+async def get_alert_history(
+    iban: Optional[str] = Query(None, description="Filter by account IBAN"),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+):
+    """
+    Get the timeline of alert transitions (enter, escalate, deescalate, exit).
+    
+    Args:
+        iban: Optional account IBAN
+        start_date: Optional start date (YYYY-MM-DD)
+        end_date: Optional end date (YYYY-MM-DD)
+        
+    Returns:
+        List of transitions sorted by date
+    """
+    try:
+        start = date_ordinal(start_date) if start_date else None
+        end = date_ordinal(end_date) if end_date else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Format de date invalide. Utilisez YYYY-MM-DD")
+    transitions = alert_engine.history(iban, start, end)
+    return {"transitions": transitions, "count": len(transitions)}
+
+
+@router.get("/alerts/stream")
+async def stream_alerts(request: Request):
+    """
+    Stream alert transitions as Server-Sent Events.
+    
+    Sends the currently active alerts as a "snapshot" event, then one
+    "alert" event per transition produced when new balances are loaded.
+    Slow clients lose their oldest pending events rather than blocking
+    others; each event reports how many were dropped before it.
+    
+    Returns:
+        text/event-stream response
+    """
+    async def events():
+        # Subscribed once the response starts, so an unsent response holds
+        # no subscription; before the snapshot, so no transition is missed
+        subscription = alert_broadcaster.subscribe()
+        try:
+            active = alert_engine.active_alerts()
+            yield _sse_event("snapshot", {"alerts": active, "count": len(active)})
+            while not await request.is_disconnected():
+                item = await subscription.get(timeout=_ALERT_STREAM_HEARTBEAT)
+                if item is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                transition, dropped = item
+                yield _sse_event("alert", {**transition, "dropped": dropped})
+        finally:
+            subscription.close()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _currency_converter(currency: Optional[str]):
+    """Build an aggregate converter into a reporting currency, or None.
+    
+    Raises:
+        HTTPException: 400 if the currency has no FX rates
+    """
+    if not currency:
+        return None
+    fx = get_fx_rates()
+    if not fx.supports(currency):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Devise non supportée: {currency}. Valeurs: {', '.join(fx.currencies)}"
+        )
+    return lambda source, day: fx.factor(source, currency, day.isoformat())
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@cached_query("transactions/enriched")
+def query_enriched_transactions(
+    from_date: str,
+    to_date: str,
+    category: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    is_debit: Optional[bool] = None,
+    iban: Optional[List[str]] = None,
+) -> List[EnrichedTransaction]:
+    """
+    Select enriched transactions of a date range, with optional filters.
+    
+    Results are cached per parameters and data version; treat them as
+    read-only. With `iban`, rows are read from the IBAN partitions only
+    and come in operation date order.
+    
+    Returns:
+        List of enriched transactions
+    """
+    # Parse dates for filtering
+    start = date_ordinal(from_date)
+    end = date_ordinal(to_date)
+    
+    # Use pre-enriched transactions from mock data (preserves categories)
+    with span("store"):
+        if iban:
+            enriched = _partitions.select(iban, start, end)
+        elif is_shared(_mock_enriched_transactions):
+            enriched = _mock_enriched_transactions.between(
+                "operation_date", ordinal_date(start), ordinal_date(end)
+            )
+        else:
+            enriched = [t for t in _mock_enriched_transactions if start <= t.operation_ordinal <= end]
+    scanned = len(enriched) if iban else len(_mock_enriched_transactions)
+    
+    # Apply filters
+    if category or min_amount is not None or max_amount is not None or is_debit is not None:
+        category_ids = [category] if category else None
+        with span("filter"):
+            enriched = filter_transactions(
+                enriched,
+                category_ids=category_ids,
+                min_amount=min_amount,
+                max_amount=max_amount,
+                is_debit=is_debit,
+            )
+    
+    query_rows_scanned.inc(scanned, query="transactions/enriched")
+    query_rows_returned.inc(len(enriched), query="transactions/enriched")
+    return enriched
+
+
 @router.get("/transactions/enriched", response_model=list[EnrichedTransaction])
 async def get_enriched_transactions(
     from_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
@@ -115,10 +402,14 @@ async def get_enriched_transactions(
     min_amount: Optional[float] = Query(None, description="Minimum amount filter"),
     max_amount: Optional[float] = Query(None, description="Maximum amount filter"),
     is_debit: Optional[bool] = Query(None, description="Filter by debit (True) or credit (False)"),
+    iban: Optional[List[str]] = Query(None, description="Account IBAN, repeatable (all accounts if omitted)"),
 ):
     """
     Get transactions with enrichment (categories, merchants, tags).
     
+    Computed off the event loop; concurrent identical requests share one
+    computation.
+    
     Args:
         from_date: Start date (YYYY-MM-DD)
         to_date: End date (YYYY-MM-DD)
@@ -126,69 +417,183 @@ async def get_enriched_transactions(
         min_amount: Optional minimum amount filter
         max_amount: Optional maximum amount filter
         is_debit: Optional debit/credit filter
+        iban: Optional account IBANs, e.g. ?iban=FR76...&iban=FR76...
         
     Returns:
         List of enriched transactions
     """
     try:
-        # Parse dates for filtering
-        start = datetime.strptime(from_date, "%Y-%m-%d")
-        end = datetime.strptime(to_date, "%Y-%m-%d")
-        
-        # Use pre-enriched transactions from mock data (preserves categories)
-        enriched = [
-            t for t in _mock_enriched_transactions
-            if start <= datetime.strptime(t.operation_date, "%Y-%m-%d") <= end
-        ]
-        
-        # Apply filters
-        if category or min_amount is not None or max_amount is not None or is_debit is not None:
-            category_ids = [category] if category else None
-            enriched = filter_transactions(
-                enriched,
-                category_ids=category_ids,
-                min_amount=min_amount,
-                max_amount=max_amount,
-                is_debit=is_debit,
-            )
-        
-        return enriched
+        date_ordinal(from_date), date_ordinal(to_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Format de date invalide. Utilisez YYYY-MM-DD")
+    try:
+        return await run_query(
+            query_enriched_transactions, from_date, to_date, category, min_amount, max_amount, is_debit, iban
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur enrichissement: {str(e)}")
 
 
+@cached_query("transactions/trends")
+def query_transaction_trends(
+    from_date: str, to_date: str, currency: Optional[str] = None, iban: Optional[List[str]] = None
+) -> dict:
+    """
+    Compute transaction trends of a date range.
+    
+    Results are cached per parameters and data version; treat them as
+    read-only. With `iban`, only those accounts' partitions are read.
+    
+    Returns:
+        Dictionary with trend statistics
+    """
+    # Parse dates for filtering
+    start = date_ordinal(from_date)
+    end = date_ordinal(to_date)
+    
+    # Filter transactions by date range
+    with span("store"):
+        if iban:
+            enriched = _partitions.select(iban, start, end)
+        elif is_shared(_mock_enriched_transactions):
+            enriched = _mock_enriched_transactions.between(
+                "operation_date", ordinal_date(start), ordinal_date(end)
+            )
+        else:
+            enriched = [t for t in _mock_enriched_transactions if start <= t.operation_ordinal <= end]
+    
+    # Calculate trends
+    with span("aggregate"):
+        trends = calculate_transaction_trends(enriched, currency)
+    if currency:
+        trends["currency"] = currency
+    
+    return trends
+
+
 @router.get("/transactions/trends")
 async def get_transaction_trends(
     from_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
     to_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    currency: Optional[str] = Query(None, description="Reporting currency (e.g., EUR); amounts are converted with dated FX rates"),
+    iban: Optional[List[str]] = Query(None, description="Account IBAN, repeatable (all accounts if omitted)"),
 ):
     """
     Get transaction trends and statistics.
     
+    Computed off the event loop; concurrent identical requests share one
+    computation.
+    
     Args:
         from_date: Start date (YYYY-MM-DD)
         to_date: End date (YYYY-MM-DD)
+        currency: Optional reporting currency
+        iban: Optional account IBANs, e.g. ?iban=FR76...&iban=FR76...
         
     Returns:
         Dictionary with trend statistics
     """
     try:
-        # Parse dates for filtering
-        start = datetime.strptime(from_date, "%Y-%m-%d")
-        end = datetime.strptime(to_date, "%Y-%m-%d")
+        date_ordinal(from_date), date_ordinal(to_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Format de date invalide. Utilisez YYYY-MM-DD")
+    _currency_converter(currency)
+    try:
+        return await run_query(query_transaction_trends, from_date, to_date, currency, iban)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur calcul des tendances: {str(e)}")
+
+
+@router.get("/transactions/trends/series")
+async def get_transaction_trend_series(
+    from_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    to_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    granularity: str = Query("day", description="Bucket size: day, week or month"),
+    group_by: Optional[str] = Query(None, description="Optional split: iban or category"),
+    currency: Optional[str] = Query(None, description="Reporting currency (e.g., EUR); amounts are converted with dated FX rates"),
+):
+    """
+    Get time-bucketed income, expenses, net flow and counts.
+    
+    Served from rollup tables built at load time, so the cost depends on
+    the number of buckets rather than the number of transactions.
+    
+    Args:
+        from_date: Start date (YYYY-MM-DD)
+        to_date: End date (YYYY-MM-DD)
+        granularity: Bucket size (day, week, month)
+        group_by: Optional split by IBAN or category
+        currency: Optional reporting currency
         
-        # Filter transactions by date range
-        enriched = [
-            t for t in _mock_enriched_transactions
-            if start <= datetime.strptime(t.operation_date, "%Y-%m-%d") <= end
-        ]
+    Returns:
+        Dictionary with one series entry per bucket
+    """
+    try:
+        start = parse_date(from_date)
+        end = parse_date(to_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Format de date invalide. Utilisez YYYY-MM-DD")
+    if start > end:
+        raise HTTPException(status_code=400, detail="from_date doit être antérieure ou égale à to_date")
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"Granularité invalide. Valeurs: {', '.join(GRANULARITIES)}")
+    if group_by is not None and group_by not in GROUP_BY_FIELDS:
+        raise HTTPException(status_code=400, detail=f"group_by invalide. Valeurs: {', '.join(GROUP_BY_FIELDS)}")
+    converter = _currency_converter(currency)
+    
+    try:
+        with span("aggregate"):
+            series = _trend_aggregates.series(start, end, granularity, group_by, converter)
+        
+        return {
+            "from_date": from_date,
+            "to_date": to_date,
+            "granularity": granularity,
+            "group_by": group_by,
+            "currency": currency,
+            "series": series,
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur calcul des séries: {str(e)}")
+
+
+@router.get("/transactions/categories/breakdown")
+async def get_category_breakdown(
+    from_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    to_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    top_merchants: int = Query(3, ge=0, le=50, description="Number of top merchants per category"),
+    currency: Optional[str] = Query(None, description="Reporting currency (e.g., EUR); amounts are converted with dated FX rates"),
+):
+    """
+    Get spending breakdown by category.
+    
+    Served from per-(day, category) aggregates rather than raw transactions.
+    
+    Args:
+        from_date: Start date (YYYY-MM-DD)
+        to_date: End date (YYYY-MM-DD)
+        top_merchants: Number of top merchants reported per category
+        currency: Optional reporting currency
         
-        # Calculate trends
-        trends = calculate_transaction_trends(enriched)
+    Returns:
+        Dictionary with totals, counts, share of spend and top merchants per category
+    """
+    try:
+        start = parse_date(from_date)
+        end = parse_date(to_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Format de date invalide. Utilisez YYYY-MM-DD")
+    if start > end:
+        raise HTTPException(status_code=400, detail="from_date doit être antérieure ou égale à to_date")
+    converter = _currency_converter(currency)
+    
+    try:
+        with span("aggregate"):
+            breakdown = _trend_aggregates.category_breakdown(start, end, top_merchants, converter)
         
-        return trends
+        return {"from_date": from_date, "to_date": to_date, "currency": currency, **breakdown}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erreur calcul des tendances: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur calcul de la répartition: {str(e)}")
 
 
 @router.get("/categories", response_model=list[TransactionCategory])
@@ -11,9 +11,10 @@ from ..services.chatbot import (
     clear_session,
     list_active_sessions,
 )
-from ..routes.accounts import get_account_balances
-from ..routes.transactions import get_transactions
-from ..services.analytics import calculate_balance_summary
+from ..routes.accounts import query_account_balances
+from ..routes.transactions import query_transactions
+from ..routes.analytics import query_balance_summary
+from ..services.fx import get_fx_rates
 
 router = APIRouter()
 
@@ -34,19 +35,18 @@ async def send_chat_message(request: ChatRequest):
         current_date = datetime.now()
         current_date_str = current_date.strftime("%Y-%m-%d")
         
-        # Get account balances for current date
-        accounts = await get_account_balances(date=current_date_str)
+        # Get latest known account balances on or before the current date
+        accounts = query_account_balances(date=current_date_str, as_of=True)
         
-        # Calculate balance summary from accounts
-        balance_summary = calculate_balance_summary(accounts, current_date_str)
+        # Calculate balance summary from accounts, converted into one currency
+        balance_summary = query_balance_summary(
+            date=current_date_str, currency=get_fx_rates().base, as_of=True
+        )
         
         # Get recent transactions (last 30 days)
         from_date = (current_date - timedelta(days=30)).strftime("%Y-%m-%d")
         to_date = current_date.strftime("%Y-%m-%d")
-        all_transactions = await get_transactions(
-            from_date=from_date,
-            to_date=to_date
-        )
+        all_transactions = query_transactions(from_date=from_date, to_date=to_date)
         
         # Build context data for chatbot
         context_data = {
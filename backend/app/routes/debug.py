@@ -0,0 +1,93 @@
+"""Debugging endpoints (request profiles), restricted to administrators."""
+
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
+
+from ..services.profiling import profile_store, profiling_enabled, set_profiling_enabled
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None, description="Value of ADMIN_TOKEN")):
+    """
+    Check the admin token of a request.
+    
+    Raises:
+        HTTPException: 403 if ADMIN_TOKEN is not configured, 401 if the
+            X-Admin-Token header does not match it
+    """
+    token = os.getenv("ADMIN_TOKEN")
+    if not token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+# Sort keys accepted for profile reports
+_SORT_KEYS = ("cumulative", "tottime", "calls", "ncalls", "time")
+
+
+@router.put("/profiling")
+async def set_profiling(enabled: bool = Query(..., description="Allow requests to ask for a profile")):
+    """
+    Turn on-demand profiling on or off at runtime.
+    
+    Args:
+        enabled: New state of the profiling switch
+        
+    Returns:
+        Dictionary with the profiling switch state
+    """
+    set_profiling_enabled(enabled)
+    return {"enabled": profiling_enabled()}
+
+
+@router.get("/profiles")
+async def list_profiles():
+    """
+    List stored request profiles, newest first.
+    
+    Returns:
+        Dictionary with the profiling switch state and profile summaries
+    """
+    profiles = [artifact.summary() for artifact in profile_store.list()]
+    return {"enabled": profiling_enabled(), "profiles": profiles, "count": len(profiles)}
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    format: str = Query("text", description="text (pstats report) or pstats (raw .prof file)"),
+    sort: str = Query("cumulative", description="Sort key of the text report"),
+    limit: int = Query(50, ge=1, le=500, description="Number of functions in the text report"),
+):
+    """
+    Get a stored request profile.
+    
+    Args:
+        profile_id: Id returned in the X-Profile-Id response header
+        format: text report or raw pstats dump
+        sort: Sort key of the text report
+        limit: Number of functions in the text report
+        
+    Returns:
+        Text report or .prof file
+    """
+    artifact = profile_store.get(profile_id)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    if format == "pstats":
+        return Response(
+            artifact.dump(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.prof"'},
+        )
+    if format != "text":
+        raise HTTPException(status_code=400, detail="Invalid format. Use text or pstats")
+    if sort not in _SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort. Use one of: {', '.join(_SORT_KEYS)}")
+    return PlainTextResponse(artifact.report(sort, limit))
@@ -1,22 +1,41 @@
 """Transaction API routes."""
 
-from datetime import datetime
-from typing import List
+from typing import List, Optional, Union
 
 from fastapi import APIRouter, Query, HTTPException
 
+from app.models.dates import date_ordinal, ordinal_date
+from app.models.dimensions import account_dimension
 from app.models.transaction import Transaction, TransactionResponse
+from app.services.data_version import bump_data_version
+from app.services.metrics import query_rows_returned, query_rows_scanned
+from app.services.partitions import IbanPartitions
+from app.services.profiling import span
+from app.services.query_cache import cached_query
+from app.services.shared_store import SharedRows, account_ids, is_shared, share_rows, shared_store_dir
 
 router = APIRouter()
 
-# In-memory storage for mock data (replace with actual database in production)
+# In-memory storage for mock data (replace with actual database in production);
+# a SharedRows view of a memory-mapped segment when SHARED_STORE_DIR is set
 _mock_transactions: List[Transaction] = []
 
+# Same transactions partitioned by IBAN and sorted by operation date
+_partitions = IbanPartitions()
 
-def set_mock_transactions(transactions: List[dict]):
-    """Set mock transaction data for testing."""
-    global _mock_transactions
-    _mock_transactions = [Transaction(**trans) for trans in transactions]
+
+def set_mock_transactions(transactions: Union[List[dict], SharedRows]):
+    """Set mock transaction data for testing (a SharedRows store is used as is)."""
+    global _mock_transactions, _partitions
+    if is_shared(transactions):
+        _mock_transactions = transactions
+    elif shared_store_dir():
+        _mock_transactions = share_rows("transactions", transactions, Transaction)
+    else:
+        _mock_transactions = [Transaction(**trans) for trans in transactions]
+    _partitions = IbanPartitions(_mock_transactions, "operation_date")
+    account_dimension.use("transactions", account_ids(_mock_transactions, "account_description", "holder_company_name"))
+    bump_data_version()
 
 
 def _transform_to_response(transaction: Transaction) -> TransactionResponse:
@@ -33,23 +52,28 @@ def _transform_to_response(transaction: Transaction) -> TransactionResponse:
     )
 
 
-@router.get("/bank-transactions", response_model=List[TransactionResponse])
-async def get_transactions(
-    from_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
-    to_date: str = Query(..., description="End date (YYYY-MM-DD)"),
-):
-    """Get bank transactions within date range.
+@cached_query("bank-transactions")
+def query_transactions(
+    from_date: str, to_date: str, iban: Optional[List[str]] = None
+) -> List[TransactionResponse]:
+    """Query bank transactions within a date range from the in-memory store.
+    
+    Plain-function counterpart of the route, for in-process callers.
+    Results are cached per parameters and data version; treat them as
+    read-only.
     
     Args:
         from_date: Start date for filtering transactions.
         to_date: End date for filtering transactions.
+        iban: Account IBANs to keep (all accounts if empty); rows are then
+            read from the IBAN partitions, in operation date order.
     
     Returns:
         List of transactions with transformed field names.
     """
     try:
-        start = datetime.strptime(from_date, "%Y-%m-%d")
-        end = datetime.strptime(to_date, "%Y-%m-%d")
+        start = date_ordinal(from_date)
+        end = date_ordinal(to_date)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
@@ -57,10 +81,40 @@ async def get_transactions(
         raise HTTPException(status_code=400, detail="from_date must be before or equal to to_date")
     
     # Filter transactions by operation_date
-    filtered_transactions = [
-        trans for trans in _mock_transactions
-        if start <= datetime.strptime(trans.operation_date, "%Y-%m-%d") <= end
-    ]
+    with span("store"):
+        if iban:
+            filtered_transactions = _partitions.select(iban, start, end)
+        elif is_shared(_mock_transactions):
+            filtered_transactions = _mock_transactions.between(
+                "operation_date", ordinal_date(start), ordinal_date(end)
+            )
+        else:
+            filtered_transactions = [
+                trans for trans in _mock_transactions if start <= trans.operation_ordinal <= end
+            ]
+    
+    scanned = len(filtered_transactions) if iban else len(_mock_transactions)
+    query_rows_scanned.inc(scanned, query="bank-transactions")
+    query_rows_returned.inc(len(filtered_transactions), query="bank-transactions")
     
     # Transform to response format
     return [_transform_to_response(trans) for trans in filtered_transactions]
+
+
+@router.get("/bank-transactions", response_model=List[TransactionResponse])
+async def get_transactions(
+    from_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    to_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    iban: Optional[List[str]] = Query(None, description="Account IBAN, repeatable (all accounts if omitted)"),
+):
+    """Get bank transactions within date range.
+    
+    Args:
+        from_date: Start date for filtering transactions.
+        to_date: End date for filtering transactions.
+        iban: Optional account IBANs, e.g. ?iban=FR76...&iban=FR76...
+    
+    Returns:
+        List of transactions with transformed field names.
+    """
+    return query_transactions(from_date, to_date, iban)
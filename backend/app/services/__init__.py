@@ -8,9 +8,12 @@ from .enrichment import (
 )
 from .analytics import (
     calculate_balance_summary,
+    calculate_grouped_balance_summary,
     detect_low_balance_alerts,
     calculate_transaction_trends,
 )
+from .aggregates import TransactionAggregates
+from .alerts import AlertEngine
 from .chatbot import (
     process_chat_message,
     get_session,
@@ -24,8 +27,11 @@ __all__ = [
     "filter_transactions",
     "CATEGORIES",
     "calculate_balance_summary",
+    "calculate_grouped_balance_summary",
     "detect_low_balance_alerts",
     "calculate_transaction_trends",
+    "TransactionAggregates",
+    "AlertEngine",
     "process_chat_message",
     "get_session",
     "create_session",
@@ -0,0 +1,393 @@
+"""Pre-rolled transaction aggregates for time-bucketed analytics."""
+
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+
+# Supported bucket sizes for trend series
+GRANULARITIES = ("day", "week", "month")
+
+# Supported split dimensions for trend series
+GROUP_BY_FIELDS = ("iban", "category")
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    """
+    Return the first day of the bucket containing a date.
+
+    Weeks start on Monday (ISO 8601), months on their first day.
+    """
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unsupported granularity: {granularity}")
+
+
+def bucket_end(start: date, granularity: str) -> date:
+    """Return the last day of the bucket starting at a date."""
+    if granularity == "day":
+        return start
+    if granularity == "week":
+        return start + timedelta(days=6)
+    if granularity == "month":
+        next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return next_month - timedelta(days=1)
+    raise ValueError(f"Unsupported granularity: {granularity}")
+
+
+@dataclass
+class FlowStats:
+    """Running income/expense totals for one aggregate cell."""
+
+    income: float = 0.0
+    expenses: float = 0.0
+    income_count: int = 0
+    expense_count: int = 0
+
+    def add(self, amount: float, is_debit: bool) -> None:
+        """Add one transaction amount to the totals."""
+        if is_debit:
+            self.expenses += abs(amount)
+            self.expense_count += 1
+        else:
+            self.income += amount
+            self.income_count += 1
+
+    def merge(self, other: "FlowStats", factor: float = 1.0) -> None:
+        """Add another cell's totals to this one, amounts scaled by a factor."""
+        self.income += other.income * factor
+        self.expenses += other.expenses * factor
+        self.income_count += other.income_count
+        self.expense_count += other.expense_count
+
+    def to_dict(self) -> dict:
+        """Serialize using the same keys as calculate_transaction_trends."""
+        return {
+            "total_income": self.income,
+            "total_expenses": self.expenses,
+            "net_flow": self.income - self.expenses,
+            "transaction_count": self.income_count + self.expense_count,
+            "income_count": self.income_count,
+            "expense_count": self.expense_count,
+        }
+
+
+# Aggregate cell key: (iban, category_id)
+CellKey = tuple[str, Optional[str]]
+
+# Currency conversion hook: (source currency, rate date) -> factor into the reporting currency
+Converter = Callable[[str, date], float]
+
+
+def _restore_groups(table, first: str, second: str, *key_fields: str):
+    """
+    Rebuild nested cell dicts from a table written by `to_tables`.
+
+    Rows were written grouped by their (first, second) values, so groups
+    are found on the raw column codes and each one becomes a dict of
+    FlowStats keyed by the key fields in a single call.
+
+    Yields:
+        ((first, second) values, {key: FlowStats}) pairs
+    """
+    if not len(table):
+        return
+    outer, inner = table.columns[first], table.columns[second]
+    changes = np.flatnonzero((outer[1:] != outer[:-1]) | (inner[1:] != inner[:-1])) + 1
+    bounds = [0, *changes.tolist(), len(table)]
+    firsts, seconds = table.values(first), table.values(second)
+    keys = list(zip(*(table.values(field) for field in key_fields)))
+    stats = list(map(FlowStats, *(table.values(field) for field in FlowStats.__dataclass_fields__)))
+    for start, end in zip(bounds, bounds[1:]):
+        yield (firsts[start], seconds[start]), dict(zip(keys[start:end], stats[start:end]))
+
+
+class TransactionAggregates:
+    """
+    Daily, weekly and monthly rollup tables of enriched transactions.
+
+    Each table maps a bucket start date to cells keyed by (iban, category_id).
+    Tables are maintained incrementally as transactions are added, so range
+    queries only touch the buckets they cover instead of every transaction.
+    """
+
+    def __init__(self):
+        self._tables: dict[str, dict[date, dict[CellKey, FlowStats]]] = {
+            granularity: {} for granularity in GRANULARITIES
+        }
+        self._buckets: dict[str, list[date]] = {granularity: [] for granularity in GRANULARITIES}
+        # Per-(day, category) totals by (merchant, currency), for category breakdowns
+        self._merchants: dict[date, dict[Optional[str], dict[tuple[str, str], FlowStats]]] = {}
+        # Account currency of each IBAN, for conversions
+        self._currencies: dict[str, str] = {}
+        # First category definition seen for each category ID
+        self._categories: dict[str, object] = {}
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable) -> "TransactionAggregates":
+        """Build rollup tables from enriched transactions."""
+        aggregates = cls()
+        for transaction in transactions:
+            aggregates.add(transaction)
+        return aggregates
+
+    def to_tables(self) -> dict[str, tuple[list[dict], tuple[str, ...]]]:
+        """
+        Rows of every rollup table, for snapshots (see `from_tables`).
+
+        Returns:
+            Rows and their fields by table name: "cells", "merchants",
+            "currencies" and "categories"
+        """
+        cells = [
+            {
+                "granularity": granularity, "bucket": bucket.isoformat(),
+                "iban": iban, "category_id": category_id, **vars(stats),
+            }
+            for granularity, table in self._tables.items()
+            for bucket, bucket_cells in table.items()
+            for (iban, category_id), stats in bucket_cells.items()
+        ]
+        merchants = [
+            {
+                "day": day.isoformat(), "category_id": category_id,
+                "merchant": merchant, "currency": currency, **vars(stats),
+            }
+            for day, day_merchants in self._merchants.items()
+            for category_id, category_merchants in day_merchants.items()
+            for (merchant, currency), stats in category_merchants.items()
+        ]
+        stats_fields = tuple(FlowStats.__dataclass_fields__)
+        return {
+            "cells": (cells, ("granularity", "bucket", "iban", "category_id") + stats_fields),
+            "merchants": (merchants, ("day", "category_id", "merchant", "currency") + stats_fields),
+            "currencies": (
+                [{"iban": iban, "currency": currency} for iban, currency in self._currencies.items()],
+                ("iban", "currency"),
+            ),
+            "categories": (
+                [{"id": category_id, "category": category.model_dump()}
+                 for category_id, category in self._categories.items()],
+                ("id", "category"),
+            ),
+        }
+
+    @classmethod
+    def from_tables(cls, tables: dict, category_model: type) -> "TransactionAggregates":
+        """
+        Restore rollup tables from snapshot tables, without any transaction.
+
+        Args:
+            tables: Snapshot tables ("cells", "merchants", "currencies",
+                "categories") written from `to_tables`
+            category_model: Model of the category definitions
+
+        Returns:
+            Aggregates equal to the ones the tables were written from
+        """
+        aggregates = cls()
+
+        cells = tables["cells"]
+        for (granularity, bucket), group in _restore_groups(cells, "granularity", "bucket", "iban", "category_id"):
+            start = date.fromisoformat(bucket)
+            aggregates._tables[granularity][start] = group
+            aggregates._buckets[granularity].append(start)
+        for buckets in aggregates._buckets.values():
+            buckets.sort()
+
+        merchants = tables["merchants"]
+        for (day, category_id), group in _restore_groups(merchants, "day", "category_id", "merchant", "currency"):
+            aggregates._merchants.setdefault(date.fromisoformat(day), {})[category_id] = group
+
+        currencies = tables["currencies"]
+        aggregates._currencies = dict(zip(currencies.values("iban"), currencies.values("currency")))
+        categories = tables["categories"]
+        aggregates._categories = {
+            category_id: category_model.model_validate(category)
+            for category_id, category in zip(categories.values("id"), categories.values("category"))
+        }
+        return aggregates
+
+    def add(self, transaction) -> None:
+        """Add one enriched transaction to every rollup table."""
+        day = date.fromordinal(transaction.operation_ordinal)
+        category_id = transaction.category.id if transaction.category else None
+        key = (transaction.iban, category_id)
+
+        for granularity in GRANULARITIES:
+            start = bucket_start(day, granularity)
+            table = self._tables[granularity]
+            cells = table.get(start)
+            if cells is None:
+                cells = table[start] = {}
+                insort(self._buckets[granularity], start)
+            stats = cells.get(key)
+            if stats is None:
+                stats = cells[key] = FlowStats()
+            stats.add(transaction.amount, transaction.is_debit)
+
+        self._currencies.setdefault(transaction.iban, transaction.currency)
+        if transaction.category is not None:
+            self._categories.setdefault(category_id, transaction.category)
+        if transaction.merchant:
+            merchants = self._merchants.setdefault(day, {}).setdefault(category_id, {})
+            merchant_key = (transaction.merchant, transaction.currency)
+            merchants.setdefault(merchant_key, FlowStats()).add(
+                transaction.amount, transaction.is_debit
+            )
+
+    def _cells_between(self, start: date, end: date, granularity: str):
+        """Yield (bucket, cells) pairs of a table whose buckets lie within [start, end]."""
+        buckets = self._buckets[granularity]
+        table = self._tables[granularity]
+        for index in range(bisect_left(buckets, start), bisect_right(buckets, end)):
+            yield buckets[index], table[buckets[index]]
+
+    def _window_cells(
+        self, bucket: date, start: date, end: date, granularity: str, converted: bool = False
+    ):
+        """
+        Yield (rate date, cells) pairs of one bucket restricted to [start, end].
+
+        Buckets fully covered by the window are read from their own table;
+        partially covered edge buckets are rebuilt from the daily table.
+        Converted buckets are always read day by day, so each day is
+        converted at its own rate and totals agree across granularities.
+        """
+        last = bucket_end(bucket, granularity)
+        if not converted and bucket >= start and last <= end:
+            cells = self._tables[granularity].get(bucket)
+            if cells:
+                yield bucket, cells
+            return
+        yield from self._cells_between(max(bucket, start), min(last, end), "day")
+
+    def _factor(self, converter: Optional[Converter], iban: str, day: date) -> float:
+        """Conversion factor of an IBAN's amounts on a day (1.0 without converter)."""
+        if converter is None:
+            return 1.0
+        return converter(self._currencies[iban], day)
+
+    def series(
+        self,
+        start: date,
+        end: date,
+        granularity: str = "day",
+        group_by: Optional[str] = None,
+        converter: Optional[Converter] = None,
+    ) -> list[dict]:
+        """
+        Compute per-bucket flow statistics over a date window.
+
+        Args:
+            start: First day of the window (inclusive)
+            end: Last day of the window (inclusive)
+            granularity: Bucket size ("day", "week" or "month")
+            group_by: Optional split dimension ("iban" or "category")
+            converter: Optional conversion into a reporting currency
+
+        Returns:
+            One entry per bucket overlapping the window, empty buckets included
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unsupported granularity: {granularity}")
+        if group_by is not None and group_by not in GROUP_BY_FIELDS:
+            raise ValueError(f"Unsupported group_by: {group_by}")
+
+        series = []
+        bucket = bucket_start(start, granularity)
+        while bucket <= end:
+            last = bucket_end(bucket, granularity)
+            totals = FlowStats()
+            groups: dict[str, FlowStats] = {}
+
+            for rate_day, cells in self._window_cells(bucket, start, end, granularity, converter is not None):
+                for (iban, category_id), stats in cells.items():
+                    factor = self._factor(converter, iban, rate_day)
+                    totals.merge(stats, factor)
+                    if group_by is not None:
+                        group = iban if group_by == "iban" else (category_id or "uncategorized")
+                        groups.setdefault(group, FlowStats()).merge(stats, factor)
+
+            entry = {
+                "period": bucket.isoformat(),
+                "start_date": max(bucket, start).isoformat(),
+                "end_date": min(last, end).isoformat(),
+                **totals.to_dict(),
+            }
+            if group_by is not None:
+                entry["groups"] = {group: stats.to_dict() for group, stats in sorted(groups.items())}
+            series.append(entry)
+            bucket = last + timedelta(days=1)
+
+        return series
+
+    def category_breakdown(
+        self,
+        start: date,
+        end: date,
+        top_merchants: int = 3,
+        converter: Optional[Converter] = None,
+    ) -> dict:
+        """
+        Compute spending per category over a date window.
+
+        Merges the per-(day, category) cells of the daily table, so the cost
+        is O(days x categories) regardless of the number of transactions.
+
+        Args:
+            start: First day of the window (inclusive)
+            end: Last day of the window (inclusive)
+            top_merchants: Number of merchants to report per category
+            converter: Optional conversion into a reporting currency
+
+        Returns:
+            Dictionary with overall totals and one entry per category,
+            sorted by decreasing expenses
+        """
+        totals = FlowStats()
+        per_category: dict[Optional[str], FlowStats] = {}
+        merchants: dict[Optional[str], dict[str, FlowStats]] = {}
+
+        for day, cells in self._cells_between(start, end, "day"):
+            for (iban, category_id), stats in cells.items():
+                factor = self._factor(converter, iban, day)
+                totals.merge(stats, factor)
+                per_category.setdefault(category_id, FlowStats()).merge(stats, factor)
+            for category_id, day_merchants in self._merchants.get(day, {}).items():
+                category_merchants = merchants.setdefault(category_id, {})
+                for (merchant, currency), stats in day_merchants.items():
+                    factor = converter(currency, day) if converter is not None else 1.0
+                    category_merchants.setdefault(merchant, FlowStats()).merge(stats, factor)
+
+        categories = []
+        for category_id, stats in per_category.items():
+            ranked = sorted(
+                merchants.get(category_id, {}).items(),
+                key=lambda item: item[1].income + item[1].expenses,
+                reverse=True,
+            )
+            category = self._categories.get(category_id)
+            categories.append({
+                "category": category.model_dump() if category is not None else None,
+                **stats.to_dict(),
+                "share_of_spend": stats.expenses / totals.expenses if totals.expenses else 0.0,
+                "top_merchants": [
+                    {
+                        "merchant": merchant,
+                        "total_amount": merchant_stats.income + merchant_stats.expenses,
+                        "transaction_count": merchant_stats.income_count + merchant_stats.expense_count,
+                    }
+                    for merchant, merchant_stats in ranked[:top_merchants]
+                ],
+            })
+        categories.sort(key=lambda entry: entry["total_expenses"], reverse=True)
+
+        return {**totals.to_dict(), "categories": categories}
@@ -0,0 +1,198 @@
+"""Incremental low balance alert engine."""
+
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterable, Optional
+
+from .analytics import low_balance_message, low_balance_severity
+
+
+# Severity ranking, used to tell escalations from de-escalations
+SEVERITY_RANK = {None: 0, "medium": 1, "high": 2, "critical": 3}
+
+
+class AlertEngine:
+    """
+    Evaluate overdraft thresholds once per balance record as it is ingested.
+
+    Each IBAN runs a small state machine over its balances in date order:
+    entering an alert, escalating or de-escalating its severity, and
+    exiting it are recorded as transitions. Active alerts are indexed by
+    IBAN, so reading them costs O(active alerts), and the transition
+    timelines answer "which alerts were active on date D" with bisection
+    over day ordinals (see app.models.dates).
+    """
+
+    def __init__(self, threshold_percentage: float = 0.1):
+        self.threshold_percentage = threshold_percentage
+        self._last_date: dict[str, int] = {}
+        self._active: dict[str, dict] = {}
+        self._timeline: dict[str, list[dict]] = {}
+        self._timeline_dates: dict[str, list[int]] = {}
+        self._listeners: list[Callable[[dict], None]] = []
+
+    def add_listener(self, listener: Callable[[dict], None]) -> None:
+        """Call a function with every transition produced by notifying ingests."""
+        self._listeners.append(listener)
+
+    def reset(self) -> None:
+        """Forget every state, active alert and transition."""
+        self._last_date.clear()
+        self._active.clear()
+        self._timeline.clear()
+        self._timeline_dates.clear()
+
+    def ingest(self, accounts: Iterable, notify: bool = True) -> list[dict]:
+        """
+        Evaluate new balance records, oldest first.
+
+        Args:
+            accounts: Balance records (Account models)
+            notify: Pass the produced transitions to the listeners
+
+        Returns:
+            Transitions produced by these records, in date order
+        """
+        transitions = []
+        for account in sorted(accounts, key=lambda acc: acc.date):
+            transition = self.evaluate(account)
+            if transition is not None:
+                transitions.append(transition)
+                if notify:
+                    for listener in self._listeners:
+                        listener(transition)
+        return transitions
+
+    def is_backdated(self, account) -> bool:
+        """Whether a record is older than the last evaluated date of its IBAN (`evaluate` ignores it)."""
+        last_date = self._last_date.get(account.iban)
+        return last_date is not None and account.date_ordinal < last_date
+
+    def reevaluate(self, iban: str, accounts: Iterable, notify: bool = True) -> list[dict]:
+        """
+        Rebuild the state and timeline of one IBAN from all its balance records.
+
+        Used when a backdated record arrives, since evaluating it alone
+        would be ignored.
+
+        Args:
+            iban: Account IBAN
+            accounts: Every balance record of the IBAN
+            notify: Pass the new transitions to the listeners
+
+        Returns:
+            Transitions of the rebuilt timeline that were not in the old one
+        """
+        previous = self._timeline.pop(iban, [])
+        self._timeline_dates.pop(iban, None)
+        self._last_date.pop(iban, None)
+        self._active.pop(iban, None)
+        transitions = [t for t in self.ingest(accounts, notify=False) if t not in previous]
+        if notify:
+            for transition in transitions:
+                for listener in self._listeners:
+                    listener(transition)
+        return transitions
+
+    def evaluate(self, account) -> Optional[dict]:
+        """
+        Evaluate one balance record against its IBAN's current state.
+
+        Records older than the last evaluated date of their IBAN are ignored.
+
+        Returns:
+            The transition produced, or None if the state did not change
+        """
+        iban = account.iban
+        last_date = self._last_date.get(iban)
+        if last_date is not None and account.date_ordinal < last_date:
+            return None
+        self._last_date[iban] = account.date_ordinal
+
+        severity = low_balance_severity(
+            account.value_balance, account.allowed_overdraft, self.threshold_percentage
+        )
+        current = self._active.get(iban)
+        previous = current["severity"] if current else None
+
+        if severity is not None:
+            alert = {
+                "account": account.account_description,
+                "iban": iban,
+                "balance": account.value_balance,
+                "allowed_overdraft": account.allowed_overdraft,
+                "severity": severity,
+                "message": low_balance_message(
+                    account.account_description, account.value_balance, account.currency, severity
+                ),
+                "date": account.date,
+                "since": current["since"] if current else account.date,
+            }
+            self._active[iban] = alert
+        else:
+            alert = None
+            self._active.pop(iban, None)
+
+        if severity == previous:
+            return None
+        if previous is None:
+            event = "enter"
+        elif severity is None:
+            event = "exit"
+        elif SEVERITY_RANK[severity] > SEVERITY_RANK[previous]:
+            event = "escalate"
+        else:
+            event = "deescalate"
+
+        transition = {
+            "iban": iban,
+            "account": account.account_description,
+            "date": account.date,
+            "event": event,
+            "severity": severity,
+            "previous_severity": previous,
+            "balance": account.value_balance,
+            "alert": alert,
+        }
+        self._timeline.setdefault(iban, []).append(transition)
+        self._timeline_dates.setdefault(iban, []).append(account.date_ordinal)
+        return transition
+
+    def active_alerts(self) -> list[dict]:
+        """Alerts active after the latest ingested balance of each IBAN."""
+        return list(self._active.values())
+
+    def alerting_ibans(self, date: int) -> list[str]:
+        """
+        IBANs in alert at the end of a date (day ordinal).
+
+        Read from each IBAN's last transition on or before the date; the
+        balances themselves are looked up by the caller as of that date.
+        """
+        ibans = []
+        for iban, dates in self._timeline_dates.items():
+            position = bisect_right(dates, date)
+            if position and self._timeline[iban][position - 1]["alert"] is not None:
+                ibans.append(iban)
+        return ibans
+
+    def history(
+        self,
+        iban: Optional[str] = None,
+        start_date: Optional[int] = None,
+        end_date: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        Alert transitions, optionally for one IBAN and a date range (day ordinals).
+
+        Returns:
+            Transitions sorted by date
+        """
+        ibans = [iban] if iban is not None else list(self._timeline)
+        transitions = []
+        for key in ibans:
+            dates = self._timeline_dates.get(key, [])
+            start = bisect_left(dates, start_date) if start_date is not None else 0
+            end = bisect_right(dates, end_date) if end_date is not None else len(dates)
+            transitions.extend(zip(dates[start:end], self._timeline.get(key, [])[start:end]))
+        transitions.sort(key=lambda entry: entry[0])
+        return [transition for _, transition in transitions]
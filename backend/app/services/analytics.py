@@ -2,12 +2,14 @@
 
 from datetime import datetime
 from typing import Optional
-from ..models.account import AccountResponse, BalanceSummary
+from ..models.account import AccountResponse, BalanceSummary, BalanceGroup, GroupedBalanceSummary
+from .fx import get_fx_rates
 
 
 def calculate_balance_summary(
     accounts: list[AccountResponse],
-    date: Optional[str] = None
+    date: Optional[str] = None,
+    reporting_currency: Optional[str] = None,
 ) -> BalanceSummary:
     """
     Calculate aggregated balance summary from account list.
@@ -15,6 +17,9 @@ def calculate_balance_summary(
     Args:
         accounts: List of account balances
         date: Date for the summary (current date if None)
+        reporting_currency: Convert every balance into this currency before
+            aggregating (if None: amounts of a single currency are summed
+            as-is, mixed currencies are converted into the FX base currency)
         
     Returns:
         BalanceSummary: Aggregated balance statistics
@@ -22,7 +27,7 @@ def calculate_balance_summary(
     if not accounts:
         return BalanceSummary(
             total_balance=0.0,
-            currency="EUR",
+            currency=reporting_currency or "EUR",
             account_count=0,
             highest_balance=0.0,
             lowest_balance=0.0,
@@ -32,11 +37,22 @@ def calculate_balance_summary(
             accounts=[],
         )
     
-    # Assume all accounts use same currency (use first account's currency)
-    currency = accounts[0].currency
+    if reporting_currency is None and len({acc.currency for acc in accounts}) > 1:
+        reporting_currency = get_fx_rates().base
     
-    balances = [acc.balance for acc in accounts]
-    overdrafts = [acc.allowed_overdraft for acc in accounts]
+    if reporting_currency:
+        # Convert each balance at the rate in effect on its own date
+        fx = get_fx_rates()
+        currencies = [acc.currency for acc in accounts]
+        dates = [acc.date for acc in accounts]
+        currency = reporting_currency
+        balances = fx.convert([acc.balance for acc in accounts], currencies, dates, currency).tolist()
+        overdrafts = fx.convert([acc.allowed_overdraft for acc in accounts], currencies, dates, currency).tolist()
+    else:
+        # All accounts share one currency
+        currency = accounts[0].currency
+        balances = [acc.balance for acc in accounts]
+        overdrafts = [acc.allowed_overdraft for acc in accounts]
     
     return BalanceSummary(
         total_balance=sum(balances),
@@ -51,6 +67,119 @@ def calculate_balance_summary(
     )
 
 
+# Dimensions supported by grouped balance summaries, mapped to AccountResponse fields
+BALANCE_GROUP_FIELDS = {
+    "company": "company",
+    "currency": "currency",
+    "account": "iban",
+}
+
+
+def calculate_grouped_balance_summary(
+    accounts: list[AccountResponse],
+    group_by: Optional[list[str]] = None,
+    date: Optional[str] = None,
+    reporting_currency: Optional[str] = None,
+) -> GroupedBalanceSummary:
+    """
+    Calculate balance statistics per company, currency and account in one pass.
+    
+    Args:
+        accounts: List of account balances
+        group_by: Grouping dimensions (all of BALANCE_GROUP_FIELDS if None)
+        date: Date for the summary (current date if None)
+        reporting_currency: Convert every balance into this currency before
+            aggregating (groups mixing currencies are reported as MIXED if None)
+        
+    Returns:
+        GroupedBalanceSummary: Group statistics keyed by dimension
+    """
+    dimensions = group_by or list(BALANCE_GROUP_FIELDS)
+    
+    if reporting_currency and accounts:
+        fx = get_fx_rates()
+        currencies = [acc.currency for acc in accounts]
+        dates = [acc.date for acc in accounts]
+        balances = fx.convert([acc.balance for acc in accounts], currencies, dates, reporting_currency).tolist()
+        overdrafts = fx.convert([acc.allowed_overdraft for acc in accounts], currencies, dates, reporting_currency).tolist()
+    else:
+        balances = [acc.balance for acc in accounts]
+        overdrafts = [acc.allowed_overdraft for acc in accounts]
+    
+    # Running [count, total, highest, lowest, overdraft, currency] per (dimension, key)
+    stats: dict[str, dict[str, list]] = {dimension: {} for dimension in dimensions}
+    for account, balance, overdraft in zip(accounts, balances, overdrafts):
+        currency = reporting_currency or account.currency
+        for dimension in dimensions:
+            key = getattr(account, BALANCE_GROUP_FIELDS[dimension])
+            group = stats[dimension].get(key)
+            if group is None:
+                stats[dimension][key] = [1, balance, balance, balance, overdraft, currency]
+                continue
+            group[0] += 1
+            group[1] += balance
+            group[2] = max(group[2], balance)
+            group[3] = min(group[3], balance)
+            group[4] += overdraft
+            if group[5] != currency:
+                group[5] = "MIXED"
+    
+    return GroupedBalanceSummary(
+        date=date or datetime.now().strftime("%Y-%m-%d"),
+        currency=reporting_currency,
+        groups={
+            dimension: [
+                BalanceGroup(
+                    key=key,
+                    currency=currency,
+                    account_count=count,
+                    total_balance=total,
+                    highest_balance=highest,
+                    lowest_balance=lowest,
+                    average_balance=total / count,
+                    total_overdraft_allowed=overdraft,
+                )
+                for key, (count, total, highest, lowest, overdraft, currency) in groups.items()
+            ]
+            for dimension, groups in stats.items()
+        },
+    )
+
+
+def low_balance_severity(
+    balance: float,
+    allowed_overdraft: float,
+    threshold_percentage: float = 0.1
+) -> Optional[str]:
+    """
+    Classify a balance against its overdraft threshold.
+    
+    Args:
+        balance: Account balance
+        allowed_overdraft: Allowed overdraft amount
+        threshold_percentage: Alert threshold (e.g., 0.1 = 10% of overdraft)
+        
+    Returns:
+        "medium", "high" or "critical", or None when no alert is due
+    """
+    # Alert if balance is close to or below allowed overdraft
+    if allowed_overdraft > 0:
+        if balance < allowed_overdraft * threshold_percentage:
+            return "high" if balance < 0 else "medium"
+        return None
+    # Alert if balance is negative without overdraft protection
+    if balance < 0:
+        return "critical"
+    return None
+
+
+def low_balance_message(account: str, balance: float, currency: str, severity: str) -> str:
+    """Build the user-facing message of a low balance alert."""
+    if severity == "critical":
+        return f"Découvert non autorisé sur {account}"
+    return f"Balance faible sur {account}: {balance} {currency}"
+
+
 def detect_low_balance_alerts(
     accounts: list[AccountResponse],
     threshold_percentage: float = 0.1
@@ -68,38 +197,28 @@ def detect_low_balance_alerts(
     alerts = []
     
     for account in accounts:
-        # Alert if balance is close to or below allowed overdraft
-        if account.allowed_overdraft > 0:
-            threshold = account.allowed_overdraft * threshold_percentage
-            if account.balance < threshold:
-                alerts.append({
-                    "account": account.account,
-                    "iban": account.iban,
-                    "balance": account.balance,
-                    "allowed_overdraft": account.allowed_overdraft,
-                    "severity": "high" if account.balance < 0 else "medium",
-                    "message": f"Balance faible sur {account.account}: {account.balance} {account.currency}",
-                })
-        # Alert if balance is negative without overdraft protection
-        elif account.balance < 0:
+        severity = low_balance_severity(account.balance, account.allowed_overdraft, threshold_percentage)
+        if severity is not None:
             alerts.append({
                 "account": account.account,
                 "iban": account.iban,
                 "balance": account.balance,
-                "allowed_overdraft": 0.0,
-                "severity": "critical",
-                "message": f"Découvert non autorisé sur {account.account}",
+                "allowed_overdraft": account.allowed_overdraft,
+                "severity": severity,
+                "message": low_balance_message(account.account, account.balance, account.currency, severity),
             })
     
     return alerts
 
 
-def calculate_transaction_trends(transactions: list) -> dict:
+def calculate_transaction_trends(transactions: list, reporting_currency: Optional[str] = None) -> dict:
     """
     Calculate transaction trends and statistics.
     
     Args:
         transactions: List of enriched transactions
+        reporting_currency: Convert every amount into this currency at the
+            rate of its operation date (amounts are used as-is if None)
         
     Returns:
         Dictionary with trend statistics
@@ -115,8 +234,18 @@ def calculate_transaction_trends(transactions: list) -> dict:
             "largest_expense": 0.0,
         }
     
-    income = [t.amount for t in transactions if not t.is_debit]
-    expenses = [abs(t.amount) for t in transactions if t.is_debit]
+    if reporting_currency:
+        amounts = get_fx_rates().convert(
+            [t.amount for t in transactions],
+            [t.currency for t in transactions],
+            [t.operation_date for t in transactions],
+            reporting_currency,
+        ).tolist()
+    else:
+        amounts = [t.amount for t in transactions]
+    
+    income = [amount for t, amount in zip(transactions, amounts) if not t.is_debit]
+    expenses = [abs(amount) for t, amount in zip(transactions, amounts) if t.is_debit]
     
     total_income = sum(income)
     total_expenses = sum(expenses)
@@ -126,7 +255,7 @@ def calculate_transaction_trends(transactions: list) -> dict:
         "total_expenses": total_expenses,
         "net_flow": total_income - total_expenses,
         "transaction_count": len(transactions),
-        "avg_transaction": sum(abs(t.amount) for t in transactions) / len(transactions),
+        "avg_transaction": sum(abs(amount) for amount in amounts) / len(transactions),
         "largest_income": max(income) if income else 0.0,
         "largest_expense": max(expenses) if expenses else 0.0,
     }
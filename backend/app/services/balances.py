@@ -0,0 +1,137 @@
+"""Sorted per-IBAN balance store."""
+
+from typing import Iterable, Optional, Sequence
+
+from .partitions import IbanPartitions
+from .shared_store import is_shared
+
+
+class BalanceIndex:
+    """
+    Balance snapshots partitioned by IBAN and sorted by date.
+
+    The store is indexed by `IbanPartitions` on the snapshot date, so range
+    lookups are a pair of integer bisections followed by a slice; lookups
+    take day ordinals too (see app.models.dates). Snapshots are built on
+    lookup only, so a shared store is never materialized by the index;
+    snapshots inserted with `add` are kept by the index.
+    """
+
+    def __init__(self, accounts: Iterable = ()):
+        self._rows = accounts if is_shared(accounts) or isinstance(accounts, list) else list(accounts)
+        self._size = len(self._rows)
+        self._added: list = []
+        self._partitions = IbanPartitions(self._rows, "date")
+
+    def add(self, account) -> None:
+        """Insert one snapshot, keeping its IBAN partition sorted by date."""
+        self._added.append(account)
+        self._partitions.insert(account.iban, account.date_ordinal, self._size + len(self._added) - 1)
+
+    def _take(self, positions: Sequence[int]) -> list:
+        """Snapshots at some positions (store first, then added ones), in that order."""
+        if is_shared(self._rows) and not self._added:
+            return self._rows.take(positions)
+        stored = [position for position in positions if position < self._size]
+        if is_shared(self._rows):
+            stored = iter(self._rows.take(stored))
+        else:
+            stored = (self._rows[position] for position in stored)
+        return [next(stored) if position < self._size else self._added[position - self._size] for position in positions]
+
+    @property
+    def ibans(self) -> list[str]:
+        """IBANs present in the store, in insertion order."""
+        return self._partitions.ibans
+
+    def records(self, iban: str) -> list:
+        """All snapshots of one IBAN, sorted by date."""
+        return self._take(self._partitions.partition(iban)[1])
+
+    def range(self, iban: str, start_date: int, end_date: int) -> list:
+        """
+        Snapshots of one IBAN between two dates (inclusive).
+
+        Args:
+            iban: Account IBAN
+            start_date: First date (day ordinal)
+            end_date: Last date (day ordinal)
+
+        Returns:
+            Snapshots sorted by date
+        """
+        return self._take(self._partitions.positions([iban], start_date, end_date))
+
+    def select(self, ibans: Iterable[str], start_date: int, end_date: int) -> list:
+        """
+        Snapshots of some IBANs between two dates (inclusive).
+
+        The ranges of the partitions are merged by date; snapshots of one
+        date come in store order.
+
+        Args:
+            ibans: Account IBANs (unknown ones match nothing)
+            start_date: First date (day ordinal)
+            end_date: Last date (day ordinal)
+
+        Returns:
+            Snapshots sorted by date
+        """
+        return self._take(self._partitions.positions(ibans, start_date, end_date))
+
+    def as_of(self, iban: str, date: int) -> Optional[object]:
+        """
+        Latest snapshot of one IBAN on or before a date (forward fill).
+
+        Args:
+            iban: Account IBAN
+            date: Lookup date (day ordinal)
+
+        Returns:
+            Snapshot, or None if the IBAN has no snapshot up to that date
+        """
+        position = self._partitions.latest(iban, date)
+        return None if position is None else self._take([position])[0]
+
+    def as_of_many(self, iban: str, dates: Sequence[int]) -> list[Optional[object]]:
+        """
+        As-of lookups of one IBAN for many dates in one pass.
+
+        The requested dates are sorted once and merged against the sorted
+        snapshots, so the cost is O(m log m + n) instead of m bisections.
+
+        Args:
+            iban: Account IBAN
+            dates: Lookup dates (day ordinals), in any order
+
+        Returns:
+            Snapshots aligned with the requested dates (None where missing)
+        """
+        results: list[Optional[object]] = [None] * len(dates)
+        snapshot_dates, positions = self._partitions.partition(iban)
+        if not snapshot_dates:
+            return results
+
+        found: dict[int, list[int]] = {}
+        position = 0
+        for index in sorted(range(len(dates)), key=dates.__getitem__):
+            while position < len(snapshot_dates) and snapshot_dates[position] <= dates[index]:
+                position += 1
+            if position:
+                found.setdefault(positions[position - 1], []).append(index)
+        for record, indices in zip(self._take(list(found)), found.values()):
+            for index in indices:
+                results[index] = record
+        return results
+
+    def snapshot_as_of(self, date: int, ibans: Optional[Iterable[str]] = None) -> list:
+        """Latest snapshot of every IBAN (or of `ibans`) on or before a date (day ordinal)."""
+        wanted = set(ibans) if ibans is not None else None
+        positions = []
+        for iban in self._partitions.ibans:
+            if wanted is not None and iban not in wanted:
+                continue
+            position = self._partitions.latest(iban, date)
+            if position is not None:
+                positions.append(position)
+        return self._take(positions)
@@ -0,0 +1,94 @@
+"""Asyncio fan-out of events to many subscribers."""
+
+import asyncio
+from typing import Any, Optional
+
+
+class Subscription:
+    """
+    One subscriber's bounded event queue.
+
+    When the subscriber falls behind and its queue is full, the oldest
+    event is dropped so publishers never block; the number of dropped
+    events is reported with the next event read.
+    """
+
+    def __init__(self, broadcaster: "Broadcaster", maxsize: int):
+        self._broadcaster = broadcaster
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[tuple[Any, int]]:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout: Seconds to wait before giving up (None waits forever)
+
+        Returns:
+            (event, events dropped since the previous read), or None on timeout
+        """
+        try:
+            event = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        dropped, self.dropped = self.dropped, 0
+        return event, dropped
+
+    def close(self) -> None:
+        """Stop receiving events."""
+        self._broadcaster.unsubscribe(self)
+
+    def _offer(self, event: Any) -> None:
+        """Enqueue an event, dropping the oldest one when full."""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    def _deliver(self, event: Any) -> None:
+        """Enqueue an event from any thread."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._offer(event)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._offer, event)
+
+
+class Broadcaster:
+    """Publish events to every current subscriber without blocking."""
+
+    def __init__(self, maxsize: int = 100):
+        self.maxsize = maxsize
+        self._subscriptions: set[Subscription] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of current subscribers."""
+        return len(self._subscriptions)
+
+    def subscribe(self) -> Subscription:
+        """Register a subscriber. Must be called from a running event loop."""
+        subscription = Subscription(self, self.maxsize)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber."""
+        self._subscriptions.discard(subscription)
+
+    def publish(self, event: Any) -> int:
+        """
+        Deliver an event to every subscriber.
+
+        Returns:
+            Number of subscribers the event was delivered to
+        """
+        subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription._deliver(event)
+        return len(subscriptions)
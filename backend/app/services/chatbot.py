@@ -1,17 +1,25 @@
 """Chatbot service using Azure OpenAI for financial assistance."""
 
+import asyncio
 import os
+import time
 import uuid
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 from openai import AzureOpenAI
 from dotenv import load_dotenv
 
 from ..models.chat import ChatMessage, ChatSession, ChatRequest, ChatResponse
+from .llm_scheduler import QueueTimeout, llm_scheduler
+from .llm_transport import CircuitOpenError, llm_transport, shared_http_client
+from .metrics import chat_responses, llm_request_duration, llm_tokens
 
 # Load environment variables
 load_dotenv()
 
+# Token estimate of a completion for the scheduler's tokens-per-minute budget
+EXPECTED_COMPLETION_TOKENS = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "300"))
+
 # Initialize Azure OpenAI client
 _azure_client = None
 
@@ -27,10 +35,13 @@ def _get_azure_client() -> AzureOpenAI:
             # Return None if API key not configured yet
             return None
         
+        # Retries and timeouts are handled by llm_transport
         _azure_client = AzureOpenAI(
             api_key=api_key,
             api_version=api_version,
             azure_endpoint=azure_endpoint,
+            http_client=shared_http_client(),
+            max_retries=0,
         )
     return _azure_client
 
@@ -68,7 +79,17 @@ def add_message(session_id: str, role: str, content: str, metadata: Optional[dic
     if not session:
         raise ValueError(f"Session {session_id} not found")
     
-    message = ChatMessage(
+    message = _new_message(session_id, role, content, metadata)
+    
+    session.messages.append(message)
+    session.updated_at = datetime.now().isoformat()
+    
+    return message
+
+
+def _new_message(session_id: str, role: str, content: str, metadata: Optional[dict] = None) -> ChatMessage:
+    """Build a message of a session without recording it."""
+    return ChatMessage(
         id=f"msg_{uuid.uuid4().hex[:8]}",
         session_id=session_id,
         role=role,
@@ -76,11 +97,6 @@ def add_message(session_id: str, role: str, content: str, metadata: Optional[dic
         timestamp=datetime.now().isoformat(),
         metadata=metadata or {},
     )
-    
-    session.messages.append(message)
-    session.updated_at = datetime.now().isoformat()
-    
-    return message
 
 
 def generate_ai_response(
@@ -108,6 +124,7 @@ def generate_ai_response(
     
     # If client not configured, use fallback rule-based responses
     if client is None:
+        chat_responses.inc(source="fallback")
         return (_generate_fallback_response(user_message, context_data), "fallback")
     
     try:
@@ -134,17 +151,35 @@ def generate_ai_response(
         model_name = os.getenv("MODEL_NAME", "gpt41")
         temperature = float(os.getenv("MODEL_TEMPERATURE", "0.1"))
         
-        response = client.chat.completions.create(
-            model=model_name,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=1000,
-        )
+        started = time.perf_counter()
+        try:
+            response = llm_transport.complete(
+                client,
+                model=model_name,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=1000,
+            )
+        except CircuitOpenError:
+            # Provider known to be down: answer from the fallback right away
+            chat_responses.inc(source="fallback")
+            return (_generate_fallback_response(user_message, context_data), "fallback")
+        except Exception:
+            llm_request_duration.observe(time.perf_counter() - started, model=model_name, outcome="error")
+            raise
+        llm_request_duration.observe(time.perf_counter() - started, model=model_name, outcome="success")
         
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            llm_tokens.inc(usage.prompt_tokens or 0, model=model_name, kind="prompt")
+            llm_tokens.inc(usage.completion_tokens or 0, model=model_name, kind="completion")
+        
+        chat_responses.inc(source="azure")
         return (response.choices[0].message.content, "azure")
         
     except Exception as e:
         print(f"Error calling Azure OpenAI: {e}")
+        chat_responses.inc(source="fallback")
         return (_generate_fallback_response(user_message, context_data), "fallback")
 
 
@@ -265,32 +300,69 @@ async def process_chat_message(request: ChatRequest, context_data: Optional[dict
         session_id = create_session()
         session = get_session(session_id)
     
-    # Add user message
-    add_message(session_id, "user", request.message)
+    if _get_azure_client() is None:
+        assistant_message = _complete_turn(session_id, request.message, context_data, generate_ai_response)
+    else:
+        # Model calls go through the scheduler; holding the session's slot
+        # for the whole turn keeps concurrent turns of a session in order
+        try:
+            async with llm_scheduler.slot(session_id, _estimate_tokens(session, request.message, context_data)):
+                assistant_message = await asyncio.to_thread(
+                    _complete_turn, session_id, request.message, context_data, generate_ai_response
+                )
+        except QueueTimeout:
+            # Not recorded: an earlier turn of the session may still be
+            # writing to it, and this one never held the session's slot
+            text, source = _queue_timeout_response(request.message, context_data)
+            assistant_message = _new_message(session_id, "assistant", text, _answer_metadata(source))
     
-    # Generate AI response
-    ai_response_text, source = generate_ai_response(request.message, session_id, context_data)
+    # Get suggestions
+    suggestions = get_conversation_suggestions(session)
+    
+    return ChatResponse(
+        session_id=session_id,
+        message=assistant_message,
+        suggestions=suggestions,
+    )
+
+
+def _complete_turn(
+    session_id: str,
+    user_message: str,
+    context_data: Optional[dict],
+    generate: Callable[[str, str, Optional[dict]], Tuple[str, str]],
+) -> ChatMessage:
+    """Record the user message, generate the answer and record it."""
+    add_message(session_id, "user", user_message)
+    ai_response_text, source = generate(user_message, session_id, context_data)
     
-    # Add assistant message
     # Add assistant message with explainability metadata
+    return add_message(session_id, "assistant", ai_response_text, _answer_metadata(source))
+
+
+def _answer_metadata(source: str) -> dict:
+    """Explainability metadata of an assistant answer."""
     model_name = os.getenv("MODEL_NAME", "gpt41") if source == "azure" else "rule-based"
     temperature = os.getenv("MODEL_TEMPERATURE", "0.1") if source == "azure" else None
-    metadata = {
+    return {
         "source": source,
         "model_name": model_name,
         **({"temperature": float(temperature)} if temperature is not None else {}),
         "explain": "Réponse générée via Azure OpenAI" if source == "azure" else "Réponse générée via règles de secours",
     }
-    assistant_message = add_message(session_id, "assistant", ai_response_text, metadata)
-    
-    # Get suggestions
-    suggestions = get_conversation_suggestions(session)
-    
-    return ChatResponse(
-        session_id=session_id,
-        message=assistant_message,
-        suggestions=suggestions,
-    )
+
+
+def _queue_timeout_response(user_message: str, context_data: Optional[dict] = None) -> Tuple[str, str]:
+    """Fallback answer for a turn the LLM scheduler could not admit in time."""
+    chat_responses.inc(source="fallback")
+    return (_generate_fallback_response(user_message, context_data), "fallback")
+
+
+def _estimate_tokens(session: ChatSession, user_message: str, context_data: Optional[dict] = None) -> int:
+    """Rough token cost of a completion: about 4 characters per prompt token, plus the expected answer."""
+    history = sum(len(msg.content) for msg in session.messages[-10:])
+    prompt = len(_build_system_prompt(context_data)) + history + len(user_message)
+    return prompt // 4 + EXPECTED_COMPLETION_TOKENS
 
 
 def clear_session(session_id: str) -> bool:
@@ -0,0 +1,62 @@
+"""Version counter of the in-memory data stores."""
+
+import secrets
+import threading
+from typing import Optional
+
+
+_version = 0
+# Drawn once per process: counters restart at 0 and every worker keeps its
+# own, so a version number alone does not identify the data across
+# restarts or workers
+_EPOCH = secrets.token_hex(8)
+# Identifier of the data loaded at startup, and the version it was loaded at
+_source: Optional[str] = None
+_source_version = -1
+_lock = threading.Lock()
+
+
+def current_data_version() -> int:
+    """Return the current data version."""
+    return _version
+
+
+def bump_data_version() -> int:
+    """Record that store data changed, invalidating anything derived from it.
+
+    Returns:
+        The new data version.
+    """
+    global _version
+    with _lock:
+        _version += 1
+        return _version
+
+
+def set_data_source(source: str) -> None:
+    """
+    Record that the stores hold the data identified by `source`.
+
+    Call it once the stores are loaded: every process loading the same
+    data (e.g. from the same fixtures and code) tags the current version
+    the same way.
+    """
+    global _source, _source_version
+    with _lock:
+        _source, _source_version = source, _version
+
+
+def data_tag(version: int) -> str:
+    """
+    Identifier of a data version, shared by processes holding the same data.
+
+    The version the data source was recorded at is tagged with the source
+    itself, so workers and restarts loading the same data agree and HTTP
+    ETags stay valid across them. Any later version (stores changed in
+    this process, e.g. by a POST) is tagged with a per-process component:
+    it never matches another process or an earlier run, so a client
+    revalidating against them gets a full response, not a stale 304.
+    """
+    if _source is not None and version == _source_version:
+        return f"source.{_source}"
+    return f"{_EPOCH}.{version}"
@@ -0,0 +1,106 @@
+"""Time-series downsampling for chart-friendly payloads."""
+
+from typing import Sequence
+
+
+# Supported downsampling methods
+DOWNSAMPLING_METHODS = ("lttb", "minmax")
+
+
+def lttb(points: Sequence[tuple[float, float]], threshold: int) -> list[int]:
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, for each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves the visual shape.
+
+    Args:
+        points: (x, y) pairs sorted by x
+        threshold: Maximum number of points to keep
+
+    Returns:
+        Sorted indices of the points to keep
+    """
+    count = len(points)
+    if threshold >= count:
+        return list(range(count))
+    if threshold <= 2:
+        return [0, count - 1][:max(threshold, 0)]
+
+    selected = [0]
+    bucket_size = (count - 2) / (threshold - 2)
+    previous = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Average of the next bucket (last point for the final bucket)
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        if next_start >= next_end:
+            next_start, next_end = count - 1, count
+        span = next_end - next_start
+        avg_x = sum(points[i][0] for i in range(next_start, next_end)) / span
+        avg_y = sum(points[i][1] for i in range(next_start, next_end)) / span
+
+        prev_x, prev_y = points[previous]
+        best_area = -1.0
+        best_index = start
+        for index in range(start, end):
+            x, y = points[index]
+            area = abs((prev_x - avg_x) * (y - prev_y) - (prev_x - x) * (avg_y - prev_y))
+            if area > best_area:
+                best_area = area
+                best_index = index
+
+        selected.append(best_index)
+        previous = best_index
+
+    selected.append(count - 1)
+    return selected
+
+
+def min_max(points: Sequence[tuple[float, float]], threshold: int) -> list[int]:
+    """
+    Downsample a series by keeping the minimum and maximum of each bucket.
+
+    Guarantees that every peak and trough survives, at the cost of a less
+    faithful shape than LTTB.
+
+    Args:
+        points: (x, y) pairs sorted by x
+        threshold: Maximum number of points to keep
+
+    Returns:
+        Sorted indices of the points to keep
+    """
+    count = len(points)
+    if threshold >= count:
+        return list(range(count))
+
+    buckets = max(1, threshold // 2)
+    bucket_size = count / buckets
+    selected = []
+
+    for bucket in range(buckets):
+        start = int(bucket * bucket_size)
+        end = min(int((bucket + 1) * bucket_size), count)
+        if start >= end:
+            continue
+        indices = range(start, end)
+        low = min(indices, key=lambda i: points[i][1])
+        high = max(indices, key=lambda i: points[i][1])
+        selected.extend(sorted({low, high}))
+
+    return selected
+
+
+def downsample(points: Sequence[tuple[float, float]], threshold: int, method: str = "lttb") -> list[int]:
+    """Downsample a series with the requested method and return kept indices."""
+    if method == "lttb":
+        return lttb(points, threshold)
+    if method == "minmax":
+        return min_max(points, threshold)
+    raise ValueError(f"Unsupported downsampling method: {method}")
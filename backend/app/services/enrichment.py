@@ -2,6 +2,7 @@
 
 from typing import Optional
 from ..models.transaction import TransactionCategory, TransactionResponse, EnrichedTransaction
+from .metrics import enrichment_calls
 
 
 # Predefined category definitions
@@ -154,6 +155,7 @@ def enrich_transaction(transaction: TransactionResponse) -> EnrichedTransaction:
     Returns:
         EnrichedTransaction: Transaction with enriched metadata
     """
+    enrichment_calls.inc()
     category = categorize_transaction(
         transaction.amount,
         transaction.is_debit,
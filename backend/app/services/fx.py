@@ -0,0 +1,123 @@
+"""Foreign exchange conversion with dated, cached rate tables."""
+
+import json
+import os
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+# Default location of the local rates file
+DEFAULT_RATES_PATH = Path(__file__).resolve().parent.parent / "data" / "fx_rates.json"
+
+# Dates whose rate row lookup is memoized (least recently used ones are evicted)
+ROW_CACHE_SIZE = 16384
+
+
+class FxRates:
+    """
+    Dated exchange rates against a base currency.
+
+    Rates are stored as a (dates x currencies) table of units per base
+    currency; each row applies from its date until the next one. The
+    conversion matrix of a row (factor from any currency to any other) is
+    computed once and memoized (one per row), and lookups for a date go
+    through a bounded LRU memo, so repeated conversions on the same dates
+    cost cache hits.
+    """
+
+    def __init__(self, base: str, rates: dict[str, dict[str, float]]):
+        if not rates:
+            raise ValueError("FX rates table is empty")
+        self.base = base
+        self.dates = sorted(rates)
+        self.currencies = sorted({base, *(code for row in rates.values() for code in row)})
+        self._index = {code: position for position, code in enumerate(self.currencies)}
+
+        self._table = np.ones((len(self.dates), len(self.currencies)))
+        for row, rate_date in enumerate(self.dates):
+            for code, rate in rates[rate_date].items():
+                self._table[row, self._index[code]] = rate
+
+        self._row = lru_cache(maxsize=ROW_CACHE_SIZE)(self._find_row)
+        self._matrices: dict[int, np.ndarray] = {}
+
+    @classmethod
+    def from_file(cls, path: Path) -> "FxRates":
+        """Load rates from a JSON file with "base" and "rates" keys."""
+        with open(path, encoding="utf-8") as handle:
+            document = json.load(handle)
+        return cls(document["base"], document["rates"])
+
+    def supports(self, currency: str) -> bool:
+        """True if the currency is in the table."""
+        return currency in self._index
+
+    def _currency_index(self, currency: str) -> int:
+        """Column of a currency, raising ValueError when unknown."""
+        try:
+            return self._index[currency]
+        except KeyError:
+            raise ValueError(f"Unsupported currency: {currency}") from None
+
+    def _find_row(self, date: str) -> int:
+        """Row of the rates in effect on a date (first row before the table starts)."""
+        return max(bisect_right(self.dates, date) - 1, 0)
+
+    def matrix(self, date: str) -> np.ndarray:
+        """
+        Conversion matrix in effect on a date.
+
+        Element [i, j] converts one unit of currency i into currency j.
+        """
+        row = self._row(date)
+        matrix = self._matrices.get(row)
+        if matrix is None:
+            rates = self._table[row]
+            matrix = self._matrices[row] = rates[np.newaxis, :] / rates[:, np.newaxis]
+        return matrix
+
+    def factor(self, source: str, target: str, date: str) -> float:
+        """Factor converting one unit of source currency into target currency on a date."""
+        if source == target:
+            return 1.0
+        return float(self.matrix(date)[self._currency_index(source), self._currency_index(target)])
+
+    def convert(
+        self,
+        amounts: Sequence[float],
+        currencies: Sequence[str],
+        dates: Sequence[str],
+        target: str,
+    ) -> np.ndarray:
+        """
+        Convert many amounts into one currency in a single vectorized step.
+
+        Args:
+            amounts: Amounts to convert
+            currencies: Currency of each amount
+            dates: Date (YYYY-MM-DD) of each amount
+            target: Reporting currency
+
+        Returns:
+            Converted amounts, aligned with the inputs
+        """
+        target_index = self._currency_index(target)
+        sources = np.fromiter((self._currency_index(c) for c in currencies), dtype=np.intp, count=len(currencies))
+        rows = np.fromiter((self._row(d) for d in dates), dtype=np.intp, count=len(dates))
+        values = np.asarray(amounts, dtype=float)
+        return values * self._table[rows, target_index] / self._table[rows, sources]
+
+
+_fx_rates: Optional[FxRates] = None
+
+
+def get_fx_rates() -> FxRates:
+    """Get or load the shared rates table (FX_RATES_PATH overrides the default file)."""
+    global _fx_rates
+    if _fx_rates is None:
+        _fx_rates = FxRates.from_file(Path(os.getenv("FX_RATES_PATH", DEFAULT_RATES_PATH)))
+    return _fx_rates
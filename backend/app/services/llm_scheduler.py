@@ -0,0 +1,203 @@
+"""Fair asyncio scheduler for LLM calls with concurrency and token budgets."""
+
+import asyncio
+import contextlib
+import os
+import time
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Callable, Deque, Dict, Optional
+
+from .metrics import llm_queue_depth, llm_queue_in_flight, llm_queue_timeouts, llm_queue_wait
+
+
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Provider tokens-per-minute quota to stay under (0 = unlimited)
+TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "10"))
+
+
+class QueueTimeout(Exception):
+    """The call waited in the queue past its deadline and was dropped."""
+
+
+class TokenBucket:
+    """Tokens-per-minute budget refilled continuously, bursting up to one minute's worth."""
+
+    def __init__(self, tokens_per_minute: int, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, tokens: int) -> float:
+        """Seconds until `tokens` are available (0 when they are now)."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        missing = min(tokens, self.capacity) - self._tokens
+        return max(missing / self.rate, 0.0)
+
+    def take(self, tokens: int) -> None:
+        if self.rate > 0:
+            self._refill()
+            self._tokens -= min(tokens, self.capacity)
+
+
+class _Ticket:
+    """One queued call."""
+
+    __slots__ = ("session_id", "tokens", "future", "enqueued")
+
+    def __init__(self, session_id: str, tokens: int, future: asyncio.Future, enqueued: float):
+        self.session_id = session_id
+        self.tokens = tokens
+        self.future = future
+        self.enqueued = enqueued
+
+
+class LLMScheduler:
+    """
+    Admission control for LLM calls.
+
+    Calls wait in one FIFO queue per session, and a session has at most
+    one call running, so its turns are handled in order. Sessions are
+    served round-robin, so a chatty session cannot starve the others.
+    A call is admitted when a concurrency slot is free and the
+    tokens-per-minute budget covers its estimated tokens; a call still
+    queued after its deadline fails with QueueTimeout, so bursts degrade
+    to fallback answers instead of piling up on the provider.
+
+    All methods must be used from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENCY,
+        tokens_per_minute: int = TOKENS_PER_MINUTE,
+        queue_timeout: float = QUEUE_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.bucket = TokenBucket(tokens_per_minute, clock)
+        self._clock = clock
+        self._queues: Dict[str, Deque[_Ticket]] = {}
+        # Sessions with queued calls and none running, in serving order
+        self._rotation: "OrderedDict[str, None]" = OrderedDict()
+        self._running: set = set()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._running)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, session_id: str, tokens: int = 0, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Wait for the session's turn and a free slot, and hold it.
+
+        Args:
+            session_id: Session the call belongs to.
+            tokens: Estimated tokens of the call (prompt and completion).
+            timeout: Queue deadline in seconds (defaults to queue_timeout).
+
+        Raises:
+            QueueTimeout: The call was not admitted in time.
+        """
+        await self._acquire(session_id, tokens, self.queue_timeout if timeout is None else timeout)
+        try:
+            yield
+        finally:
+            self._release(session_id)
+
+    async def _acquire(self, session_id: str, tokens: int, timeout: float) -> None:
+        loop = asyncio.get_running_loop()
+        ticket = _Ticket(session_id, tokens, loop.create_future(), self._clock())
+        self._queues.setdefault(session_id, deque()).append(ticket)
+        if session_id not in self._running:
+            self._rotation[session_id] = None
+        self._update_gauges()
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+            if ticket.future.done() and not ticket.future.cancelled():
+                # Admitted while the wait was being cancelled: give the slot back
+                self._release(session_id)
+            else:
+                ticket.future.cancel()
+                self._discard(ticket)
+            if isinstance(error, asyncio.TimeoutError):
+                llm_queue_timeouts.inc()
+                raise QueueTimeout(f"LLM call of session {session_id} waited more than {timeout:g}s") from None
+            raise
+        llm_queue_wait.observe(self._clock() - ticket.enqueued)
+
+    def _release(self, session_id: str) -> None:
+        self._running.discard(session_id)
+        if session_id in self._queues:
+            # Back of the rotation: sessions that waited meanwhile go first
+            self._rotation[session_id] = None
+        self._update_gauges()
+        self._dispatch()
+
+    def _discard(self, ticket: _Ticket) -> None:
+        queue = self._queues.get(ticket.session_id)
+        if queue is not None and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                del self._queues[ticket.session_id]
+                self._rotation.pop(ticket.session_id, None)
+        self._update_gauges()
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit queued calls, round-robin across idle sessions."""
+        while self._rotation and len(self._running) < self.max_concurrency:
+            session_id = next(iter(self._rotation))
+            queue = self._queues[session_id]
+            ticket = queue[0]
+            wait = self.bucket.wait_time(ticket.tokens)
+            if wait > 0:
+                self._schedule_wakeup(wait)
+                break
+            queue.popleft()
+            if not queue:
+                del self._queues[session_id]
+            del self._rotation[session_id]
+            self.bucket.take(ticket.tokens)
+            self._running.add(session_id)
+            ticket.future.set_result(None)
+        self._update_gauges()
+
+    def _schedule_wakeup(self, delay: float) -> None:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _update_gauges(self) -> None:
+        llm_queue_depth.set(self.queued)
+        llm_queue_in_flight.set(self.in_flight)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "sessions_waiting": len(self._queues),
+            "max_concurrency": self.max_concurrency,
+            "tokens_per_minute": int(self.bucket.capacity),
+        }
+
+
+# Scheduler used by the chatbot
+llm_scheduler = LLMScheduler()
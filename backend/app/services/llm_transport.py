@@ -0,0 +1,283 @@
+"""Resilient transport for LLM calls: connection pool, deadlines, retries and circuit breaker."""
+
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+import httpx
+import openai
+
+from .metrics import llm_circuit_rejections, llm_circuit_state, llm_retries
+
+
+# Total time budget of one completion, retries included
+DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "20"))
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "3"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+# Consecutive failed calls that open the breaker, and how long it stays open
+BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+POOL_MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "20"))
+POOL_MAX_KEEPALIVE = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "10"))
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Transient failures worth another attempt; other API errors (400, 401...) are not
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+class CircuitOpenError(Exception):
+    """The circuit breaker rejected the call without reaching the provider."""
+
+
+class DeadlineExceeded(Exception):
+    """The call's time budget ran out before a completion arrived."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Closed: calls pass. After `failure_threshold` consecutive failures it
+    opens and rejects calls for `reset_timeout` seconds; then it lets one
+    probe call through (half-open), closing on success and reopening on
+    failure.
+    """
+
+    def __init__(
+        self,
+        name: str = "llm",
+        failure_threshold: int = BREAKER_FAILURES,
+        reset_timeout: float = BREAKER_RESET_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        llm_circuit_state.set(_STATE_VALUES[CLOSED], breaker=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (claims the probe when half-open)."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._set_state(HALF_OPEN)
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._set_state(OPEN)
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor failed on the provider side."""
+        with self._lock:
+            self._probing = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            self._set_state(CLOSED)
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        llm_circuit_state.set(_STATE_VALUES[state], breaker=self.name)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Delay requested by the provider in a Retry-After(-ms) header, if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(float(value) / 1000, 0.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _reason(error: Exception) -> str:
+    if isinstance(error, openai.RateLimitError):
+        return "rate_limited"
+    if isinstance(error, openai.APITimeoutError):
+        return "timeout"
+    if isinstance(error, openai.APIConnectionError):
+        return "connection"
+    return "server_error"
+
+
+class LLMTransport:
+    """
+    Completion calls with a total deadline, jittered retries and a breaker.
+
+    Each call gets `deadline` seconds in all: every attempt's timeout is
+    the remaining budget, and a retry is only made when its backoff fits in
+    it. Backoff uses full jitter (a random delay up to an exponentially
+    growing cap) unless the provider sent Retry-After. A call that still
+    fails counts once against the circuit breaker; while the breaker is
+    open, calls fail immediately with CircuitOpenError.
+    """
+
+    def __init__(
+        self,
+        breaker: Optional[CircuitBreaker] = None,
+        deadline: float = DEADLINE_SECONDS,
+        max_retries: int = MAX_RETRIES,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """Delay before retry number `attempt` (0-based)."""
+        requested = retry_after_seconds(error)
+        if requested is not None:
+            return requested
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def complete(self, client: Any, **params: Any) -> Any:
+        """
+        Create a chat completion through `client`.
+
+        Args:
+            client: OpenAI or AzureOpenAI client (ideally built with
+                `max_retries=0` and `shared_http_client()`).
+            **params: Arguments of `client.chat.completions.create`.
+
+        Returns:
+            The completion.
+
+        Raises:
+            CircuitOpenError: The breaker is open; nothing was sent.
+            DeadlineExceeded: The time budget ran out between attempts.
+            openai.OpenAIError: The last attempt's error.
+        """
+        if not self.breaker.allow():
+            llm_circuit_rejections.inc(breaker=self.breaker.name)
+            raise CircuitOpenError(f"Circuit '{self.breaker.name}' is open")
+
+        model = params.get("model", "")
+        expires = self._clock() + self.deadline
+        attempt = 0
+        try:
+            while True:
+                remaining = expires - self._clock()
+                try:
+                    response = client.chat.completions.create(**params, timeout=remaining)
+                except RETRYABLE_ERRORS as error:
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = self.backoff(attempt, error)
+                    if delay >= expires - self._clock():
+                        raise DeadlineExceeded(
+                            f"No time left to retry after {type(error).__name__}"
+                        ) from error
+                    llm_retries.inc(model=model, reason=_reason(error))
+                    self._sleep(delay)
+                    attempt += 1
+                    continue
+                self.breaker.record_success()
+                return response
+        except (DeadlineExceeded, *RETRYABLE_ERRORS):
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def shared_http_client() -> httpx.Client:
+    """Process-wide keep-alive connection pool for LLM calls."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(
+                timeout=httpx.Timeout(DEADLINE_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=POOL_MAX_CONNECTIONS,
+                    max_keepalive_connections=POOL_MAX_KEEPALIVE,
+                ),
+            )
+        return _http_client
+
+
+def close_shared_http_client() -> None:
+    """Close the connection pool (it is recreated on next use)."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
+# Transport used by the chatbot
+llm_transport = LLMTransport()
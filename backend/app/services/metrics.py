@@ -0,0 +1,287 @@
+"""In-process metrics registry exposed in the Prometheus text format."""
+
+import math
+import threading
+from typing import Callable, Iterable, Optional
+
+
+# Default latency buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Response size buckets, in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# LLM call latency buckets, in seconds
+LLM_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    """Render a label set as {name="value",...}."""
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Base class of labelled metrics."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        """Label values in declaration order."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        """(sample name, labels, value) triples."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render the metric family in the text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """Increase the counter of a label set."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        """Current value of a label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in items]
+
+
+class Gauge(Counter):
+    """Value that can go up and down per label set."""
+
+    type = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """Increase the gauge of a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        """Decrease the gauge of a label set."""
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        """Set the gauge of a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets per label set."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[position] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        """Number of observations of a label set."""
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        samples = []
+        for key, (counts, total, count) in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = "+Inf" if math.isinf(bound) else _format_value(bound)
+                samples.append((f"{self.name}_bucket", {**labels, "le": le}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Named metrics plus collectors evaluated at scrape time.
+
+    Collectors are callables returning metrics built on the fly from state
+    that is already tracked elsewhere (e.g. cache statistics).
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Callable[[], Iterable[Metric]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        """Get or create a metric of a type."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric {name} is already registered as a {metric.type}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram, name, documentation, labelnames, buckets)
+
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        """Register a callable producing metrics at scrape time."""
+        self._collectors.append(collector)
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Registered metric by name."""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        metrics = list(self._metrics.values())
+        for collector in self._collectors:
+            metrics.extend(collector())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by method, route and status.", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds.", ("method", "route")
+)
+http_response_size = registry.histogram(
+    "http_response_size_bytes", "HTTP response body size in bytes, as sent.", ("method", "route"), SIZE_BUCKETS
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.", ("method",)
+)
+http_cache_requests = registry.counter(
+    "http_cache_requests_total", "HTTP response cache lookups by result.", ("result",)
+)
+
+# Queries
+query_rows_scanned = registry.counter(
+    "query_rows_scanned_total", "Store rows examined by queries.", ("query",)
+)
+query_rows_returned = registry.counter(
+    "query_rows_returned_total", "Rows returned by queries.", ("query",)
+)
+enrichment_calls = registry.counter(
+    "enrichment_calls_total", "Transactions passed through enrichment."
+)
+
+# LLM
+llm_request_duration = registry.histogram(
+    "llm_request_duration_seconds", "LLM completion latency in seconds.", ("model", "outcome"), LLM_LATENCY_BUCKETS
+)
+llm_tokens = registry.counter(
+    "llm_tokens_total", "LLM tokens used, by kind (prompt or completion).", ("model", "kind")
+)
+chat_responses = registry.counter(
+    "chat_responses_total", "Chat responses by source (azure or fallback).", ("source",)
+)
+llm_retries = registry.counter(
+    "llm_retries_total", "LLM call retries by reason (rate_limited, timeout, connection, server_error).", ("model", "reason")
+)
+llm_circuit_state = registry.gauge(
+    "llm_circuit_state", "LLM circuit breaker state (0 closed, 1 half-open, 2 open).", ("breaker",)
+)
+llm_circuit_rejections = registry.counter(
+    "llm_circuit_rejections_total", "LLM calls rejected by an open circuit breaker.", ("breaker",)
+)
+llm_queue_depth = registry.gauge(
+    "llm_queue_depth", "LLM calls waiting in the scheduler queue."
+)
+llm_queue_in_flight = registry.gauge(
+    "llm_queue_in_flight", "LLM calls admitted by the scheduler and still running."
+)
+llm_queue_wait = registry.histogram(
+    "llm_queue_wait_seconds", "Time LLM calls waited in the scheduler queue.", (), LLM_LATENCY_BUCKETS
+)
+llm_queue_timeouts = registry.counter(
+    "llm_queue_timeouts_total", "LLM calls dropped after waiting past their queue deadline."
+)
@@ -0,0 +1,96 @@
+"""Per-IBAN partitions of a row store, sorted by date."""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from ..models.dates import date_ordinal
+from .shared_store import is_shared
+
+
+class IbanPartitions:
+    """
+    Row positions of a store partitioned by IBAN and sorted by a date field.
+
+    Each partition keeps the day ordinals of its rows and their positions
+    in the store, sorted by (date, position). A single-account query
+    bisects one partition; a multi-account query merges the matching runs
+    of several partitions, so rows come out in date order (store order
+    within a day) without scanning other accounts.
+
+    The store is read once when the partitions are built; rebuild them
+    when the store is replaced.
+    """
+
+    def __init__(self, rows: Sequence = (), field: str = "operation_date"):
+        self._rows = rows
+        self._dates: dict[str, list[int]] = {}
+        self._positions: dict[str, list[int]] = {}
+
+        if is_shared(rows):
+            # Straight from the mapped columns, without building models
+            ibans, dates = rows.column("iban"), rows.column(field)
+        else:
+            ibans = [row.iban for row in rows]
+            dates = [getattr(row, field) for row in rows]
+
+        partitions: dict[str, list[tuple[int, int]]] = {}
+        for position, (iban, value) in enumerate(zip(ibans, dates)):
+            partitions.setdefault(iban, []).append((date_ordinal(value), position))
+        for iban, entries in partitions.items():
+            entries.sort()
+            self._dates[iban] = [day for day, _ in entries]
+            self._positions[iban] = [position for _, position in entries]
+
+    @property
+    def ibans(self) -> list[str]:
+        """IBANs present in the store, in order of first appearance."""
+        return list(self._dates)
+
+    def insert(self, iban: str, day: int, position: int) -> None:
+        """Add a row appended after the others to its partition, keeping it sorted."""
+        dates = self._dates.setdefault(iban, [])
+        index = bisect_right(dates, day)
+        dates.insert(index, day)
+        self._positions.setdefault(iban, []).insert(index, position)
+
+    def partition(self, iban: str) -> Tuple[List[int], List[int]]:
+        """Day ordinals and store positions of one IBAN's rows, sorted (not to be modified)."""
+        return self._dates.get(iban, []), self._positions.get(iban, [])
+
+    def latest(self, iban: str, day: int) -> Optional[int]:
+        """Position of the last row of one IBAN on or before a date, or None."""
+        dates, positions = self.partition(iban)
+        index = bisect_right(dates, day)
+        return positions[index - 1] if index else None
+
+    def positions(self, ibans: Iterable[str], start: int, end: int) -> List[int]:
+        """
+        Store positions of the rows of some IBANs between two dates (inclusive).
+
+        Args:
+            ibans: Account IBANs (unknown ones match nothing)
+            start: First date (day ordinal)
+            end: Last date (day ordinal)
+
+        Returns:
+            Positions sorted by date, then by position
+        """
+        runs = []
+        for iban in dict.fromkeys(ibans):
+            dates = self._dates.get(iban)
+            if not dates:
+                continue
+            low, high = bisect_left(dates, start), bisect_right(dates, end)
+            if low < high:
+                runs.append(zip(dates[low:high], self._positions[iban][low:high]))
+        if len(runs) == 1:
+            return [position for _, position in runs[0]]
+        return [position for _, position in heapq.merge(*runs)]
+
+    def select(self, ibans: Iterable[str], start: int, end: int) -> list:
+        """Rows of some IBANs between two dates (inclusive), in date order."""
+        positions = self.positions(ibans, start, end)
+        if is_shared(self._rows):
+            return self._rows.take(positions)
+        return [self._rows[position] for position in positions]
@@ -0,0 +1,166 @@
+"""Per-request phase timers and on-demand cProfile artifacts."""
+
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+# Phase durations (seconds) of the current request, or None outside a request
+_phases: ContextVar[Optional[dict[str, float]]] = ContextVar("request_phases", default=None)
+
+
+def start_phase_timing() -> dict[str, float]:
+    """Begin collecting phase durations in the current context."""
+    phases: dict[str, float] = {}
+    _phases.set(phases)
+    return phases
+
+
+def phase_timings() -> dict[str, float]:
+    """Phase durations collected so far in the current context."""
+    return dict(_phases.get() or {})
+
+
+@contextmanager
+def span(name: str):
+    """
+    Time a request phase (e.g. store, filter, aggregate).
+
+    Durations of the same phase add up. Outside a timed request this only
+    costs a context variable lookup.
+    """
+    phases = _phases.get()
+    if phases is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+
+def server_timing_header(phases: dict[str, float]) -> str:
+    """Format phase durations as a Server-Timing header value (milliseconds)."""
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in phases.items())
+
+
+@dataclass
+class ProfileArtifact:
+    """cProfile results of one request."""
+
+    profile_id: str
+    method: str
+    path: str
+    query_string: str
+    created_at: str
+    duration: float
+    stats: dict
+
+    def report(self, sort: str = "cumulative", limit: int = 50) -> str:
+        """Human-readable pstats report."""
+        stream = io.StringIO()
+        loaded = pstats.Stats(_StatsHolder(self.stats), stream=stream)
+        loaded.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def dump(self) -> bytes:
+        """Raw stats in the .prof format read by pstats and snakeviz."""
+        return marshal.dumps(self.stats)
+
+    def summary(self) -> dict:
+        """Metadata of the artifact."""
+        return {
+            "profile_id": self.profile_id,
+            "method": self.method,
+            "path": self.path,
+            "query_string": self.query_string,
+            "created_at": self.created_at,
+            "duration_ms": round(self.duration * 1000, 2),
+        }
+
+
+class _StatsHolder:
+    """Minimal profiler stand-in so pstats can load stored stats."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class ProfileStore:
+    """Most recent profile artifacts, kept in memory."""
+
+    def __init__(self, max_profiles: int = 20):
+        self.max_profiles = max_profiles
+        self._profiles: OrderedDict[str, ProfileArtifact] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, artifact: ProfileArtifact) -> None:
+        """Store an artifact, dropping the oldest ones over the limit."""
+        with self._lock:
+            self._profiles[artifact.profile_id] = artifact
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[ProfileArtifact]:
+        """Artifact by id."""
+        return self._profiles.get(profile_id)
+
+    def list(self) -> list[ProfileArtifact]:
+        """Stored artifacts, newest first."""
+        return list(reversed(self._profiles.values()))
+
+
+def new_profile_id() -> str:
+    """Identifier of a new profile artifact."""
+    return f"prof_{uuid.uuid4().hex[:12]}"
+
+
+def profile_artifact(
+    profiler: cProfile.Profile,
+    profile_id: str,
+    scope,
+    duration: float,
+) -> ProfileArtifact:
+    """Build an artifact from a finished profiler and its request scope."""
+    profiler.create_stats()
+    return ProfileArtifact(
+        profile_id=profile_id,
+        method=scope["method"],
+        path=scope["path"],
+        query_string=scope.get("query_string", b"").decode("latin-1"),
+        created_at=datetime.now().isoformat(),
+        duration=duration,
+        stats=profiler.stats,
+    )
+
+
+# Admin switch: requests only get profiled when this is on
+_profiling_enabled = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+
+profile_store = ProfileStore(max_profiles=int(os.getenv("PROFILING_MAX_PROFILES", "20")))
+
+
+def profiling_enabled() -> bool:
+    """True if requests may ask to be profiled."""
+    return _profiling_enabled
+
+
+def set_profiling_enabled(enabled: bool) -> None:
+    """Turn on-demand profiling on or off at runtime."""
+    global _profiling_enabled
+    _profiling_enabled = enabled
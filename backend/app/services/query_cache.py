@@ -0,0 +1,236 @@
+"""Memoization of query results keyed by canonical parameters and data version."""
+
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Hashable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from .data_version import current_data_version
+from .metrics import Counter, Gauge, registry
+from .singleflight import SingleFlight
+
+
+# Default bounds, overridable per cache
+DEFAULT_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "128"))
+DEFAULT_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "300"))
+
+_MISSING = object()
+
+# Set for requests that must recompute their results (e.g. profiled ones)
+_bypass: ContextVar[bool] = ContextVar("query_cache_bypass", default=False)
+
+
+def bypass_query_caches(enabled: bool = True) -> None:
+    """Skip every query cache in the current context."""
+    _bypass.set(enabled)
+
+
+async def run_query(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking query function off the event loop.
+
+    Runs in the threadpool, so the loop keeps serving other requests and
+    concurrent identical queries overlap and coalesce in their cache's
+    single-flight layer. Requests bypassing the caches (profiled ones)
+    run inline, where cProfile can see the work.
+    """
+    if _bypass.get():
+        return func(*args, **kwargs)
+    return await run_in_threadpool(func, *args, **kwargs)
+
+
+def canonicalize(value: Any) -> Hashable:
+    """Turn a parameter value into a hashable, order-normalized form."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, canonicalize(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(canonicalize(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(canonicalize(item) for item in value))
+    return value
+
+
+class QueryCache:
+    """
+    LRU cache with time-to-live for one query function.
+
+    Entries are only valid for the data version they were computed at; the
+    whole cache is dropped when the version changes, so reloading a store
+    invalidates every result derived from it. Concurrent misses of the
+    same entry are computed once through `flight`.
+    """
+
+    def __init__(self, name: str, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self.flight = SingleFlight(name)
+
+    def get(self, key: Hashable, version: int) -> Any:
+        """Return a cached value, or _MISSING if absent or expired."""
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return _MISSING
+
+    def put(self, key: Hashable, version: int, value: Any) -> None:
+        """Store a value, evicting the least recently used entries over the limit."""
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+            self.flight.executions = self.flight.coalesced = 0
+
+    def stats(self) -> dict:
+        """Hit/miss statistics of this cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "coalesced": self.flight.coalesced,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    def _check_version(self, version: int) -> None:
+        """Drop entries computed from an older data version."""
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+
+# Every cache created by cached_query, by name
+_caches: dict[str, QueryCache] = {}
+
+
+def cached_query(
+    name: str,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    ttl_seconds: float = DEFAULT_TTL_SECONDS,
+) -> Callable:
+    """
+    Memoize a query function (sync or async) on its canonical parameters.
+
+    Arguments are bound to the function signature with defaults applied,
+    so positional and keyword calls share entries. Concurrent misses of
+    the same parameters and data version wait for a single computation.
+    Cached results are shared between callers and must be treated as
+    read-only. Exceptions are not cached.
+
+    Args:
+        name: Cache name reported in statistics (usually the route)
+        max_entries: Maximum number of cached results
+        ttl_seconds: Lifetime of a cached result
+    """
+    cache = _caches[name] = QueryCache(name, max_entries, ttl_seconds)
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        def make_key(args, kwargs) -> Hashable:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple((key, canonicalize(value)) for key, value in bound.arguments.items())
+
+        def compute(key, version, args, kwargs):
+            value = func(*args, **kwargs)
+            cache.put(key, version, value)
+            return value
+
+        async def compute_async(key, version, args, kwargs):
+            value = await func(*args, **kwargs)
+            cache.put(key, version, value)
+            return value
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _bypass.get():
+                    return await func(*args, **kwargs)
+                key = make_key(args, kwargs)
+                version = current_data_version()
+                value = cache.get(key, version)
+                if value is _MISSING:
+                    value = await cache.flight.do_async((key, version), compute_async, key, version, args, kwargs)
+                return value
+
+            async_wrapper.cache = cache
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _bypass.get():
+                return func(*args, **kwargs)
+            key = make_key(args, kwargs)
+            version = current_data_version()
+            value = cache.get(key, version)
+            if value is _MISSING:
+                value = cache.flight.do((key, version), compute, key, version, args, kwargs)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def query_cache_stats() -> dict[str, dict]:
+    """Statistics of every query cache, by name."""
+    return {name: cache.stats() for name, cache in sorted(_caches.items())}
+
+
+def clear_query_caches() -> None:
+    """Drop every cached query result."""
+    for cache in _caches.values():
+        cache.clear()
+
+
+def _collect_metrics() -> list:
+    """Query cache statistics as metrics, evaluated at scrape time."""
+    hits = Counter("query_cache_hits_total", "Query cache hits.", ("cache",))
+    misses = Counter("query_cache_misses_total", "Query cache misses.", ("cache",))
+    entries = Gauge("query_cache_entries", "Results currently cached.", ("cache",))
+    coalesced = Counter(
+        "query_cache_coalesced_total", "Query cache misses served by another caller's in-flight computation.", ("cache",)
+    )
+    for name, cache in sorted(_caches.items()):
+        hits.inc(cache.hits, cache=name)
+        misses.inc(cache.misses, cache=name)
+        entries.set(len(cache._entries), cache=name)
+        coalesced.inc(cache.flight.coalesced, cache=name)
+    return [hits, misses, entries, coalesced]
+
+
+registry.add_collector(_collect_metrics)
@@ -0,0 +1,156 @@
+"""Balance reconstruction from transactions anchored on snapshots."""
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Optional
+
+from .balances import BalanceIndex
+
+
+def signed_amount(transaction) -> float:
+    """Return a transaction amount signed from the account's point of view."""
+    return -abs(transaction.amount) if transaction.is_debit else transaction.amount
+
+
+class BalanceReconstructor:
+    """
+    Derive end-of-day and intraday balances per IBAN from transactions.
+
+    Each IBAN is anchored on its latest known snapshot. Transactions valued
+    after the anchor date are accumulated per value date (day ordinal, see
+    app.models.dates), and end-of-day balances are kept as a running sum. Transactions arriving in value-date
+    order cost O(1) each; a late transaction only recomputes the days after
+    it. Transactions of accounts without a snapshot, or valued on or before
+    the anchor date (already reflected in the snapshot), are ignored.
+    """
+
+    def __init__(self, balance_index: Optional[BalanceIndex] = None):
+        self._anchors: dict[str, object] = {}
+        self._days: dict[str, list[int]] = {}
+        self._day_totals: dict[str, list[float]] = {}
+        self._end_of_day: dict[str, list[float]] = {}
+        self._movements: dict[str, dict[int, list[float]]] = {}
+        if balance_index is not None:
+            self.reanchor(balance_index)
+
+    @property
+    def ibans(self) -> list[str]:
+        """Anchored IBANs."""
+        return list(self._anchors)
+
+    def anchor(self, iban: str) -> Optional[object]:
+        """Snapshot one IBAN's balances are anchored on."""
+        return self._anchors.get(iban)
+
+    def reanchor(self, balance_index: BalanceIndex) -> None:
+        """
+        Anchor every IBAN on its latest snapshot.
+
+        Movements already covered by the new anchors, and movements of IBANs
+        that no longer have a snapshot, are dropped.
+        """
+        anchors = {}
+        for iban in balance_index.ibans:
+            records = balance_index.records(iban)
+            if records:
+                anchors[iban] = records[-1]
+        self._anchors = anchors
+
+        for iban in list(self._days):
+            anchor = anchors.get(iban)
+            if anchor is None:
+                self._forget(iban)
+                continue
+            cut = bisect_right(self._days[iban], anchor.date_ordinal)
+            for day in self._days[iban][:cut]:
+                del self._movements[iban][day]
+            del self._days[iban][:cut]
+            del self._day_totals[iban][:cut]
+            del self._end_of_day[iban][:cut]
+            self._recompute(iban, 0)
+
+    def ingest(self, transactions: Iterable) -> int:
+        """
+        Apply new transactions to the reconstructed balances.
+
+        Args:
+            transactions: Transactions with iban, value_date, amount and is_debit
+
+        Returns:
+            Number of transactions applied
+        """
+        applied = 0
+        for transaction in transactions:
+            if self._apply(transaction):
+                applied += 1
+        return applied
+
+    def end_of_day(self, iban: str, date: int) -> Optional[float]:
+        """
+        Reconstructed balance of one IBAN at the end of a date (day ordinal).
+
+        Returns None when the IBAN has no anchor or the date precedes it.
+        """
+        anchor = self._anchors.get(iban)
+        if anchor is None or date < anchor.date_ordinal:
+            return None
+        days = self._days.get(iban, [])
+        position = bisect_right(days, date)
+        return self._end_of_day[iban][position - 1] if position else anchor.value_balance
+
+    def intraday(self, iban: str, date: int) -> list[float]:
+        """Running balance after each movement of one IBAN on a date (day ordinal), in arrival order."""
+        movements = self._movements.get(iban, {}).get(date)
+        if not movements:
+            return []
+        # Movements are only kept after the anchor date, so the opening balance exists
+        running = self.end_of_day(iban, date - 1)
+        balances = []
+        for amount in movements:
+            running += amount
+            balances.append(round(running, 2))
+        return balances
+
+    def applied_count(self, iban: str, date: Optional[int] = None) -> int:
+        """Number of transactions applied to one IBAN, up to a date (day ordinal) if given."""
+        movements = self._movements.get(iban, {})
+        return sum(len(amounts) for day, amounts in movements.items() if date is None or day <= date)
+
+    def _apply(self, transaction) -> bool:
+        """Apply one transaction, returning False when it is ignored."""
+        iban = transaction.iban
+        anchor = self._anchors.get(iban)
+        if anchor is None or transaction.value_ordinal <= anchor.date_ordinal:
+            return False
+
+        day = transaction.value_ordinal
+        amount = signed_amount(transaction)
+        days = self._days.setdefault(iban, [])
+        totals = self._day_totals.setdefault(iban, [])
+        self._end_of_day.setdefault(iban, [])
+        movements = self._movements.setdefault(iban, {})
+
+        position = bisect_left(days, day)
+        if position == len(days) or days[position] != day:
+            days.insert(position, day)
+            totals.insert(position, 0.0)
+            self._end_of_day[iban].insert(position, 0.0)
+            movements[day] = []
+        totals[position] += amount
+        movements[day].append(amount)
+        self._recompute(iban, position)
+        return True
+
+    def _recompute(self, iban: str, start: int) -> None:
+        """Recompute running end-of-day balances from one day onwards."""
+        totals = self._day_totals[iban]
+        end_of_day = self._end_of_day[iban]
+        previous = end_of_day[start - 1] if start else self._anchors[iban].value_balance
+        for position in range(start, len(totals)):
+            previous = round(previous + totals[position], 2)
+            end_of_day[position] = previous
+
+    def _forget(self, iban: str) -> None:
+        """Drop every movement of one IBAN."""
+        for store in (self._days, self._day_totals, self._end_of_day, self._movements):
+            store.pop(iban, None)
+
@@ -0,0 +1,207 @@
+"""Row stores in memory-mapped snapshot files shared by worker processes."""
+
+import hashlib
+import os
+import pickle
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Type
+
+import numpy as np
+from pydantic import BaseModel
+
+from ..models.dimensions import account_dimension
+from .snapshot import SnapshotError, Table, load_snapshot, write_snapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent builders race, the last rename wins
+    fcntl = None
+
+
+# Rows materialized at a time when iterating a shared store
+ITER_BATCH = 10_000
+
+
+# Set while `private_stores` is active
+_private = False
+
+
+def shared_store_dir() -> Optional[str]:
+    """Directory of the shared segments (SHARED_STORE_DIR), or None when disabled."""
+    if _private:
+        return None
+    return os.getenv("SHARED_STORE_DIR") or None
+
+
+@contextmanager
+def private_stores():
+    """
+    Load stores into process memory within the block, even when sharing.
+
+    Used by the worker building the startup data snapshot: its stores are
+    written to the snapshot and then mapped, so sharing them segment by
+    segment first would only build files nobody attaches to.
+    """
+    global _private
+    _private = True
+    try:
+        yield
+    finally:
+        _private = False
+
+
+def model_columns(model: Type[BaseModel]) -> List[str]:
+    """
+    Columns stored for a model: the fields it serializes, computed ones included.
+
+    Dimension IDs are excluded from serialization, so snapshots keep the
+    joined strings (dictionary-encoded) and do not depend on the IDs a
+    process handed out.
+    """
+    fields = [name for name, field in model.model_fields.items() if not field.exclude]
+    return fields + list(model.model_computed_fields)
+
+
+class SharedRows(Sequence):
+    """
+    List-like store of models backed by a snapshot table.
+
+    Models are built on access only: iteration materializes them in
+    batches that are not retained, and `between`/`equal` select rows on
+    the mapped columns before building models for the matches. Rows
+    added with `extend` live in a per-process tail.
+    """
+
+    def __init__(self, table: Table, model: Type[BaseModel]):
+        self.table = table
+        self.model = model
+        self._tail: List[BaseModel] = []
+
+    def __len__(self) -> int:
+        return len(self.table) + len(self._tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("store index out of range")
+        if index >= len(self.table):
+            return self._tail[index - len(self.table)]
+        return self._build(np.array([index]))[0]
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        for start in range(0, len(self.table), ITER_BATCH):
+            yield from self._build(np.arange(start, min(start + ITER_BATCH, len(self.table))))
+        yield from self._tail
+
+    def extend(self, items: Iterable[BaseModel]) -> None:
+        self._tail.extend(items)
+
+    def between(self, field: str, low: Any, high: Any) -> List[BaseModel]:
+        """Models whose field lies in [low, high], in store order."""
+        selected = self._build(self.table.between(field, low, high))
+        return selected + [item for item in self._tail if low <= getattr(item, field) <= high]
+
+    def equal(self, field: str, value: Any) -> List[BaseModel]:
+        """Models whose field equals value, in store order."""
+        selected = self._build(self.table.equal(field, value))
+        return selected + [item for item in self._tail if getattr(item, field) == value]
+
+    def take(self, positions: Sequence[int]) -> List[BaseModel]:
+        """Models at the given positions, in that order."""
+        boundary = len(self.table)
+        built = iter(self._build(np.array([p for p in positions if p < boundary], dtype=np.int64)))
+        return [next(built) if p < boundary else self._tail[p - boundary] for p in positions]
+
+    def column(self, field: str) -> List[Any]:
+        """Values of one field for every row, without building models."""
+        return self.table.values(field) + [getattr(item, field) for item in self._tail]
+
+    def _build(self, indices: np.ndarray) -> List[BaseModel]:
+        return [self.model.model_validate(record) for record in self.table.records(indices)]
+
+
+def is_shared(rows: Any) -> bool:
+    """Whether a store is backed by a shared segment."""
+    return isinstance(rows, SharedRows)
+
+
+def account_ids(rows: Sequence, description: str, company: str) -> Dict[str, int]:
+    """
+    Account ID of each IBAN of a store, as referred to by its last row.
+
+    Shared stores are read from their mapped columns, interning the
+    account strings in this process, without building models.
+
+    Args:
+        rows: Store (list of models or SharedRows)
+        description: Field of the account description
+        company: Field of the holder company name
+    """
+    if not is_shared(rows):
+        return {row.iban: row.account_id for row in rows}
+    latest = {}
+    for key in zip(*(rows.column(field) for field in (description, "iban", company, "currency"))):
+        latest[key[1]] = key
+    return {iban: account_dimension.intern(*key) for iban, key in latest.items()}
+
+
+def fingerprint(records: List[dict], fields: Sequence[str]) -> str:
+    """Content hash of the fields of some records."""
+    payload = pickle.dumps([[record.get(field) for field in fields] for record in records], protocol=5)
+    return hashlib.blake2b(payload, digest_size=12).hexdigest()
+
+
+@contextmanager
+def file_lock(lock_path: Path):
+    """Cross-process lock, so only one worker builds a shared file."""
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path, "a+b") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def share_rows(name: str, records: List[dict], model: Type[BaseModel]) -> SharedRows:
+    """
+    Attach to the shared segment of a store, building it first if needed.
+
+    Segments are snapshot files named after a fingerprint of their
+    content, so workers loading the same data attach to one file (built
+    by the first of them, under a file lock) and a change of data builds
+    a new one; a corrupt segment is rebuilt. Records are validated
+    through `model` when the segment is built.
+
+    Args:
+        name: Store name, used in file names.
+        records: Rows of the store, as dicts.
+        model: Model of a row.
+
+    Returns:
+        The store, backed by the mapped segment.
+    """
+    directory = Path(shared_store_dir())
+    directory.mkdir(parents=True, exist_ok=True)
+    fields = model_columns(model)
+    path = directory / f"{name}-{fingerprint(records, fields)}.seg"
+
+    with file_lock(directory / f"{name}.lock"):
+        try:
+            snapshot = load_snapshot(path, source=path.stem)
+        except SnapshotError:
+            rows = [model.model_validate(record).model_dump() for record in records]
+            write_snapshot(path, {name: (rows, fields)}, source=path.stem)
+            snapshot = load_snapshot(path, source=path.stem)
+            # Older segments of this store (same name, any fingerprint) stay
+            # readable by processes that mapped them
+            for stale in directory.glob(f"{name}-{'?' * (len(path.stem) - len(name) - 1)}.seg"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+    return SharedRows(snapshot.table(name), model)
@@ -0,0 +1,100 @@
+"""Coalescing of concurrent identical computations into one execution."""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """One in-flight execution and its outcome."""
+
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Share one execution between concurrent callers of the same key.
+
+    The first caller of a key (the leader) runs the function; callers
+    arriving while it runs wait for it and get the same result, or the
+    same exception. Once it finishes the key is forgotten, so later calls
+    run again (results are meant to be kept by a cache in front).
+    `do` is for threads, `do_async` for coroutines of one event loop.
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.executions = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Hashable, asyncio.Future] = {}
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run `func(*args, **kwargs)` once for every concurrent caller of `key`."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = func(*args, **kwargs)
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+    async def do_async(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await `func(*args, **kwargs)` once for every concurrent caller of `key`."""
+        future = self._async_calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Shielded: a cancelled follower must not cancel the leader's result
+            return await asyncio.shield(future)
+
+        future = self._async_calls[key] = asyncio.get_running_loop().create_future()
+        self.executions += 1
+        try:
+            value = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # Mark it retrieved so an unawaited failure is not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._async_calls[key]
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._async_calls)
+
+    def stats(self) -> dict:
+        return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": self.in_flight}
@@ -0,0 +1,325 @@
+"""Versioned binary snapshots of the data stores, read through mmap."""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+MAGIC = b"FDSNAP\r\n"
+# Bump on any layout change: older files are rejected and rebuilt
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# Magic, format version, reserved, header length, checksum of everything after the prefix
+_PREFIX = struct.Struct("<8sIIQ16s")
+
+# Rows of one table and the fields to store, by table name
+Tables = Dict[str, Tuple[List[Dict[str, Any]], Sequence[str]]]
+
+
+class SnapshotError(Exception):
+    """A snapshot is missing, corrupt, of another format version or stale."""
+
+
+def _column_kind(values: List[Any]) -> str:
+    """Storage of a column: a numpy dtype, "str" or "json" (both dictionary-encoded)."""
+    if values and all(type(value) is bool for value in values):
+        return "bool"
+    if values and all(type(value) is int for value in values):
+        return "int64"
+    if values and all(type(value) in (int, float) for value in values):
+        return "float64"
+    if all(type(value) is str for value in values):
+        return "str"
+    return "json"
+
+
+def _encode_column(values: List[Any]) -> Tuple[np.ndarray, Optional[Tuple[str, np.ndarray, bytes]]]:
+    """
+    Encode one column.
+
+    Returns:
+        The fixed-width array, and for dictionary-encoded columns the
+        encoding, the offset table (distinct values + 1 entries) and the
+        UTF-8 data of the distinct values
+    """
+    kind = _column_kind(values)
+    if kind not in ("str", "json"):
+        return np.asarray(values, dtype=kind), None
+
+    codes: Dict[str, int] = {}
+    encoded = np.empty(len(values), dtype=np.int32)
+    for position, value in enumerate(values):
+        key = value if kind == "str" else json.dumps(value, sort_keys=True, ensure_ascii=False)
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(codes)
+        encoded[position] = code
+    chunks = [key.encode("utf-8") for key in codes]
+    offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+    np.cumsum([len(chunk) for chunk in chunks], out=offsets[1:])
+    return encoded, (kind, offsets, b"".join(chunks))
+
+
+def write_snapshot(
+    path: Union[str, Path],
+    tables: Tables,
+    source: str = "",
+    meta: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Write tables to a snapshot file, atomically.
+
+    Layout: a fixed prefix (magic, format version, header length and a
+    BLAKE2b checksum of the rest of the file), a JSON header describing
+    every column, then 64-byte aligned blocks: one fixed-width array per
+    column, plus an offset table and the UTF-8 data of the string
+    dictionary of each dictionary-encoded column. Numbers and booleans
+    are stored as is; strings and other values (JSON-encoded) as int32
+    codes into their column's dictionary.
+
+    Args:
+        path: Snapshot file
+        tables: Rows and stored fields of each table, by name
+        source: Fingerprint of the data the snapshot was built from
+        meta: Extra JSON-serializable values stored in the header
+    """
+    blocks: List[Tuple[int, bytes]] = []
+    size = 0
+
+    def place(data: bytes) -> int:
+        nonlocal size
+        size += -size % ALIGNMENT
+        offset = size
+        blocks.append((offset, data))
+        size += len(data)
+        return offset
+
+    described = {}
+    for name, (rows, fields) in tables.items():
+        columns = []
+        for field in fields:
+            array, dictionary = _encode_column([row.get(field) for row in rows])
+            column = {
+                "name": field,
+                "dtype": array.dtype.str,
+                "offset": place(array.tobytes()),
+                "count": len(array),
+                "encoding": "plain",
+            }
+            if dictionary is not None:
+                encoding, offsets, data = dictionary
+                column["encoding"] = encoding
+                column["dictionary"] = {
+                    "size": len(offsets) - 1,
+                    "offsets": place(offsets.tobytes()),
+                    "data": place(data),
+                    "length": len(data),
+                }
+            columns.append(column)
+        described[name] = {"rows": len(rows), "columns": columns}
+
+    header = json.dumps(
+        {"source": source, "meta": meta or {}, "tables": described}, ensure_ascii=False
+    ).encode("utf-8")
+    data_start = _PREFIX.size + len(header)
+    padding = b"\0" * (-data_start % ALIGNMENT)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-", suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as output:
+            checksum = hashlib.blake2b(digest_size=16)
+            output.write(b"\0" * _PREFIX.size)
+            for chunk in (header, padding):
+                output.write(chunk)
+                checksum.update(chunk)
+            position = 0
+            for offset, data in blocks:
+                gap = b"\0" * (offset - position)
+                for chunk in (gap, data):
+                    output.write(chunk)
+                    checksum.update(chunk)
+                position = offset + len(data)
+            output.seek(0)
+            output.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, 0, len(header), checksum.digest()))
+            output.flush()
+            os.fsync(output.fileno())
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+
+
+class Dictionary(Sequence):
+    """Distinct values of a dictionary-encoded column, decoded on first use."""
+
+    def __init__(self, offsets: np.ndarray, data: memoryview, encoding: str):
+        self._offsets = offsets
+        self._data = data
+        self._encoding = encoding
+        self._values: Optional[List[Any]] = None
+
+    @property
+    def values(self) -> List[Any]:
+        if self._values is None:
+            data = bytes(self._data)
+            bounds = self._offsets.tolist()
+            values = [data[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+            if self._encoding == "json":
+                values = [json.loads(value) for value in values]
+            self._values = values
+        return self._values
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, code):
+        return self.values[code]
+
+
+class Table:
+    """Columns of one table; arrays point into the snapshot mapping."""
+
+    def __init__(self, rows: int, columns: Dict[str, np.ndarray], dictionaries: Dict[str, Dictionary]):
+        self.rows = rows
+        self.fields = list(columns)
+        self.columns = columns
+        self.dictionaries = dictionaries
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def values(self, field: str, indices: Optional[np.ndarray] = None) -> List[Any]:
+        """Decoded values of a column, at the given positions or all of them."""
+        column = self.columns[field]
+        values = (column if indices is None else column[indices]).tolist()
+        dictionary = self.dictionaries.get(field)
+        if dictionary is not None:
+            table = dictionary.values
+            values = [table[code] for code in values]
+        return values
+
+    def records(self, indices: np.ndarray) -> List[Dict[str, Any]]:
+        """Rows at the given positions, as dicts."""
+        columns = [self.values(field, indices) for field in self.fields]
+        return [dict(zip(self.fields, values)) for values in zip(*columns)]
+
+    def between(self, field: str, low: Any, high: Any) -> np.ndarray:
+        """Positions of rows whose value lies in [low, high], in row order."""
+        column = self.columns[field]
+        dictionary = self.dictionaries.get(field)
+        if dictionary is None:
+            return np.flatnonzero((column >= low) & (column <= high))
+        codes = [code for code, value in enumerate(dictionary) if value is not None and low <= value <= high]
+        return np.flatnonzero(np.isin(column, codes))
+
+    def equal(self, field: str, value: Any) -> np.ndarray:
+        """Positions of rows with the given value, in row order."""
+        dictionary = self.dictionaries.get(field)
+        if dictionary is None:
+            return np.flatnonzero(self.columns[field] == value)
+        codes = [code for code, item in enumerate(dictionary) if item == value]
+        return np.flatnonzero(np.isin(self.columns[field], codes))
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot file.
+
+    Opening maps the file and checks its format version and checksum;
+    no column is copied or decoded until it is read.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as handle:
+                self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as error:
+            raise SnapshotError(f"cannot map {self.path}: {error}") from error
+        if len(self._mmap) < _PREFIX.size:
+            raise SnapshotError(f"{self.path} is truncated")
+        magic, version, _, header_length, checksum = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is not a data snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"{self.path} has format version {version}, expected {FORMAT_VERSION}")
+        body = memoryview(self._mmap)[_PREFIX.size:]
+        try:
+            if hashlib.blake2b(body, digest_size=16).digest() != checksum:
+                raise SnapshotError(f"{self.path} is corrupt (checksum mismatch)")
+        finally:
+            body.release()
+
+        header = json.loads(self._mmap[_PREFIX.size:_PREFIX.size + header_length].decode("utf-8"))
+        data_start = _PREFIX.size + header_length
+        data_start += -data_start % ALIGNMENT
+        self.source: str = header["source"]
+        self.meta: Dict[str, Any] = header["meta"]
+        self.tables: Dict[str, Table] = {
+            name: self._table(description, data_start) for name, description in header["tables"].items()
+        }
+
+    def _table(self, description: dict, data_start: int) -> Table:
+        columns = {}
+        dictionaries = {}
+        for column in description["columns"]:
+            name = column["name"]
+            columns[name] = np.frombuffer(
+                self._mmap, dtype=np.dtype(column["dtype"]), count=column["count"],
+                offset=data_start + column["offset"],
+            )
+            dictionary = column.get("dictionary")
+            if dictionary is not None:
+                offsets = np.frombuffer(
+                    self._mmap, dtype=np.int64, count=dictionary["size"] + 1,
+                    offset=data_start + dictionary["offsets"],
+                )
+                start = data_start + dictionary["data"]
+                data = memoryview(self._mmap)[start:start + dictionary["length"]]
+                dictionaries[name] = Dictionary(offsets, data, column["encoding"])
+        return Table(description["rows"], columns, dictionaries)
+
+    def table(self, name: str) -> Table:
+        return self.tables[name]
+
+
+def load_snapshot(path: Union[str, Path], source: Optional[str] = None) -> Snapshot:
+    """
+    Open a snapshot, checking that it was built from the expected data.
+
+    Args:
+        path: Snapshot file
+        source: Fingerprint of the current source data (not checked if None)
+
+    Returns:
+        The mapped snapshot
+
+    Raises:
+        SnapshotError: The file is missing, corrupt, of another format
+            version, or built from other data; it should be rebuilt
+    """
+    if not os.path.exists(path):
+        raise SnapshotError(f"{path} does not exist")
+    snapshot = Snapshot(path)
+    if source is not None and snapshot.source != source:
+        raise SnapshotError(f"{path} is stale (built from other data)")
+    return snapshot
+
+
+def source_fingerprint(paths: Iterable[Union[str, Path]], extra: str = "") -> str:
+    """Content hash of source files (and of any extra text, e.g. parameters)."""
+    digest = hashlib.blake2b(extra.encode("utf-8"), digest_size=12)
+    for path in sorted(Path(path) for path in paths):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
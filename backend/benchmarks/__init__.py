@@ -0,0 +1 @@
+"""Performance benchmarks for API routes and services."""
@@ -0,0 +1,187 @@
+"""Benchmark cases: every API route and the main service functions."""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from app.models.transaction import EnrichedTransaction, TransactionResponse
+from app.routes import accounts, analytics
+from app.routes.accounts import query_account_balances
+from app.services.aggregates import TransactionAggregates
+from app.services.analytics import (
+    calculate_balance_summary,
+    calculate_grouped_balance_summary,
+    calculate_transaction_trends,
+    detect_low_balance_alerts,
+)
+from app.services.balances import BalanceIndex
+from app.services.downsampling import lttb
+from app.services.enrichment import enrich_transaction, filter_transactions
+
+
+@dataclass
+class Context:
+    """Dataset loaded in the stores, and values derived from it for queries."""
+
+    client: Any
+    start: str
+    end: str
+    accounts: List[Dict[str, Any]]
+    transactions: List[Dict[str, Any]]
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def month_start(self) -> str:
+        """First day of the last 30 days of the dataset."""
+        end = datetime.strptime(self.end, "%Y-%m-%d")
+        return (end - timedelta(days=29)).strftime("%Y-%m-%d")
+
+    @property
+    def middle(self) -> str:
+        """Middle day of the dataset."""
+        start = datetime.strptime(self.start, "%Y-%m-%d")
+        end = datetime.strptime(self.end, "%Y-%m-%d")
+        return (start + (end - start) / 2).strftime("%Y-%m-%d")
+
+
+@dataclass
+class Case:
+    """One benchmarked operation."""
+
+    name: str
+    kind: str
+    run: Callable[[Context], Any]
+
+
+def _get(url: Callable[[Context], str]) -> Callable[[Context], Any]:
+    """Case body issuing a GET request and checking its status."""
+    def run(ctx: Context):
+        response = ctx.client.get(url(ctx))
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {response.url} returned {response.status_code}: {response.text[:200]}")
+        return response
+    return run
+
+
+def _post(url: str, payload: dict) -> Callable[[Context], Any]:
+    """Case body issuing a POST request and checking its status."""
+    def run(ctx: Context):
+        response = ctx.client.post(url, json=payload)
+        if response.status_code != 200:
+            raise RuntimeError(f"POST {url} returned {response.status_code}: {response.text[:200]}")
+        return response
+    return run
+
+
+API = "/api/v1"
+
+# The alert stream (/alerts/stream) never completes and is not benchmarked
+ENDPOINT_CASES = [
+    Case("GET /bank-account-balances?date", "endpoint",
+         _get(lambda c: f"{API}/bank-account-balances?date={c.middle}")),
+    Case("GET /bank-account-balances?date&as_of", "endpoint",
+         _get(lambda c: f"{API}/bank-account-balances?date={c.middle}&as_of=true")),
+    Case("GET /bank-account-balances?range(30d)", "endpoint",
+         _get(lambda c: f"{API}/bank-account-balances?start_date={c.month_start}&end_date={c.end}")),
+    Case("GET /bank-account-balances/as-of", "endpoint",
+         _get(lambda c: f"{API}/bank-account-balances/as-of?dates={c.start}&dates={c.middle}&dates={c.end}")),
+    Case("GET /bank-account-balances/series", "endpoint",
+         _get(lambda c: f"{API}/bank-account-balances/series?start_date={c.start}&end_date={c.end}&points=300")),
+    Case("GET /bank-account-balances/reconstructed", "endpoint",
+         _get(lambda c: f"{API}/bank-account-balances/reconstructed?date={c.end}")),
+    Case("GET /bank-transactions(30d)", "endpoint",
+         _get(lambda c: f"{API}/bank-transactions?from_date={c.month_start}&to_date={c.end}")),
+    Case("GET /bank-transactions(all)", "endpoint",
+         _get(lambda c: f"{API}/bank-transactions?from_date={c.start}&to_date={c.end}")),
+    Case("GET /balance-summary", "endpoint",
+         _get(lambda c: f"{API}/balance-summary?date={c.middle}")),
+    Case("GET /balance-summary?currency", "endpoint",
+         _get(lambda c: f"{API}/balance-summary?start_date={c.month_start}&end_date={c.end}&currency=EUR")),
+    Case("GET /balance-summary/grouped", "endpoint",
+         _get(lambda c: f"{API}/balance-summary/grouped?start_date={c.month_start}&end_date={c.end}")),
+    Case("GET /alerts", "endpoint",
+         _get(lambda c: f"{API}/alerts")),
+    Case("GET /alerts?threshold", "endpoint",
+         _get(lambda c: f"{API}/alerts?threshold=0.5&date={c.middle}")),
+    Case("GET /alerts/history", "endpoint",
+         _get(lambda c: f"{API}/alerts/history?start_date={c.start}&end_date={c.end}")),
+    Case("GET /transactions/enriched(30d)", "endpoint",
+         _get(lambda c: f"{API}/transactions/enriched?from_date={c.month_start}&to_date={c.end}")),
+    Case("GET /transactions/enriched(all,filtered)", "endpoint",
+         _get(lambda c: f"{API}/transactions/enriched?from_date={c.start}&to_date={c.end}&is_debit=true&min_amount=1000")),
+    Case("GET /transactions/trends", "endpoint",
+         _get(lambda c: f"{API}/transactions/trends?from_date={c.start}&to_date={c.end}")),
+    Case("GET /transactions/trends/series(month)", "endpoint",
+         _get(lambda c: f"{API}/transactions/trends/series?from_date={c.start}&to_date={c.end}&granularity=month")),
+    Case("GET /transactions/trends/series(day,iban)", "endpoint",
+         _get(lambda c: f"{API}/transactions/trends/series?from_date={c.month_start}&to_date={c.end}&group_by=iban")),
+    Case("GET /transactions/categories/breakdown", "endpoint",
+         _get(lambda c: f"{API}/transactions/categories/breakdown?from_date={c.start}&to_date={c.end}")),
+    Case("GET /categories", "endpoint",
+         _get(lambda c: f"{API}/categories")),
+    Case("POST /chat", "endpoint",
+         _post(f"{API}/chat", {"message": "Quel est mon solde total ?"})),
+    Case("GET /chat/sessions", "endpoint",
+         _get(lambda c: f"{API}/chat/sessions")),
+    Case("GET /health", "endpoint",
+         _get(lambda c: "/health")),
+    Case("GET /metrics", "endpoint",
+         _get(lambda c: "/metrics")),
+]
+
+
+def _balances(ctx: Context):
+    """Account balances of the last 30 days (computed once per dataset)."""
+    if "balances" not in ctx.extras:
+        ctx.extras["balances"] = query_account_balances(start_date=ctx.month_start, end_date=ctx.end)
+    return ctx.extras["balances"]
+
+
+def _enriched(ctx: Context) -> List[EnrichedTransaction]:
+    """Enriched transaction models of the analytics store."""
+    return analytics._mock_enriched_transactions
+
+
+def _responses(ctx: Context) -> List[TransactionResponse]:
+    """Raw transactions as response models (computed once per dataset)."""
+    if "responses" not in ctx.extras:
+        ctx.extras["responses"] = [
+            TransactionResponse(
+                account=t["account_description"],
+                iban=t["iban"],
+                company=t["holder_company_name"],
+                operation_date=t["operation_date"],
+                value_date=t["value_date"],
+                amount=t["amount"],
+                currency=t["currency"],
+                is_debit=t["is_debit"],
+            )
+            for t in ctx.transactions
+        ]
+    return ctx.extras["responses"]
+
+
+SERVICE_CASES = [
+    Case("calculate_balance_summary", "service",
+         lambda c: calculate_balance_summary(_balances(c), c.end)),
+    Case("calculate_balance_summary(EUR)", "service",
+         lambda c: calculate_balance_summary(_balances(c), c.end, "EUR")),
+    Case("calculate_grouped_balance_summary", "service",
+         lambda c: calculate_grouped_balance_summary(_balances(c), None, c.end)),
+    Case("detect_low_balance_alerts", "service",
+         lambda c: detect_low_balance_alerts(_balances(c), 0.5)),
+    Case("calculate_transaction_trends", "service",
+         lambda c: calculate_transaction_trends(_enriched(c))),
+    Case("filter_transactions", "service",
+         lambda c: filter_transactions(_enriched(c), category_ids=["rent", "supplies"], min_amount=100.0)),
+    Case("enrich_transaction(all)", "service",
+         lambda c: [enrich_transaction(t) for t in _responses(c)]),
+    Case("TransactionAggregates.from_transactions", "service",
+         lambda c: TransactionAggregates.from_transactions(_enriched(c))),
+    Case("BalanceIndex(build)", "service",
+         lambda c: BalanceIndex(accounts._mock_accounts)),
+    Case("lttb(10k->300)", "service",
+         lambda c: lttb([(i, (i * 7919) % 1000) for i in range(10_000)], 300)),
+]
+
+ALL_CASES = ENDPOINT_CASES + SERVICE_CASES
@@ -0,0 +1,199 @@
+"""Load test of POST /chat against the OpenAI-compatible stub.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.chat_load --sessions 50 --turns 3 --concurrency 50
+    python -m benchmarks.chat_load --first-token-ms 800 --rate-limit-rate 0.1 --output chat.json
+    python -m benchmarks.chat_load --target http://127.0.0.1:8000 --stub-url http://127.0.0.1:8001
+
+By default the backend runs in-process (through `httpx.ASGITransport`)
+and a stub server is started in a background thread, with MODEL_URL
+pointing at it, so the chatbot goes through the real Azure OpenAI client
+path. With --target, the backend must already be running with MODEL_URL
+set to the stub (--stub-url).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.llm_stub import StubConfig, config_from_args, serve_stub
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of samples (q in 0-100)."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(1, min(len(ordered), math.ceil(q / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def summarize(latencies_ms: List[float]) -> Dict[str, float]:
+    """Latency distribution, in milliseconds."""
+    if not latencies_ms:
+        return {}
+    return {
+        "min": round(min(latencies_ms), 1),
+        "p50": round(percentile(latencies_ms, 50), 1),
+        "p90": round(percentile(latencies_ms, 90), 1),
+        "p99": round(percentile(latencies_ms, 99), 1),
+        "max": round(max(latencies_ms), 1),
+        "mean": round(statistics.fmean(latencies_ms), 1),
+    }
+
+
+async def run_session(client: httpx.AsyncClient, index: int, turns: int, semaphore: asyncio.Semaphore) -> List[dict]:
+    """One chat session: `turns` messages sent one after the other."""
+    results = []
+    session_id: Optional[str] = None
+    for turn in range(turns):
+        payload = {"message": f"Quel est mon solde total ? (session {index}, tour {turn})"}
+        if session_id:
+            payload["session_id"] = session_id
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.post("/api/v1/chat", json=payload)
+                status = response.status_code
+            except httpx.HTTPError as exc:
+                response, status = None, type(exc).__name__
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+        source = None
+        if response is not None and response.status_code == 200:
+            body = response.json()
+            session_id = body["session_id"]
+            source = body["message"]["metadata"].get("source")
+        results.append({"session": index, "turn": turn, "status": status, "source": source, "latency_ms": elapsed_ms})
+        if response is None or response.status_code != 200:
+            break
+    return results
+
+
+async def run_load(client: httpx.AsyncClient, sessions: int, turns: int, concurrency: int) -> Dict[str, Any]:
+    """Drive concurrent chat sessions and aggregate their results."""
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    per_session = await asyncio.gather(*(run_session(client, index, turns, semaphore) for index in range(sessions)))
+    wall = time.perf_counter() - started
+
+    results = [result for session in per_session for result in session]
+    ok = [result["latency_ms"] for result in results if result["status"] == 200]
+    return {
+        "requests": len(results),
+        "ok": len(ok),
+        "errors": len(results) - len(ok),
+        "statuses": dict(Counter(str(result["status"]) for result in results)),
+        "sources": dict(Counter(result["source"] for result in results if result["source"])),
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(results) / wall, 2) if wall else None,
+        "latency_ms": summarize(ok),
+    }
+
+
+@contextlib.contextmanager
+def in_process_backend(model_url: str):
+    """The backend app wired to the given model URL, restored afterwards."""
+    from app.main import app
+    from app.services import chatbot
+
+    names = ("MODEL_URL", "MODEL_API_KEY", "MODEL_API_VERSION")
+    saved = {name: os.environ.get(name) for name in names}
+    os.environ["MODEL_URL"] = model_url
+    os.environ["MODEL_API_KEY"] = "stub"
+    os.environ.setdefault("MODEL_API_VERSION", "2024-12-01-preview")
+    chatbot._azure_client = None
+    try:
+        yield app
+    finally:
+        chatbot._azure_client = None
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+async def _drive(args: argparse.Namespace, model_url: str) -> Dict[str, Any]:
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    if args.target:
+        async with httpx.AsyncClient(base_url=args.target, timeout=timeout, limits=limits) as client:
+            return await run_load(client, args.sessions, args.turns, args.concurrency)
+    with in_process_backend(model_url) as app:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend", timeout=timeout) as client:
+            return await run_load(client, args.sessions, args.turns, args.concurrency)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test POST /chat against the LLM stub.")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent chat sessions")
+    parser.add_argument("--turns", type=int, default=3, help="Messages per session")
+    parser.add_argument("--concurrency", type=int, default=20, help="Maximum requests in flight")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Client timeout per request, in seconds")
+    parser.add_argument("--target", help="URL of a running backend (default: in-process)")
+    parser.add_argument("--stub-url", help="URL of a running stub (default: start one)")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file")
+    stub = parser.add_argument_group("stub server (when --stub-url is not given)")
+    defaults = StubConfig()
+    stub.add_argument("--first-token-ms", type=float, default=defaults.first_token_ms)
+    stub.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    stub.add_argument("--completion-tokens", type=int, default=defaults.completion_tokens)
+    stub.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    stub.add_argument("--rate-limit-rate", type=float, default=defaults.rate_limit_rate)
+    stub.add_argument("--retry-after", type=float, default=defaults.retry_after_seconds)
+    stub.add_argument("--seed", type=int, default=defaults.seed)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    config = config_from_args(args)
+    with contextlib.ExitStack() as stack:
+        if args.stub_url:
+            model_url, stub = args.stub_url, None
+        else:
+            stub = stack.enter_context(serve_stub(config))
+            model_url = stub.base_url
+        report = asyncio.run(_drive(args, model_url))
+
+    report = {
+        "meta": {
+            "sessions": args.sessions,
+            "turns": args.turns,
+            "concurrency": args.concurrency,
+            "target": args.target or "in-process",
+            "model_url": model_url,
+            "stub": None if stub is None else {**vars(config), "counts": stub.stats.snapshot()},
+        },
+        **report,
+    }
+    latency = report["latency_ms"]
+    print(
+        f"{report['ok']}/{report['requests']} ok, {report['throughput_rps']} req/s, "
+        f"p50 {latency.get('p50')} ms, p99 {latency.get('p99')} ms, sources {report['sources']}",
+        file=sys.stderr,
+    )
+    document = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(document + "\n", encoding="utf-8")
+    else:
+        print(document)
+    return report
+
+
+if __name__ == "__main__":
+    main()
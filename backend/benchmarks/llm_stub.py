@@ -0,0 +1,262 @@
+"""Local OpenAI-compatible chat-completions server for load tests.
+
+Implements the Azure deployment route used by `AzureOpenAI`
+(`/openai/deployments/{deployment}/chat/completions`) and the plain
+OpenAI route (`/v1/chat/completions`), non-streaming and streaming, with
+configurable latency, throughput and failures. Point the backend at it:
+
+    python -m benchmarks.llm_stub --port 8001 --first-token-ms 400 --tokens-per-second 60 --rate-limit-rate 0.05
+    MODEL_URL=http://127.0.0.1:8001 MODEL_API_KEY=stub uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+# Text the stub answers with, cut to the requested number of tokens
+ANSWER = (
+    "D'après vos données, votre solde total reste stable sur la période. "
+    "Les principales dépenses concernent les loyers, les salaires et les fournitures. "
+    "Je vous recommande de surveiller les comptes proches de leur seuil d'alerte "
+    "et de planifier les paiements importants en début de mois. "
+)
+
+
+@dataclass
+class StubConfig:
+    """Latency, throughput and failure settings of the stub."""
+
+    first_token_ms: float = 300.0
+    tokens_per_second: float = 50.0
+    completion_tokens: int = 80
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+    seed: int = 0
+
+
+class StubStats:
+    """Request counters of a stub server."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {"requests": 0, "ok": 0, "streamed": 0, "errors": 0, "rate_limited": 0}
+
+    def inc(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+def count_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Rough prompt size: about 4 characters per token, like English text."""
+    return sum(len(str(message.get("content", ""))) for message in messages) // 4 + 3 * len(messages)
+
+
+def answer_tokens(count: int) -> List[str]:
+    """Completion split in `count` word tokens."""
+    words = ANSWER.split(" ")
+    return [words[index % len(words)] + " " for index in range(count)]
+
+
+def _usage(prompt_tokens: int, completion_tokens: int) -> Dict[str, int]:
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _completion(model: str, text: str, prompt_tokens: int, completion_tokens: int) -> Dict[str, Any]:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": text},
+            "finish_reason": "stop",
+        }],
+        "usage": _usage(prompt_tokens, completion_tokens),
+    }
+
+
+def _chunk(completion_id: str, model: str, delta: Dict[str, Any], finish_reason=None, usage=None) -> str:
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    if usage:
+        payload["usage"] = usage
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _error(status: int, code: str, message: str, headers: Dict[str, str] = None) -> JSONResponse:
+    return JSONResponse({"error": {"code": code, "message": message}}, status_code=status, headers=headers)
+
+
+def create_stub_app(config: StubConfig) -> FastAPI:
+    """Build the stub server application.
+
+    Args:
+        config: Latency, throughput and failure settings.
+
+    Returns:
+        FastAPI application; its counters are in `app.state.stats`.
+    """
+    app = FastAPI(title="OpenAI-compatible stub")
+    stats = StubStats()
+    rng = random.Random(config.seed)
+    app.state.config = config
+    app.state.stats = stats
+
+    async def complete(request: Request, model: str):
+        stats.inc("requests")
+        body = await request.json()
+        model = body.get("model") or model
+        draw = rng.random()
+        if draw < config.rate_limit_rate:
+            stats.inc("rate_limited")
+            return _error(
+                429, "429", "Rate limit is exceeded. Try again later.",
+                headers={"Retry-After": f"{config.retry_after_seconds:g}"},
+            )
+        if draw < config.rate_limit_rate + config.error_rate:
+            stats.inc("errors")
+            return _error(500, "internal_error", "The server had an error while processing your request.")
+
+        prompt_tokens = count_tokens(body.get("messages", []))
+        limit = body.get("max_tokens") or body.get("max_completion_tokens") or config.completion_tokens
+        tokens = answer_tokens(min(config.completion_tokens, int(limit)))
+        token_delay = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+        if not body.get("stream"):
+            await asyncio.sleep(config.first_token_ms / 1000 + token_delay * max(len(tokens) - 1, 0))
+            stats.inc("ok")
+            return JSONResponse(_completion(model, "".join(tokens).strip(), prompt_tokens, len(tokens)))
+
+        async def events() -> AsyncIterator[str]:
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            await asyncio.sleep(config.first_token_ms / 1000)
+            yield _chunk(completion_id, model, {"role": "assistant", "content": ""})
+            for position, token in enumerate(tokens):
+                if position:
+                    await asyncio.sleep(token_delay)
+                yield _chunk(completion_id, model, {"content": token})
+            yield _chunk(completion_id, model, {}, finish_reason="stop")
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield _chunk(completion_id, model, {}, usage=_usage(prompt_tokens, len(tokens)))
+            yield "data: [DONE]\n\n"
+            stats.inc("streamed")
+            stats.inc("ok")
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/openai/deployments/{deployment}/chat/completions")
+    async def azure_chat_completions(deployment: str, request: Request):
+        return await complete(request, deployment)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        return await complete(request, "stub")
+
+    @app.get("/stats")
+    async def get_stats():
+        return {"config": asdict(config), "counts": stats.snapshot()}
+
+    return app
+
+
+def free_port() -> int:
+    """A free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@dataclass
+class RunningStub:
+    """Stub server started by `serve_stub`."""
+
+    base_url: str
+    stats: StubStats
+
+
+@contextlib.contextmanager
+def serve_stub(config: StubConfig, port: int = 0) -> Iterator[RunningStub]:
+    """Run a stub server in a background thread.
+
+    Yields:
+        The running stub; its base URL is the MODEL_URL to use.
+    """
+    port = port or free_port()
+    app = create_stub_app(config)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError(f"LLM stub failed to start on port {port}")
+        time.sleep(0.01)
+    try:
+        yield RunningStub(base_url=f"http://127.0.0.1:{port}", stats=app.state.stats)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible chat-completions stub server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--first-token-ms", type=float, default=300.0, help="Delay before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Generation speed after the first token")
+    parser.add_argument("--completion-tokens", type=int, default=80, help="Tokens per answer")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests failing with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After of 429 responses, in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the failure draws")
+    return parser.parse_args(argv)
+
+
+def config_from_args(args: argparse.Namespace) -> StubConfig:
+    """Stub settings from parsed command-line options."""
+    return StubConfig(
+        first_token_ms=args.first_token_ms,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    uvicorn.run(create_stub_app(config_from_args(args)), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
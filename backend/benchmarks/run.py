@@ -0,0 +1,281 @@
+"""Run the benchmark suite at scaled data sizes.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.run
+    python -m benchmarks.run --transactions 1000 100000 1000000 --accounts 100 10000 --years 5 --generator synthetic
+    python -m benchmarks.run --only bank-transactions --output results.json
+    python -m benchmarks.run --save-baseline
+
+Each case is timed "cold" (the data version is bumped before every call,
+so HTTP and query caches are empty) and, for endpoints, "warm" (cache
+hits). Peak Python memory of one cold call is measured with tracemalloc.
+Results are written as JSON and compared with the baseline recorded on
+this machine (--save-baseline; not committed), case by case at the same
+scale, years and generator; the exit status is 1 when a case regressed
+beyond the tolerance.
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import accounts, analytics, transactions
+from app.services.data_version import bump_data_version
+from benchmarks.cases import ALL_CASES, Case, Context
+from benchmarks.datasets import (
+    START_DATE,
+    end_date,
+    enrich_all,
+    scaled_accounts,
+    scaled_transactions,
+    synthetic_dataset,
+)
+
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def measure(func: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None) -> dict:
+    """Latency statistics of repeated calls, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "min": round(samples[0], 3),
+        "median": round(statistics.median(samples), 3),
+        "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "mean": round(statistics.fmean(samples), 3),
+    }
+
+
+def peak_memory_kb(func: Callable[[], object], setup: Optional[Callable[[], object]] = None) -> float:
+    """Peak Python memory allocated during one call, in KiB."""
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def load_dataset(
+    num_transactions: int,
+    num_accounts: int,
+    years: int,
+    client: TestClient,
+    generator: str = "mock",
+) -> tuple[Context, list]:
+    """Generate a dataset, load it in the stores and time the loading steps."""
+    timings = []
+
+    def timed(name: str, func: Callable[[], object]):
+        start = time.perf_counter()
+        # Loaders log progress on stdout, which may carry the JSON report
+        with contextlib.redirect_stdout(sys.stderr):
+            result = func()
+        timings.append({"case": name, "kind": "load", "latency_ms": {"median": round((time.perf_counter() - start) * 1000, 3)}})
+        return result
+
+    if generator == "synthetic":
+        account_rows, enriched_rows = timed(
+            "generate synthetic dataset", lambda: synthetic_dataset(num_transactions, num_accounts, years)
+        )
+        transaction_rows = [
+            {key: value for key, value in row.items() if key not in ("category", "merchant", "tags")}
+            for row in enriched_rows
+        ]
+    else:
+        account_rows = timed("generate accounts", lambda: scaled_accounts(num_accounts, years))
+        transaction_rows = timed("generate transactions", lambda: scaled_transactions(num_transactions, years, account_rows))
+        enriched_rows = timed("enrich transactions", lambda: enrich_all(transaction_rows))
+
+    timed("set_mock_transactions", lambda: transactions.set_mock_transactions(transaction_rows))
+    timed("set_mock_enriched_transactions", lambda: analytics.set_mock_enriched_transactions(enriched_rows))
+    timed("set_mock_accounts", lambda: accounts.set_mock_accounts(account_rows))
+    timed("ingest_transactions", lambda: accounts.ingest_transactions(transaction_rows))
+
+    context = Context(
+        client=client,
+        start=START_DATE,
+        end=end_date(years),
+        accounts=account_rows,
+        transactions=transaction_rows,
+    )
+    return context, timings
+
+
+def run_case(case: Case, context: Context, repeat: int, memory: bool) -> dict:
+    """Benchmark one case against the loaded dataset."""
+    call = lambda: case.run(context)  # noqa: E731
+    result = {"case": case.name, "kind": case.kind, "latency_ms": measure(call, repeat, setup=bump_data_version)}
+    if case.kind == "endpoint":
+        call()
+        result["warm_latency_ms"] = measure(call, repeat)
+    if memory:
+        result["peak_memory_kb"] = peak_memory_kb(call, setup=bump_data_version)
+    return result
+
+
+def result_key(result: dict) -> str:
+    """Identity of a result across runs (same case, scale and dataset)."""
+    return (
+        f"{result['case']}|tx={result['transactions']}|acc={result['accounts']}"
+        f"|years={result.get('years')}|gen={result.get('generator')}"
+    )
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float, min_delta_ms: float) -> list[dict]:
+    """
+    Cases whose cold median latency regressed against the baseline.
+
+    A case regresses when it is slower than the baseline by more than
+    `tolerance` (relative) and `min_delta_ms` (absolute, to ignore noise
+    on very fast cases).
+    """
+    reference = {result_key(result): result for result in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        previous = reference.get(result_key(result))
+        if previous is None:
+            continue
+        before = previous["latency_ms"]["median"]
+        after = result["latency_ms"]["median"]
+        if after > before * (1 + tolerance) and after - before > min_delta_ms:
+            regressions.append({
+                "case": result["case"],
+                "transactions": result["transactions"],
+                "accounts": result["accounts"],
+                "years": result.get("years"),
+                "generator": result.get("generator"),
+                "baseline_ms": before,
+                "current_ms": after,
+                "ratio": round(after / before, 2) if before else None,
+            })
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark API routes and services at scaled data sizes.")
+    parser.add_argument("--transactions", type=int, nargs="+", default=[1_000, 10_000],
+                        help="Transaction counts to benchmark (e.g. 1000 10000 100000 1000000)")
+    parser.add_argument("--accounts", type=int, nargs="+", default=[100],
+                        help="Account counts to benchmark (e.g. 100 1000 10000)")
+    parser.add_argument("--years", type=int, default=3, help="Length of the generated history")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per case")
+    parser.add_argument("--generator", choices=("mock", "synthetic"), default="mock",
+                        help="Dataset generator: mock fixtures, or the vectorized one (fast at large sizes)")
+    parser.add_argument("--only", action="append", default=[], help="Only run cases whose name contains this text")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc peak memory measurements")
+    parser.add_argument("--output", type=Path, help="Write JSON results to this file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed relative slowdown (0.3 = 30%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore slowdowns smaller than this")
+    return parser.parse_args(argv)
+
+
+@contextlib.contextmanager
+def offline_model():
+    """Keep the chatbot on its offline fallback path, restoring MODEL_API_KEY afterwards."""
+    saved = os.environ.get("MODEL_API_KEY")
+    os.environ["MODEL_API_KEY"] = "later"
+    try:
+        yield
+    finally:
+        if saved is None:
+            os.environ.pop("MODEL_API_KEY", None)
+        else:
+            os.environ["MODEL_API_KEY"] = saved
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    with offline_model():
+        return run(args)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run the selected cases, write the report and compare it with the baseline."""
+    cases = [case for case in ALL_CASES if not args.only or any(text in case.name for text in args.only)]
+    client = TestClient(app)
+
+    results = []
+    for num_accounts in args.accounts:
+        for num_transactions in args.transactions:
+            print(f"== {num_transactions} transactions, {num_accounts} accounts, {args.years} years", file=sys.stderr)
+            context, load_timings = load_dataset(num_transactions, num_accounts, args.years, client, args.generator)
+            scale = {
+                "transactions": num_transactions,
+                "accounts": num_accounts,
+                "balance_records": len(context.accounts),
+                "years": args.years,
+                "generator": args.generator,
+            }
+            for timing in load_timings:
+                results.append({**timing, **scale})
+            for case in cases:
+                result = {**run_case(case, context, args.repeat, not args.no_memory), **scale}
+                results.append(result)
+                print(f"  {case.name:<48} {result['latency_ms']['median']:>10.2f} ms", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "years": args.years,
+            "generator": args.generator,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        report["regressions"] = regressions
+
+    document = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(document + "\n", encoding="utf-8")
+    if args.save_baseline:
+        args.baseline.write_text(document + "\n", encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr)
+    if not args.output and not args.save_baseline:
+        print(document)
+
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['case']} (tx={regression['transactions']}, acc={regression['accounts']}): "
+            f"{regression['baseline_ms']} ms -> {regression['current_ms']} ms",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
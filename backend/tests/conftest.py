@@ -4,7 +4,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
-from app.routes import accounts, transactions
+from app.routes import accounts, transactions, analytics
 from tests.fixtures.mock_accounts import (
     generate_mock_accounts,
     MOCK_ACCOUNTS_SINGLE_DAY,
@@ -16,6 +16,7 @@ from tests.fixtures.mock_transactions import (
     MOCK_TRANSACTIONS_SAMPLE,
     MOCK_TRANSACTIONS_EMPTY,
     MOCK_TRANSACTIONS_EDGE_CASES,
+    MOCK_TRANSACTIONS_ENRICHED,
 )
 
 
@@ -42,6 +43,15 @@ def mock_accounts_range():
     accounts.set_mock_accounts([])
 
 
+@pytest.fixture
+def mock_accounts_year():
+    """Provide mock account data for a full year (365 days)."""
+    mock_data = generate_mock_accounts(start_date="2025-01-01", days=365)
+    accounts.set_mock_accounts(mock_data)
+    yield mock_data
+    accounts.set_mock_accounts([])
+
+
 @pytest.fixture
 def mock_accounts_empty():
     """Provide empty mock account data."""
@@ -93,3 +103,11 @@ def mock_transactions_edge_cases():
     transactions.set_mock_transactions(MOCK_TRANSACTIONS_EDGE_CASES)
     yield MOCK_TRANSACTIONS_EDGE_CASES
     transactions.set_mock_transactions([])
+
+
+@pytest.fixture
+def mock_enriched_transactions():
+    """Provide enriched mock transaction data (Dec 2025 - Jan 2026)."""
+    analytics.set_mock_enriched_transactions(MOCK_TRANSACTIONS_ENRICHED)
+    yield MOCK_TRANSACTIONS_ENRICHED
+    analytics.set_mock_enriched_transactions([])
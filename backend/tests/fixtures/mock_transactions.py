@@ -1,7 +1,7 @@
 """Mock transaction data for testing."""
 
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import random
 
 
@@ -9,6 +9,7 @@ def generate_mock_transactions(
     start_date: str = "2026-01-01",
     end_date: str = "2026-01-31",
     num_transactions: int = 50,
+    rng: Optional[random.Random] = None,
 ) -> List[Dict[str, Any]]:
     """Generate mock transaction data for testing.
     
@@ -16,10 +17,12 @@ def generate_mock_transactions(
         start_date: Start date in YYYY-MM-DD format.
         end_date: End date in YYYY-MM-DD format.
         num_transactions: Number of transactions to generate.
+        rng: Random generator to draw from (the global one if None).
     
     Returns:
         List of transaction dictionaries.
     """
+    rng = rng or random
     start = datetime.strptime(start_date, "%Y-%m-%d")
     end = datetime.strptime(end_date, "%Y-%m-%d")
     date_range = (end - start).days
@@ -79,17 +82,17 @@ def generate_mock_transactions(
     
     for _ in range(num_transactions):
         # Random date within range
-        random_days = random.randint(0, max(0, date_range))
+        random_days = rng.randint(0, max(0, date_range))
         operation_date = start + timedelta(days=random_days)
         
         # Value date could be same or 1-2 days after operation date
-        value_date = operation_date + timedelta(days=random.randint(0, 2))
+        value_date = operation_date + timedelta(days=rng.randint(0, 2))
         
         # Select random transaction type and account
-        trans_type = random.choice(transaction_types)
-        account = random.choice(accounts)
+        trans_type = rng.choice(transaction_types)
+        account = rng.choice(accounts)
         
-        amount = round(random.uniform(trans_type["min"], trans_type["max"]), 2)
+        amount = round(rng.uniform(trans_type["min"], trans_type["max"]), 2)
         
         transactions.append({
             "account_description": account["account_description"],
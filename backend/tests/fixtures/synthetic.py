@@ -0,0 +1,380 @@
+"""Seeded, vectorized large-scale synthetic data.
+
+Unlike `generate_mock_accounts` / `generate_mock_transactions`, these
+generators are reproducible (NumPy `default_rng` seeded per chunk), build
+whole columns at once instead of one dict per row, and stream chunks so
+datasets of 10^7 rows and more never have to fit in memory at once.
+
+A chunk is a dict of NumPy columns. Each chunk is seeded from
+(seed, kind, chunk index), so the same seed and chunk size always produce
+the same data, whatever is done with the chunks afterwards.
+
+Example:
+    accounts = generate_synthetic_accounts(1000, seed=7)
+    chunks = generate_synthetic_transactions(10_000_000, accounts, seed=7)
+    write_jsonl(chunks, "transactions.jsonl")
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from app.services.enrichment import CATEGORIES
+
+
+# Rows per generated chunk (part of the dataset identity, with the seed)
+CHUNK_SIZE = 100_000
+
+# Seed stream of each kind of data
+_ACCOUNTS, _BALANCES, _TRANSACTIONS = 0, 1, 2
+
+Chunk = Dict[str, np.ndarray]
+
+
+@dataclass(frozen=True)
+class CategoryProfile:
+    """Frequency, direction and amount distribution of a category."""
+
+    weight: float
+    is_debit: bool
+    median_amount: float
+    sigma: float
+    merchants: tuple
+
+
+# Shaped after the enriched mock transactions: many small operating
+# expenses, fewer large ones, and a minority of credits
+CATEGORY_PROFILES: Dict[str, CategoryProfile] = {
+    "salary": CategoryProfile(0.08, False, 6500.0, 0.35, ("Payroll Department",)),
+    "other_income": CategoryProfile(0.17, False, 4500.0, 0.8, (
+        "Client ABC Industries", "Client XYZ Corp", "Client Payment", "Investment Fund Returns", "US Client Payment",
+    )),
+    "supplies": CategoryProfile(0.16, True, 1600.0, 0.9, (
+        "Office Depot", "Office Supplies Co", "Staples Business", "Tech Supplies Inc", "US Supplier Inc",
+    )),
+    "utilities": CategoryProfile(0.12, True, 140.0, 0.6, (
+        "EDF Électricité", "Electric Company", "Power Company", "Veolia Water Services", "Water Services",
+    )),
+    "rent": CategoryProfile(0.07, True, 1950.0, 0.3, (
+        "Paris Office Landlord", "Office Landlord", "Property Management Inc", "NYC Office Rent",
+    )),
+    "insurance": CategoryProfile(0.06, True, 450.0, 0.4, (
+        "AXA Assurances", "Insurance Company Ltd", "Insurance Provider",
+    )),
+    "tax": CategoryProfile(0.05, True, 3200.0, 0.6, (
+        "Direction Générale des Finances Publiques", "Tax Authority", "Tax Office",
+    )),
+    "equipment": CategoryProfile(0.05, True, 4100.0, 1.0, (
+        "Dell Business Solutions", "Office Equipment Co", "Tech Equipment Store", "Tech Supplier",
+    )),
+    "travel": CategoryProfile(0.10, True, 400.0, 0.8, (
+        "Air France", "Airlines", "Hilton Hotels", "Hotels International", "Travel Agency",
+    )),
+    "other_expense": CategoryProfile(0.14, True, 240.0, 1.1, (
+        "Bank Fees", "Banque de France", "Miscellaneous",
+    )),
+}
+
+# Account currencies and their frequencies
+CURRENCIES = ("EUR", "GBP", "CHF", "USD")
+CURRENCY_WEIGHTS = (0.65, 0.15, 0.10, 0.10)
+
+# Account kinds: (description, frequency, median opening balance, overdraft choices)
+ACCOUNT_KINDS = (
+    ("Main Business Account", 0.5, 150_000.0, (5_000.0, 10_000.0, 25_000.0)),
+    ("Savings Account", 0.2, 500_000.0, (0.0,)),
+    ("Operating Account", 0.3, 75_000.0, (2_000.0, 5_000.0, 10_000.0)),
+)
+
+_IBAN_PREFIXES = {"EUR": "FR76", "GBP": "GB29", "CHF": "CH93", "USD": "US12"}
+
+
+def _rng(seed: int, kind: int, chunk: int = 0) -> np.random.Generator:
+    """Generator of one chunk of one kind of data."""
+    return np.random.default_rng(np.random.SeedSequence([seed, kind, chunk]))
+
+
+def _iso_dates(start: np.datetime64, offsets: np.ndarray) -> np.ndarray:
+    """YYYY-MM-DD strings of day offsets from a start date."""
+    return (start + offsets.astype("timedelta64[D]")).astype("datetime64[D]").astype(str)
+
+
+def generate_synthetic_accounts(num_accounts: int, seed: int = 0, num_companies: Optional[int] = None) -> Chunk:
+    """Generate account master data.
+
+    Args:
+        num_accounts: Number of accounts.
+        seed: Random seed.
+        num_companies: Number of holder companies (num_accounts / 5 by default).
+
+    Returns:
+        Columns: iban, account_description, holder_company_name, currency,
+        allowed_overdraft, opening_balance.
+    """
+    rng = _rng(seed, _ACCOUNTS)
+    num_companies = num_companies or max(1, num_accounts // 5)
+
+    kind_weights = np.array([kind[1] for kind in ACCOUNT_KINDS])
+    kinds = rng.choice(len(ACCOUNT_KINDS), size=num_accounts, p=kind_weights / kind_weights.sum())
+    currencies = np.array(CURRENCIES)[rng.choice(len(CURRENCIES), size=num_accounts, p=CURRENCY_WEIGHTS)]
+    companies = rng.integers(0, num_companies, size=num_accounts)
+
+    medians = np.array([kind[2] for kind in ACCOUNT_KINDS])[kinds]
+    opening = np.round(medians * rng.lognormal(0.0, 0.5, size=num_accounts), 2)
+    overdraft = np.empty(num_accounts)
+    for position, kind in enumerate(ACCOUNT_KINDS):
+        selected = kinds == position
+        overdraft[selected] = rng.choice(kind[3], size=int(selected.sum()))
+
+    numbers = rng.integers(0, 10**12, size=num_accounts)
+    ibans = np.array([
+        f"{_IBAN_PREFIXES[currency]}{index:011d}{number:012d}"
+        for index, (currency, number) in enumerate(zip(currencies.tolist(), numbers.tolist()))
+    ])
+    descriptions = np.array([f"{ACCOUNT_KINDS[kind][0]} {index}" for index, kind in enumerate(kinds.tolist())])
+    company_names = np.array([f"Company {company:05d}" for company in companies.tolist()])
+
+    return {
+        "iban": ibans,
+        "account_description": descriptions,
+        "holder_company_name": company_names,
+        "currency": currencies,
+        "allowed_overdraft": overdraft,
+        "opening_balance": opening,
+    }
+
+
+def generate_synthetic_balances(
+    accounts: Chunk,
+    start_date: str = "2023-01-01",
+    days: int = 365,
+    every: int = 1,
+    seed: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Chunk]:
+    """Stream balance snapshots of every account.
+
+    Balances follow a random walk from each account's opening balance,
+    drifting slightly downwards so some accounts approach their overdraft.
+
+    Args:
+        accounts: Columns returned by generate_synthetic_accounts.
+        start_date: First snapshot date (YYYY-MM-DD).
+        days: Length of the history.
+        every: Days between snapshots.
+        seed: Random seed.
+        chunk_size: Approximate rows per chunk (whole accounts per chunk).
+
+    Yields:
+        Columns: account_description, iban, holder_company_name, date,
+        value_balance, currency, allowed_overdraft.
+    """
+    start = np.datetime64(start_date, "D")
+    offsets = np.arange(0, days, every)
+    dates = _iso_dates(start, offsets)
+    per_chunk = max(1, chunk_size // len(offsets))
+    num_accounts = len(accounts["iban"])
+
+    for chunk, first in enumerate(range(0, num_accounts, per_chunk)):
+        rng = _rng(seed, _BALANCES, chunk)
+        rows = slice(first, min(first + per_chunk, num_accounts))
+        opening = accounts["opening_balance"][rows]
+        scale = np.maximum(opening, 1_000.0)[:, np.newaxis] * 0.01 * np.sqrt(every)
+        steps = rng.normal(-0.05, 1.0, size=(len(opening), len(offsets))) * scale
+        balances = np.round(opening[:, np.newaxis] + np.cumsum(steps, axis=1), 2)
+
+        repeat = len(offsets)
+        yield {
+            "account_description": np.repeat(accounts["account_description"][rows], repeat),
+            "iban": np.repeat(accounts["iban"][rows], repeat),
+            "holder_company_name": np.repeat(accounts["holder_company_name"][rows], repeat),
+            "date": np.tile(dates, len(opening)),
+            "value_balance": balances.ravel(),
+            "currency": np.repeat(accounts["currency"][rows], repeat),
+            "allowed_overdraft": np.repeat(accounts["allowed_overdraft"][rows], repeat),
+        }
+
+
+def generate_synthetic_transactions(
+    num_transactions: int,
+    accounts: Chunk,
+    start_date: str = "2023-01-01",
+    end_date: str = "2025-12-31",
+    seed: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Chunk]:
+    """Stream enriched transactions in operation date order.
+
+    Categories, directions, amounts (log-normal per category) and merchants
+    follow CATEGORY_PROFILES; accounts are picked with a Zipf-like skew so a
+    few accounts carry most of the volume.
+
+    Args:
+        num_transactions: Total number of transactions.
+        accounts: Columns returned by generate_synthetic_accounts.
+        start_date: First operation date (YYYY-MM-DD).
+        end_date: Last operation date (YYYY-MM-DD).
+        seed: Random seed.
+        chunk_size: Rows per chunk.
+
+    Yields:
+        Columns: account_description, iban, holder_company_name,
+        operation_date, value_date, amount, currency, is_debit, category_id,
+        merchant.
+    """
+    start = np.datetime64(start_date, "D")
+    span = int((np.datetime64(end_date, "D") - start).astype(int)) + 1
+
+    category_ids = np.array(list(CATEGORY_PROFILES))
+    profiles = list(CATEGORY_PROFILES.values())
+    weights = np.array([profile.weight for profile in profiles])
+    weights /= weights.sum()
+    debit_by_category = np.array([profile.is_debit for profile in profiles])
+    log_medians = np.log([profile.median_amount for profile in profiles])
+    sigmas = np.array([profile.sigma for profile in profiles])
+
+    num_accounts = len(accounts["iban"])
+    account_weights = 1.0 / np.arange(1, num_accounts + 1) ** 0.8
+    account_weights /= account_weights.sum()
+
+    for chunk, first in enumerate(range(0, num_transactions, chunk_size)):
+        rng = _rng(seed, _TRANSACTIONS, chunk)
+        size = min(chunk_size, num_transactions - first)
+
+        # Each chunk covers its share of the date range, so the stream is sorted
+        low = span * first / num_transactions
+        high = span * (first + size) / num_transactions
+        offsets = np.sort(np.floor(rng.uniform(low, high, size=size)).astype(np.int64))
+        value_offsets = offsets + rng.choice(3, size=size, p=(0.7, 0.2, 0.1))
+
+        categories = rng.choice(len(profiles), size=size, p=weights)
+        amounts = np.round(np.exp(rng.normal(log_medians[categories], sigmas[categories])), 2)
+        merchants = np.empty(size, dtype=object)
+        for position, profile in enumerate(profiles):
+            selected = np.flatnonzero(categories == position)
+            merchants[selected] = np.array(profile.merchants, dtype=object)[
+                rng.integers(0, len(profile.merchants), size=len(selected))
+            ]
+
+        owners = rng.choice(num_accounts, size=size, p=account_weights)
+        yield {
+            "account_description": accounts["account_description"][owners],
+            "iban": accounts["iban"][owners],
+            "holder_company_name": accounts["holder_company_name"][owners],
+            "operation_date": _iso_dates(start, offsets),
+            "value_date": _iso_dates(start, value_offsets),
+            "amount": amounts,
+            "currency": accounts["currency"][owners],
+            "is_debit": debit_by_category[categories],
+            "category_id": category_ids[categories],
+            "merchant": merchants.astype(str),
+        }
+
+
+def _tags(amount: float, is_debit: bool) -> List[str]:
+    """Tags assigned by enrichment for an amount and direction."""
+    tags = ["large"] if amount > 10000 else []
+    tags.append("expense" if is_debit else "income")
+    return tags
+
+
+def chunk_records(chunk: Chunk, enriched: bool = True) -> Iterator[Dict[str, Any]]:
+    """Rows of a chunk as dicts in the mock data format.
+
+    Transactions chunks yield enriched transactions (category dicts from
+    CATEGORIES, merchant and tags) unless `enriched` is False; balance
+    chunks yield account balance records.
+    """
+    columns = {name: values.tolist() for name, values in chunk.items()}
+    names = [name for name in columns if name not in ("category_id", "merchant")]
+    categories = {key: category.model_dump() for key, category in CATEGORIES.items()}
+    has_categories = "category_id" in columns and enriched
+
+    for position in range(len(columns[names[0]])):
+        record = {name: columns[name][position] for name in names}
+        if has_categories:
+            record["category"] = categories[columns["category_id"][position]]
+            record["merchant"] = columns["merchant"][position]
+            record["tags"] = _tags(record["amount"], record["is_debit"])
+        yield record
+
+
+def write_jsonl(chunks: Iterable[Chunk], path: Union[str, Path], enriched: bool = True) -> int:
+    """Stream chunks to a JSON Lines file, one record per line.
+
+    Returns:
+        Number of records written.
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as handle:
+        for chunk in chunks:
+            lines = [json.dumps(record, ensure_ascii=False) for record in chunk_records(chunk, enriched)]
+            handle.write("\n".join(lines) + "\n")
+            count += len(lines)
+    return count
+
+
+def write_parquet(chunks: Iterable[Chunk], path: Union[str, Path]) -> int:
+    """Stream chunks to a Parquet file, one row group per chunk.
+
+    Requires pyarrow (optional dependency). Columns are written as
+    generated (category_id rather than nested category objects).
+
+    Returns:
+        Number of rows written.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("write_parquet requires pyarrow (pip install pyarrow)") from None
+
+    count = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.table({name: pa.array(values) for name, values in chunk.items()})
+            if writer is None:
+                writer = pq.ParquetWriter(str(path), table.schema)
+            writer.write_table(table)
+            count += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def main(argv=None) -> None:
+    """Write a synthetic dataset to disk (python -m tests.fixtures.synthetic --help)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write a seeded synthetic dataset.")
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--accounts", type=int, default=1_000)
+    parser.add_argument("--start-date", default="2023-01-01")
+    parser.add_argument("--end-date", default="2025-12-31")
+    parser.add_argument("--balance-every", type=int, default=1, help="Days between balance snapshots")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    parser.add_argument("--output", type=Path, default=Path("synthetic"))
+    args = parser.parse_args(argv)
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    accounts = generate_synthetic_accounts(args.accounts, seed=args.seed)
+    days = int((np.datetime64(args.end_date) - np.datetime64(args.start_date)).astype(int)) + 1
+    balances = generate_synthetic_balances(accounts, args.start_date, days, args.balance_every, seed=args.seed)
+    transactions = generate_synthetic_transactions(
+        args.transactions, accounts, args.start_date, args.end_date, seed=args.seed
+    )
+
+    write = write_jsonl if args.format == "jsonl" else write_parquet
+    for name, chunks in (("balances", balances), ("transactions", transactions)):
+        path = args.output / f"{name}.{args.format}"
+        print(f"{path}: {write(chunks, path)} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -133,3 +133,178 @@ class TestAccountBalances:
         currencies = {acc["currency"] for acc in data}
         assert "EUR" in currencies
         assert "USD" in currencies
+
+
+class TestBalanceSeries:
+    """Test cases for the downsampled balance series endpoint."""
+
+    def test_series_downsampled_per_account(self, client: TestClient, mock_accounts_year):
+        """Test that each account series is capped at the requested size."""
+        response = client.get(
+            "/api/v1/bank-account-balances/series?start_date=2025-01-01&end_date=2025-12-31&points=50"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert len(data) == 3
+        for series in data:
+            assert series["total_points"] == 365
+            assert len(series["points"]) == 50
+            dates = [point["date"] for point in series["points"]]
+            assert dates == sorted(dates)
+            assert dates[0] == "2025-01-01"
+            assert dates[-1] == "2025-12-31"
+
+    def test_series_minmax_keeps_extremes(self, client: TestClient, mock_accounts_year):
+        """Test that min/max downsampling preserves the extreme balances."""
+        response = client.get(
+            "/api/v1/bank-account-balances/series"
+            "?start_date=2025-01-01&end_date=2025-12-31&points=40&method=minmax"
+        )
+
+        assert response.status_code == 200
+        for series in response.json():
+            iban = series["iban"]
+            balances = [acc["value_balance"] for acc in mock_accounts_year if acc["iban"] == iban]
+            kept = [point["balance"] for point in series["points"]]
+            assert len(kept) <= 40
+            assert min(kept) == min(balances)
+            assert max(kept) == max(balances)
+
+    def test_series_short_range_not_downsampled(self, client: TestClient, mock_accounts_range):
+        """Test that series shorter than the limit are returned in full."""
+        response = client.get(
+            "/api/v1/bank-account-balances/series?start_date=2026-01-01&end_date=2026-01-10"
+        )
+
+        assert response.status_code == 200
+        for series in response.json():
+            assert len(series["points"]) == series["total_points"] == 10
+
+    def test_series_invalid_method(self, client: TestClient, mock_accounts_range):
+        """Test error handling for an unknown downsampling method."""
+        response = client.get(
+            "/api/v1/bank-account-balances/series"
+            "?start_date=2026-01-01&end_date=2026-01-10&method=average"
+        )
+
+        assert response.status_code == 400
+
+
+class TestAsOfBalances:
+    """Test cases for forward-filled as-of balance lookups."""
+
+    def test_as_of_forward_fills_missing_date(self, client: TestClient, mock_accounts_single_day):
+        """Test that a date without snapshot returns the latest earlier balance."""
+        exact = client.get("/api/v1/bank-account-balances?date=2026-01-18")
+        as_of = client.get("/api/v1/bank-account-balances?date=2026-01-18&as_of=true")
+
+        assert exact.status_code == 200
+        assert exact.json() == []
+
+        assert as_of.status_code == 200
+        data = as_of.json()
+        assert len(data) == 3
+        assert all(acc["date"] == "2026-01-15" for acc in data)
+
+    def test_as_of_before_first_snapshot(self, client: TestClient, mock_accounts_single_day):
+        """Test that no balance is returned before the first snapshot."""
+        response = client.get("/api/v1/bank-account-balances?date=2026-01-01&as_of=true")
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_as_of_many_dates(self, client: TestClient, mock_accounts_range):
+        """Test vectorized as-of lookups for several dates in one call."""
+        response = client.get(
+            "/api/v1/bank-account-balances/as-of"
+            "?dates=2026-02-15&dates=2025-12-31&dates=2026-01-05"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert len(data["balances"]) == 3
+        for balances in data["balances"].values():
+            latest, missing, exact = balances
+            assert latest["date"] == "2026-01-30"
+            assert missing is None
+            assert exact["date"] == "2026-01-05"
+
+    def test_as_of_invalid_date(self, client: TestClient, mock_accounts_single_day):
+        """Test error handling for an invalid as-of date."""
+        response = client.get("/api/v1/bank-account-balances?date=15-01-2026&as_of=true")
+
+        assert response.status_code == 400
+
+
+class TestReconstructedBalances:
+    """Test cases for balances reconstructed from transactions."""
+
+    @pytest.fixture
+    def reconstruction(self, mock_accounts_single_day):
+        """Anchor on single-day snapshots and apply later transactions."""
+        from app.routes import accounts
+
+        base = {
+            "account_description": "Main Business Account",
+            "iban": "FR7612345678901234567890123",
+            "holder_company_name": "ACME Corporation",
+            "currency": "EUR",
+        }
+        applied = accounts.ingest_transactions([
+            {**base, "operation_date": "2026-01-14", "value_date": "2026-01-15", "amount": 999.0, "is_debit": False},
+            {**base, "operation_date": "2026-01-16", "value_date": "2026-01-16", "amount": 1000.0, "is_debit": False},
+            {**base, "operation_date": "2026-01-16", "value_date": "2026-01-16", "amount": 250.5, "is_debit": True},
+            {**base, "operation_date": "2026-01-18", "value_date": "2026-01-18", "amount": 500.0, "is_debit": True},
+        ])
+        assert applied == 3
+        yield
+
+    def test_reconstructed_end_of_day(self, client: TestClient, reconstruction):
+        """Test that later transactions are added to the anchored balance."""
+        response = client.get("/api/v1/bank-account-balances/reconstructed?date=2026-01-17&intraday=true")
+
+        assert response.status_code == 200
+        main = next(acc for acc in response.json() if acc["iban"] == "FR7612345678901234567890123")
+        assert main["source"] == "reconstructed"
+        assert main["anchor_date"] == "2026-01-15"
+        assert main["balance"] == pytest.approx(150000.50 + 1000.0 - 250.5)
+        assert main["transactions_applied"] == 2
+        assert main["intraday"] == []
+
+    def test_reconstructed_intraday(self, client: TestClient, reconstruction):
+        """Test running balances after each movement of the day."""
+        response = client.get("/api/v1/bank-account-balances/reconstructed?date=2026-01-16&intraday=true")
+
+        main = next(acc for acc in response.json() if acc["iban"] == "FR7612345678901234567890123")
+        assert main["intraday"] == [151000.5, 150750.0]
+
+    def test_reconstructed_incremental(self, client: TestClient, reconstruction):
+        """Test that late-arriving transactions update later balances."""
+        from app.routes import accounts
+
+        accounts.ingest_transactions([{
+            "account_description": "Main Business Account",
+            "iban": "FR7612345678901234567890123",
+            "holder_company_name": "ACME Corporation",
+            "operation_date": "2026-01-17",
+            "value_date": "2026-01-17",
+            "amount": 100.0,
+            "currency": "EUR",
+            "is_debit": True,
+        }])
+
+        response = client.get("/api/v1/bank-account-balances/reconstructed?date=2026-01-20")
+        main = next(acc for acc in response.json() if acc["iban"] == "FR7612345678901234567890123")
+        assert main["balance"] == pytest.approx(150000.50 + 1000.0 - 250.5 - 100.0 - 500.0)
+
+    def test_snapshot_dates_use_stored_balances(self, client: TestClient, reconstruction):
+        """Test that dates up to the anchor return the stored snapshot."""
+        response = client.get("/api/v1/bank-account-balances/reconstructed?date=2026-01-15")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 3
+        assert all(acc["source"] == "snapshot" for acc in data)
@@ -0,0 +1,185 @@
+"""Tests for low balance alert endpoints."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.routes import accounts
+from app.services.broadcast import Broadcaster
+
+
+def _balance(date: str, balance: float, allowed_overdraft: float = 10000.0) -> dict:
+    """Build one balance record of the main business account."""
+    return {
+        "account_description": "Main Business Account",
+        "iban": "FR7612345678901234567890123",
+        "holder_company_name": "ACME Corporation",
+        "date": date,
+        "value_balance": balance,
+        "currency": "EUR",
+        "allowed_overdraft": allowed_overdraft,
+    }
+
+
+@pytest.fixture
+def mock_alert_timeline():
+    """Provide a balance timeline that enters, escalates and exits alerts."""
+    mock_data = [
+        _balance("2026-01-01", 50000.0),
+        _balance("2026-01-02", 500.0),      # enter medium
+        _balance("2026-01-03", 400.0),      # still medium
+        _balance("2026-01-04", -2000.0),    # escalate to high
+        _balance("2026-01-05", 20000.0),    # exit
+    ]
+    accounts.set_mock_accounts(mock_data)
+    yield mock_data
+    accounts.set_mock_accounts([])
+
+
+class TestAlerts:
+    """Test cases for alert endpoints."""
+
+    def test_active_alerts_after_exit(self, client: TestClient, mock_alert_timeline):
+        """Test that an exited alert is no longer active."""
+        response = client.get("/api/v1/alerts")
+
+        assert response.status_code == 200
+        assert response.json()["count"] == 0
+
+    def test_alerts_as_of_date(self, client: TestClient, mock_alert_timeline):
+        """Test reading the alert state on a past date."""
+        response = client.get("/api/v1/alerts?date=2026-01-04")
+
+        assert response.status_code == 200
+        alerts = response.json()["alerts"]
+        assert len(alerts) == 1
+        assert alerts[0]["severity"] == "high"
+        assert alerts[0]["balance"] == -2000.0
+
+    def test_alert_balance_is_as_of_date(self, client: TestClient, mock_alert_timeline):
+        """Test that an alert reports the balance of the date, not of its last transition."""
+        engine = client.get("/api/v1/alerts?date=2026-01-03").json()
+        detected = client.get("/api/v1/alerts?date=2026-01-03&threshold=0.1000001").json()
+
+        assert engine["alerts"][0]["balance"] == 400.0
+        assert engine == detected
+
+    def test_alert_history(self, client: TestClient, mock_alert_timeline):
+        """Test the transition timeline of an account."""
+        response = client.get("/api/v1/alerts/history?iban=FR7612345678901234567890123")
+
+        assert response.status_code == 200
+        events = [(t["date"], t["event"]) for t in response.json()["transitions"]]
+        assert events == [
+            ("2026-01-02", "enter"),
+            ("2026-01-04", "escalate"),
+            ("2026-01-05", "exit"),
+        ]
+        ranged = client.get("/api/v1/alerts/history?start_date=2026-01-03&end_date=2026-01-04").json()
+        assert [t["event"] for t in ranged["transitions"]] == ["escalate"]
+        assert client.get("/api/v1/alerts/history?start_date=2026/01/03").status_code == 400
+
+    def test_custom_threshold_uses_balances(self, client: TestClient, mock_alert_timeline):
+        """Test that non-default thresholds are computed from balances."""
+        response = client.get("/api/v1/alerts?threshold=3.0&date=2026-01-05")
+
+        assert response.status_code == 200
+        alerts = response.json()["alerts"]
+        assert len(alerts) == 1
+        assert alerts[0]["severity"] == "medium"
+
+    def test_engine_matches_detection(self, client: TestClient, mock_accounts_edge_cases):
+        """Test that the engine agrees with per-request detection."""
+        engine = client.get("/api/v1/alerts?date=2026-01-15").json()
+        detected = client.get("/api/v1/alerts?date=2026-01-15&threshold=0.1000001").json()
+
+        assert engine["count"] == detected["count"]
+        assert {a["severity"] for a in engine["alerts"]} == {a["severity"] for a in detected["alerts"]}
+
+
+class TestAlertStream:
+    """Test cases for pushed alert transitions."""
+
+    @pytest.fixture(autouse=True)
+    def private_stores(self, monkeypatch):
+        """Keep stores in process memory: shared stores do not accept new balances."""
+        monkeypatch.delenv("SHARED_STORE_DIR", raising=False)
+
+    def test_new_balances_push_transitions(self, mock_alert_timeline):
+        """Test that loading new balances pushes transitions to subscribers."""
+
+        async def scenario():
+            subscription = accounts.alert_broadcaster.subscribe()
+            try:
+                transitions = accounts.append_mock_accounts([_balance("2026-01-06", -500.0)])
+                return transitions, await subscription.get(timeout=1)
+            finally:
+                subscription.close()
+
+        transitions, (pushed, dropped) = asyncio.run(scenario())
+
+        assert [t["event"] for t in transitions] == ["enter"]
+        assert pushed["event"] == "enter"
+        assert pushed["severity"] == "high"
+        assert dropped == 0
+        assert accounts.alert_broadcaster.subscriber_count == 0
+
+    def test_posted_balances_push_transitions(self, client: TestClient, mock_alert_timeline):
+        """Test that balances posted to the API reach the alert stream."""
+
+        async def scenario():
+            subscription = accounts.alert_broadcaster.subscribe()
+            try:
+                response = client.post("/api/v1/bank-account-balances", json=[_balance("2026-01-06", -500.0)])
+                return response, await subscription.get(timeout=1)
+            finally:
+                subscription.close()
+
+        response, (pushed, _) = asyncio.run(scenario())
+
+        assert response.status_code == 200
+        assert response.json()["loaded"] == 1
+        assert [t["event"] for t in response.json()["transitions"]] == ["enter"]
+        assert pushed["date"] == "2026-01-06"
+        assert client.get("/api/v1/alerts?date=2026-01-06").json()["count"] == 1
+
+    def test_backdated_balance_reevaluated(self, client: TestClient):
+        """Test that a balance posted before an account's latest one still raises its alert."""
+        record = {**_balance("2026-01-01", 5000.0, 1000.0), "iban": "FR00OOO"}
+        accounts.set_mock_accounts([])
+        client.post("/api/v1/bank-account-balances", json=[record, {**record, "date": "2026-01-20"}])
+        response = client.post(
+            "/api/v1/bank-account-balances", json=[{**record, "date": "2026-01-10", "value_balance": -950.0}]
+        )
+
+        assert [(t["date"], t["event"]) for t in response.json()["transitions"]] == [
+            ("2026-01-10", "enter"), ("2026-01-20", "exit"),
+        ]
+        default = client.get("/api/v1/alerts?date=2026-01-10").json()["alerts"]
+        custom = client.get("/api/v1/alerts?date=2026-01-10&threshold=0.10001").json()["alerts"]
+        assert [alert["iban"] for alert in default] == [alert["iban"] for alert in custom] == ["FR00OOO"]
+        assert client.get("/api/v1/alerts?date=2026-01-20").json()["count"] == 0
+        accounts.set_mock_accounts([])
+
+    def test_posted_invalid_date_rejected(self, client: TestClient, mock_alert_timeline):
+        """Test that an invalid record is rejected without loading anything."""
+        response = client.post("/api/v1/bank-account-balances", json=[_balance("2026/01/06", -500.0)])
+
+        assert response.status_code == 400
+        assert len(accounts._mock_accounts) == len(mock_alert_timeline)
+
+    def test_slow_subscriber_drops_oldest(self):
+        """Test that a full subscriber queue drops its oldest events."""
+        broadcaster = Broadcaster(maxsize=2)
+
+        async def scenario():
+            subscription = broadcaster.subscribe()
+            for event in range(5):
+                broadcaster.publish(event)
+            return await subscription.get(timeout=1), await subscription.get(timeout=1)
+
+        (first, dropped), (second, _) = asyncio.run(scenario())
+
+        assert (first, second) == (3, 4)
+        assert dropped == 3
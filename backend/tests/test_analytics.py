@@ -0,0 +1,224 @@
+"""Tests for analytics API endpoints."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.routes import accounts
+from tests.fixtures.mock_accounts import MOCK_ACCOUNTS_SINGLE_DAY
+
+
+class TestTrendSeries:
+    """Test cases for the time-bucketed trend series endpoint."""
+
+    def test_monthly_series_matches_trends(self, client: TestClient, mock_enriched_transactions):
+        """Test that monthly buckets add up to the scalar trend summary."""
+        params = "from_date=2025-12-01&to_date=2026-01-31"
+        series = client.get(f"/api/v1/transactions/trends/series?{params}&granularity=month")
+        trends = client.get(f"/api/v1/transactions/trends?{params}")
+
+        assert series.status_code == 200
+        data = series.json()
+        assert [entry["period"] for entry in data["series"]] == ["2025-12-01", "2026-01-01"]
+
+        summary = trends.json()
+        assert sum(e["transaction_count"] for e in data["series"]) == summary["transaction_count"]
+        assert sum(e["total_income"] for e in data["series"]) == pytest.approx(summary["total_income"])
+        assert sum(e["total_expenses"] for e in data["series"]) == pytest.approx(summary["total_expenses"])
+
+    def test_partial_edge_buckets(self, client: TestClient, mock_enriched_transactions):
+        """Test that edge buckets only include days inside the window."""
+        params = "from_date=2025-12-10&to_date=2025-12-20"
+        monthly = client.get(f"/api/v1/transactions/trends/series?{params}&granularity=month").json()
+        daily = client.get(f"/api/v1/transactions/trends/series?{params}&granularity=day").json()
+
+        assert len(monthly["series"]) == 1
+        assert monthly["series"][0]["start_date"] == "2025-12-10"
+        assert monthly["series"][0]["end_date"] == "2025-12-20"
+        assert len(daily["series"]) == 11
+        assert monthly["series"][0]["net_flow"] == pytest.approx(
+            sum(entry["net_flow"] for entry in daily["series"])
+        )
+
+    def test_weekly_series_grouped_by_category(self, client: TestClient, mock_enriched_transactions):
+        """Test splitting weekly buckets by category."""
+        response = client.get(
+            "/api/v1/transactions/trends/series"
+            "?from_date=2025-12-01&to_date=2025-12-31&granularity=week&group_by=category"
+        )
+
+        assert response.status_code == 200
+        for entry in response.json()["series"]:
+            assert entry["transaction_count"] == sum(
+                group["transaction_count"] for group in entry["groups"].values()
+            )
+
+    def test_invalid_granularity(self, client: TestClient, mock_enriched_transactions):
+        """Test error handling for an unsupported granularity."""
+        response = client.get(
+            "/api/v1/transactions/trends/series?from_date=2026-01-01&to_date=2026-01-31&granularity=year"
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("path", [
+        "/api/v1/transactions/trends",
+        "/api/v1/transactions/enriched",
+    ])
+    def test_invalid_date_format(self, client: TestClient, mock_enriched_transactions, path):
+        """Test that a malformed date is a client error, as on /bank-transactions."""
+        response = client.get(f"{path}?from_date=2026/01/01&to_date=2026-01-31")
+
+        assert response.status_code == 400
+
+
+class TestCategoryBreakdown:
+    """Test cases for the category spending breakdown endpoint."""
+
+    def test_breakdown_totals(self, client: TestClient, mock_enriched_transactions):
+        """Test that category totals add up and shares sum to one."""
+        response = client.get(
+            "/api/v1/transactions/categories/breakdown?from_date=2025-12-01&to_date=2026-01-31"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+
+        categories = data["categories"]
+        assert sum(c["transaction_count"] for c in categories) == data["transaction_count"]
+        assert sum(c["share_of_spend"] for c in categories) == pytest.approx(1.0)
+
+        expenses = [c["total_expenses"] for c in categories]
+        assert expenses == sorted(expenses, reverse=True)
+
+    def test_breakdown_top_merchants(self, client: TestClient, mock_enriched_transactions):
+        """Test that top merchants are limited and ranked."""
+        response = client.get(
+            "/api/v1/transactions/categories/breakdown"
+            "?from_date=2025-12-01&to_date=2026-01-31&top_merchants=1"
+        )
+
+        assert response.status_code == 200
+        for entry in response.json()["categories"]:
+            assert entry["category"]["id"]
+            assert len(entry["top_merchants"]) <= 1
+
+    def test_breakdown_empty_window(self, client: TestClient, mock_enriched_transactions):
+        """Test a window without transactions."""
+        response = client.get(
+            "/api/v1/transactions/categories/breakdown?from_date=2020-01-01&to_date=2020-01-31"
+        )
+
+        assert response.status_code == 200
+        assert response.json()["categories"] == []
+
+
+class TestReportingCurrency:
+    """Test cases for FX-converted aggregates."""
+
+    def test_balance_summary_converted(self, client: TestClient, mock_accounts_single_day):
+        """Test that balances are converted before being summed."""
+        response = client.get("/api/v1/balance-summary?date=2026-01-15&currency=EUR")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["currency"] == "EUR"
+        assert data["total_balance"] == pytest.approx(150000.50 + 500000.00 + 75000.00 / 1.0489)
+
+    def test_mixed_currencies_converted_by_default(self, client: TestClient, mock_accounts_single_day):
+        """Test that a summary of several currencies is reported in the FX base currency."""
+        default = client.get("/api/v1/balance-summary?date=2026-01-15").json()
+        converted = client.get("/api/v1/balance-summary?date=2026-01-15&currency=EUR").json()
+
+        assert default["currency"] == "EUR"
+        assert default["total_balance"] == pytest.approx(converted["total_balance"])
+
+    def test_unsupported_currency(self, client: TestClient, mock_accounts_single_day):
+        """Test error handling for a currency without rates."""
+        response = client.get("/api/v1/balance-summary?date=2026-01-15&currency=XYZ")
+
+        assert response.status_code == 400
+
+    def test_series_and_trends_agree(self, client: TestClient, mock_enriched_transactions):
+        """Test that converted daily series add up to converted trends."""
+        params = "from_date=2025-12-01&to_date=2026-01-31&currency=USD"
+        series = client.get(f"/api/v1/transactions/trends/series?{params}").json()
+        trends = client.get(f"/api/v1/transactions/trends?{params}").json()
+
+        assert trends["currency"] == "USD"
+        assert sum(e["total_expenses"] for e in series["series"]) == pytest.approx(trends["total_expenses"])
+        assert sum(e["total_income"] for e in series["series"]) == pytest.approx(trends["total_income"])
+
+    @pytest.mark.parametrize("granularity", ["week", "month"])
+    def test_converted_totals_agree_across_granularities(self, client: TestClient, mock_enriched_transactions, granularity):
+        """Test that buckets spanning a rate change are converted day by day."""
+        # Rates change on 2026-01-01, inside the week of 2025-12-29
+        params = "from_date=2025-12-01&to_date=2026-01-31&currency=USD"
+        daily = client.get(f"/api/v1/transactions/trends/series?{params}").json()["series"]
+        coarse = client.get(f"/api/v1/transactions/trends/series?{params}&granularity={granularity}").json()["series"]
+
+        for field in ("total_income", "total_expenses"):
+            assert sum(e[field] for e in coarse) == pytest.approx(sum(e[field] for e in daily))
+
+    def test_rate_lookup_memo_is_bounded(self):
+        """Test that the per-date row memo evicts old dates."""
+        from app.services.fx import ROW_CACHE_SIZE, get_fx_rates
+
+        fx = get_fx_rates()
+        fx.matrix("2026-01-03")
+        assert fx._row.cache_info().maxsize == ROW_CACHE_SIZE
+
+    def test_conversion_matrix_is_memoized(self):
+        """Test that dates sharing a rate row share one conversion matrix."""
+        from app.services.fx import get_fx_rates
+
+        fx = get_fx_rates()
+        assert fx.matrix("2026-01-03") is fx.matrix("2026-01-20")
+        assert fx.factor("USD", "USD", "2026-01-03") == 1.0
+        assert fx.factor("EUR", "GBP", "2026-01-03") * fx.factor("GBP", "EUR", "2026-01-03") == pytest.approx(1.0)
+
+
+class TestGroupedBalanceSummary:
+    """Test cases for grouped balance summaries."""
+
+    def test_grouped_by_all_dimensions(self, client: TestClient, mock_accounts_single_day):
+        """Test company, currency and account groups in one call."""
+        response = client.get("/api/v1/balance-summary/grouped?date=2026-01-15")
+
+        assert response.status_code == 200
+        groups = response.json()["groups"]
+        assert set(groups) == {"company", "currency", "account"}
+
+        companies = {group["key"]: group for group in groups["company"]}
+        assert companies["ACME Corporation"]["account_count"] == 2
+        assert companies["ACME Corporation"]["total_balance"] == pytest.approx(650000.50)
+        assert companies["ACME Corporation"]["highest_balance"] == 500000.00
+        assert companies["ACME USA Inc"]["currency"] == "USD"
+
+        currencies = {group["key"]: group for group in groups["currency"]}
+        assert currencies["USD"]["total_balance"] == 75000.00
+        assert len(groups["account"]) == 3
+
+    def test_grouped_mixed_currency_marked(self, client: TestClient, mock_accounts_single_day):
+        """Test that unconverted groups mixing currencies are flagged."""
+        response = client.get("/api/v1/balance-summary/grouped?date=2026-01-15&group_by=company")
+        assert all(group["currency"] != "MIXED" for group in response.json()["groups"]["company"])
+
+        accounts.set_mock_accounts([
+            {**acc, "holder_company_name": "ACME Group"} for acc in MOCK_ACCOUNTS_SINGLE_DAY
+        ])
+        mixed = client.get("/api/v1/balance-summary/grouped?date=2026-01-15&group_by=company").json()
+        converted = client.get(
+            "/api/v1/balance-summary/grouped?date=2026-01-15&group_by=company&currency=EUR"
+        ).json()
+
+        assert mixed["groups"]["company"][0]["currency"] == "MIXED"
+        assert converted["groups"]["company"][0]["currency"] == "EUR"
+        assert converted["groups"]["company"][0]["total_balance"] == pytest.approx(
+            650000.50 + 75000.00 / 1.0489
+        )
+
+    def test_grouped_invalid_dimension(self, client: TestClient, mock_accounts_single_day):
+        """Test error handling for an unknown grouping dimension."""
+        response = client.get("/api/v1/balance-summary/grouped?date=2026-01-15&group_by=country")
+
+        assert response.status_code == 400
@@ -0,0 +1,83 @@
+"""Smoke tests for the benchmark runner."""
+
+import json
+import os
+import random
+
+from app.routes import accounts, analytics, transactions
+from benchmarks.datasets import scaled_accounts, scaled_transactions
+from benchmarks.run import compare, main
+
+
+class TestBenchmarks:
+    """Test cases for benchmark datasets, runs and regression checks."""
+
+    def test_scaled_datasets(self):
+        """Test account and transaction generation at a given scale."""
+        account_rows = scaled_accounts(10, years=1, snapshot_every=30)
+        transaction_rows = scaled_transactions(200, 1, account_rows, seed=7)
+
+        assert len({row["iban"] for row in account_rows}) == 10
+        assert len(transaction_rows) == 200
+        assert {row["iban"] for row in transaction_rows} <= {row["iban"] for row in account_rows}
+        assert transaction_rows == scaled_transactions(200, 1, account_rows, seed=7)
+
+    def test_compare_flags_regressions(self):
+        """Test relative and absolute regression thresholds."""
+        baseline = {"results": [
+            {"case": "a", "transactions": 1, "accounts": 1, "latency_ms": {"median": 10.0}},
+            {"case": "b", "transactions": 1, "accounts": 1, "latency_ms": {"median": 0.1}},
+        ]}
+        results = [
+            {"case": "a", "transactions": 1, "accounts": 1, "latency_ms": {"median": 20.0}},
+            {"case": "b", "transactions": 1, "accounts": 1, "latency_ms": {"median": 0.5}},
+            {"case": "c", "transactions": 1, "accounts": 1, "latency_ms": {"median": 99.0}},
+        ]
+
+        regressions = compare(results, baseline, tolerance=0.3, min_delta_ms=1.0)
+
+        assert [regression["case"] for regression in regressions] == ["a"]
+        assert regressions[0]["ratio"] == 2.0
+
+    def test_compare_keys_on_dataset(self):
+        """Test that results of another generator or history length are not compared."""
+        baseline = {"results": [
+            {"case": "a", "transactions": 1, "accounts": 1, "years": 3, "generator": "mock", "latency_ms": {"median": 10.0}},
+        ]}
+        results = [
+            {"case": "a", "transactions": 1, "accounts": 1, "years": 5, "generator": "mock", "latency_ms": {"median": 50.0}},
+            {"case": "a", "transactions": 1, "accounts": 1, "years": 3, "generator": "synthetic", "latency_ms": {"median": 50.0}},
+        ]
+
+        assert compare(results, baseline, tolerance=0.3, min_delta_ms=1.0) == []
+
+    def test_seeded_datasets_leave_global_random(self):
+        """Test that generating a dataset does not reseed the global generator."""
+        random.seed(1)
+        expected = random.random()
+        random.seed(1)
+        scaled_transactions(20, 1, scaled_accounts(2, years=1), seed=7)
+
+        assert random.random() == expected
+
+    def test_run_writes_json(self, tmp_path, monkeypatch):
+        """Test a tiny end-to-end run."""
+        monkeypatch.delenv("MODEL_API_KEY", raising=False)
+        output = tmp_path / "results.json"
+        try:
+            status = main([
+                "--transactions", "50", "--accounts", "3", "--years", "1", "--repeat", "1",
+                "--only", "GET /health", "--only", "calculate_balance_summary", "--no-memory",
+                "--output", str(output), "--baseline", str(tmp_path / "missing.json"),
+            ])
+        finally:
+            transactions.set_mock_transactions([])
+            analytics.set_mock_enriched_transactions([])
+            accounts.set_mock_accounts([])
+
+        report = json.loads(output.read_text())
+        cases = {result["case"] for result in report["results"]}
+        assert status == 0
+        assert "MODEL_API_KEY" not in os.environ
+        assert {"GET /health", "calculate_balance_summary", "calculate_balance_summary(EUR)"} <= cases
+        assert "warm_latency_ms" in next(r for r in report["results"] if r["case"] == "GET /health")
@@ -0,0 +1,89 @@
+"""Tests for HTTP response caching."""
+
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+from app.middleware.caching import HTTPCacheMiddleware, cache_key
+from app.routes import accounts
+from tests.fixtures.mock_accounts import MOCK_ACCOUNTS_SINGLE_DAY
+
+
+class TestHTTPCache:
+    """Test cases for ETags and cached responses."""
+
+    URL = "/api/v1/bank-account-balances?date=2026-01-15"
+
+    def test_repeated_request_served_from_cache(self, client: TestClient, mock_accounts_single_day):
+        """Test that an identical query is replayed from the cache."""
+        first = client.get(self.URL)
+        second = client.get(self.URL)
+
+        assert first.status_code == second.status_code == 200
+        assert first.headers["x-cache"] == "MISS"
+        assert second.headers["x-cache"] == "HIT"
+        assert first.headers["etag"] == second.headers["etag"]
+        assert first.json() == second.json()
+
+    def test_if_none_match_returns_304(self, client: TestClient, mock_accounts_single_day):
+        """Test conditional requests with a matching ETag."""
+        etag = client.get(self.URL).headers["etag"]
+        response = client.get(self.URL, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_reload_changes_etag(self, client: TestClient, mock_accounts_single_day):
+        """Test that reloading the store invalidates ETags and cached bodies."""
+        etag = client.get(self.URL).headers["etag"]
+
+        accounts.set_mock_accounts(MOCK_ACCOUNTS_SINGLE_DAY[:1])
+        response = client.get(self.URL, headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.headers["x-cache"] == "MISS"
+        assert len(response.json()) == 1
+
+    def test_errors_not_cached(self, client: TestClient, mock_accounts_single_day):
+        """Test that error responses bypass the cache."""
+        response = client.get("/api/v1/bank-account-balances")
+
+        assert response.status_code == 400
+        assert "etag" not in response.headers
+
+    def test_query_normalization(self):
+        """Test that parameter order does not change the cache key."""
+        assert cache_key("/p", b"b=2&a=1") == cache_key("/p", b"a=1&b=2")
+        assert cache_key("/p", b"d=2&d=1") != cache_key("/p", b"d=1&d=2")
+
+    def test_etag_shared_by_processes_with_same_data(self):
+        """Test that processes loading the same data agree on ETags, until one changes its stores."""
+        script = (
+            "from app.middleware.caching import compute_etag;"
+            "from app.services import data_version as dv;"
+            "dv.bump_data_version(); dv.set_data_source('fixtures');"
+            "print(compute_etag('/p?', dv.data_tag(dv.current_data_version())),"
+            " compute_etag('/p?', dv.data_tag(dv.bump_data_version())))"
+        )
+        runs = [subprocess.check_output([sys.executable, "-c", script], text=True).split() for _ in range(2)]
+
+        assert runs[0][0] == runs[1][0]
+        assert runs[0][1] != runs[1][1]
+        assert runs[0][0] != runs[0][1]
+
+    def test_endpoint_headers_replayed(self):
+        """Test that cached replays keep the endpoint's own headers."""
+        async def endpoint(scope, receive, send):
+            await JSONResponse({"ok": True}, headers={"content-language": "fr"})(scope, receive, send)
+
+        client = TestClient(HTTPCacheMiddleware(endpoint, paths=["/p"]))
+        client.get("/p")
+        replay = client.get("/p")
+
+        assert replay.headers["x-cache"] == "HIT"
+        assert replay.headers["content-language"] == "fr"
+        assert replay.headers["content-type"] == "application/json"
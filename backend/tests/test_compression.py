@@ -0,0 +1,74 @@
+"""Tests for response compression."""
+
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import SUPPORTED_ENCODINGS, negotiate_encoding
+
+
+class TestCompression:
+    """Test cases for compressed responses."""
+
+    URL = "/api/v1/transactions/enriched?from_date=2025-12-01&to_date=2026-01-31"
+
+    def test_large_response_gzipped(self, client: TestClient, mock_enriched_transactions):
+        """Test that large JSON responses are compressed when accepted."""
+        response = client.get(self.URL, headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert len(response.json()) > 0
+
+    def test_identity_when_not_accepted(self, client: TestClient, mock_enriched_transactions):
+        """Test that clients without Accept-Encoding get raw bytes."""
+        response = client.get(self.URL, headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert int(response.headers["content-length"]) == len(response.content)
+
+    def test_small_response_not_compressed(self, client: TestClient):
+        """Test the minimum size threshold."""
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"status": "healthy"}
+
+    def test_cached_hit_reuses_compressed_bytes(self, client: TestClient, mock_enriched_transactions):
+        """Test that cache hits replay the stored compressed variant."""
+        headers = {"Accept-Encoding": "gzip"}
+        first = client.get(self.URL, headers=headers)
+        second = client.get(self.URL, headers=headers)
+        identity = client.get(self.URL, headers={"Accept-Encoding": "identity"})
+
+        assert second.headers["x-cache"] == "HIT"
+        assert second.headers["content-encoding"] == "gzip"
+        assert second.headers["etag"] == first.headers["etag"]
+        assert identity.headers["etag"] != first.headers["etag"]
+        assert second.json() == identity.json()
+
+        revalidated = client.get(self.URL, headers={**headers, "If-None-Match": first.headers["etag"]})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == first.headers["etag"]
+
+    @pytest.mark.parametrize("header,expected", [
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        ("*", SUPPORTED_ENCODINGS[0]),
+        ("", None),
+    ])
+    def test_negotiation(self, header, expected):
+        """Test Accept-Encoding negotiation."""
+        assert negotiate_encoding(header) == expected
+
+    def test_gzip_roundtrip(self, client: TestClient, mock_enriched_transactions):
+        """Test that the compressed body decodes to the JSON payload."""
+        with client.stream("GET", self.URL, headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert gzip.decompress(raw).startswith(b"[")
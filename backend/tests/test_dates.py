@@ -0,0 +1,84 @@
+"""Tests for integer date ordinals in models and filters."""
+
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.models.account import Account
+from app.models.dates import date_ordinal, ordinal_date, parse_date
+from app.models.transaction import Transaction
+from app.services.balances import BalanceIndex
+from tests.fixtures import MOCK_ACCOUNTS_TIMELINE_30_DAYS, MOCK_TRANSACTIONS_ENRICHED
+
+
+class TestDateParser:
+    """Test cases for the memoized date parser."""
+
+    def test_round_trip(self):
+        """Test conversions between ISO strings, ordinals and dates."""
+        ordinal = date_ordinal("2026-01-15")
+
+        assert ordinal == date(2026, 1, 15).toordinal()
+        assert ordinal_date(ordinal) == "2026-01-15"
+        assert ordinal_date(ordinal + 17) == "2026-02-01"
+        assert parse_date("2026-01-15") == date(2026, 1, 15)
+
+    def test_memoized(self):
+        """Test that repeated query parameters are parsed once."""
+        date_ordinal.cache_clear()
+        for _ in range(3):
+            date_ordinal("2026-01-15")
+
+        assert date_ordinal.cache_info().hits == 2
+
+    @pytest.mark.parametrize("value", ["15-01-2026", "2026-02-30", "not a date"])
+    def test_invalid(self, value):
+        """Test that invalid dates raise ValueError."""
+        with pytest.raises(ValueError):
+            date_ordinal(value)
+
+
+class TestModelOrdinals:
+    """Test cases for the ordinals parsed at ingestion."""
+
+    def test_rows_carry_ordinals(self):
+        """Test that validated rows expose their dates as ordinals."""
+        account = Account(**MOCK_ACCOUNTS_TIMELINE_30_DAYS[0])
+        transaction = Transaction(**MOCK_TRANSACTIONS_ENRICHED[0])
+
+        assert account.date_ordinal == date_ordinal(account.date)
+        assert transaction.operation_ordinal == date_ordinal(transaction.operation_date)
+        assert transaction.value_ordinal == date_ordinal(transaction.value_date)
+        # Ordinals are private: responses keep the ISO strings
+        assert account.model_dump()["date"] == account.date
+        assert "date_ordinal" not in account.model_dump()
+
+    def test_invalid_row_date_rejected(self):
+        """Test that rows with unparseable dates fail validation at load time."""
+        with pytest.raises(ValidationError):
+            Account(**{**MOCK_ACCOUNTS_TIMELINE_30_DAYS[0], "date": "2026/01/15"})
+
+    def test_balance_index_on_ordinals(self):
+        """Test as-of and range lookups with ordinal dates."""
+        index = BalanceIndex(Account(**acc) for acc in MOCK_ACCOUNTS_TIMELINE_30_DAYS)
+        iban = index.ibans[0]
+        records = index.records(iban)
+
+        assert index.as_of(iban, records[0].date_ordinal - 1) is None
+        assert index.as_of(iban, records[3].date_ordinal) is records[3]
+        assert index.range(iban, records[1].date_ordinal, records[2].date_ordinal) == records[1:3]
+
+
+class TestOrdinalFilters:
+    """Test cases for route filters comparing ordinals."""
+
+    def test_unpadded_dates_filter_like_padded_ones(self, client: TestClient, mock_transactions_sample):
+        """Test that query dates are compared as days, not as strings."""
+        padded = client.get("/api/v1/bank-transactions?from_date=2026-01-07&to_date=2026-01-12")
+        unpadded = client.get("/api/v1/bank-transactions?from_date=2026-1-7&to_date=2026-1-12")
+
+        assert unpadded.status_code == 200
+        assert unpadded.json() == padded.json()
+        assert [t["operation_date"] for t in padded.json()] == ["2026-01-07", "2026-01-10", "2026-01-12"]
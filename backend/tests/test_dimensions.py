@@ -0,0 +1,114 @@
+"""Tests for the account and category dimensions."""
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.models.account import Account
+from app.models.dimensions import AccountDimension, CategoryDimension, TransactionCategory, account_dimension
+from app.models.transaction import EnrichedTransaction, Transaction
+from app.routes import accounts, analytics, transactions
+from app.services.shared_store import model_columns
+from tests.fixtures import MOCK_ACCOUNTS_TIMELINE_30_DAYS, MOCK_TRANSACTIONS_ENRICHED
+
+
+class TestDimensions:
+    """Test cases for interning accounts and categories."""
+
+    def test_account_ids(self):
+        """Test that an account gets one ID, handed out in order of first sight."""
+        dimension = AccountDimension()
+        first = dimension.intern("Main", "FR76001", "ACME", "EUR")
+        second = dimension.intern("Savings", "FR76002", "ACME", "EUR")
+
+        assert (first, second) == (0, 1)
+        assert dimension.intern("Main", "FR76001", "ACME", "EUR") == first
+        assert dimension.get(second).iban == "FR76002"
+        assert [info.id for info in dimension.all()] == [0, 1]
+
+    def test_shared_categories(self):
+        """Test that equal categories resolve to one instance."""
+        dimension = CategoryDimension()
+        category = {"id": "rent", "name": "Loyer", "color": "#17a2b8"}
+        shared = dimension.intern(category)
+
+        assert isinstance(shared, TransactionCategory)
+        assert dimension.intern(dict(category)) is shared
+        assert dimension.intern(TransactionCategory(**category)) is shared
+        assert dimension.intern({**category, "name": "Rent"}) is not shared
+        assert dimension.intern(None) is None
+
+
+class TestFactRows:
+    """Test cases for rows referencing the dimensions."""
+
+    def test_rows_carry_account_ids(self):
+        """Test that rows keep an ID and serialize the joined strings."""
+        record = MOCK_ACCOUNTS_TIMELINE_30_DAYS[0]
+        account = Account(**record)
+        transaction = Transaction(**MOCK_TRANSACTIONS_ENRICHED[0])
+
+        assert account_dimension.get(account.account_id).iban == record["iban"]
+        assert account.model_dump() == {key: record[key] for key in account.model_dump()}
+        assert "account_id" not in account.model_dump()
+        assert transaction.holder_company_name == MOCK_TRANSACTIONS_ENRICHED[0]["holder_company_name"]
+
+    def test_enriched_rows_share_categories(self):
+        """Test that enriched rows of one category share its instance."""
+        analytics.set_mock_enriched_transactions(MOCK_TRANSACTIONS_ENRICHED)
+        salaries = [t for t in analytics._mock_enriched_transactions if t.category and t.category.id == "salary"]
+
+        assert len(salaries) > 1
+        assert all(t.category is salaries[0].category for t in salaries)
+        assert len({t.account_id for t in analytics._mock_enriched_transactions}) <= len(account_dimension)
+        analytics.set_mock_enriched_transactions([])
+
+    def test_missing_account_field_rejected(self):
+        """Test that rows without their account strings fail validation."""
+        record = {key: value for key, value in MOCK_TRANSACTIONS_ENRICHED[0].items() if key != "iban"}
+
+        with pytest.raises(ValidationError):
+            Transaction(**record)
+
+    def test_stored_columns(self):
+        """Test that stores persist the joined strings, not the process-local IDs."""
+        columns = model_columns(EnrichedTransaction)
+
+        assert "account_id" not in columns
+        assert {"account", "iban", "company", "currency", "category"} <= set(columns)
+
+
+class TestAccountsEndpoint:
+    """Test cases for the account metadata endpoint."""
+
+    def test_lists_loaded_accounts(self, client: TestClient):
+        """Test that every loaded account is listed once with its metadata."""
+        accounts.set_mock_accounts(MOCK_ACCOUNTS_TIMELINE_30_DAYS)
+        response = client.get("/api/v1/accounts")
+
+        assert response.status_code == 200
+        listed = response.json()
+        assert [acc["id"] for acc in listed] == sorted(acc["id"] for acc in listed)
+        assert len({acc["iban"] for acc in listed}) == len(listed)
+        listed = {(acc["account"], acc["iban"], acc["company"], acc["currency"]) for acc in listed}
+        for record in MOCK_ACCOUNTS_TIMELINE_30_DAYS:
+            key = (record["account_description"], record["iban"], record["holder_company_name"], record["currency"])
+            assert key in listed
+        accounts.set_mock_accounts([])
+
+    def test_follows_reloads(self, client: TestClient):
+        """Test that reloaded stores replace the listed accounts, one entry per IBAN."""
+        record = {**MOCK_ACCOUNTS_TIMELINE_30_DAYS[0], "iban": "ZZ01", "account_description": "Reloaded"}
+        transactions.set_mock_transactions([])
+        analytics.set_mock_enriched_transactions([])
+        accounts.set_mock_accounts(MOCK_ACCOUNTS_TIMELINE_30_DAYS)
+        accounts.set_mock_accounts([record])
+
+        assert [acc["iban"] for acc in client.get("/api/v1/accounts").json()] == ["ZZ01"]
+
+        accounts.set_mock_accounts([{**record, "account_description": "Renamed"}])
+        listed = client.get("/api/v1/accounts").json()
+
+        assert [(acc["iban"], acc["account"]) for acc in listed] == [("ZZ01", "Renamed")]
+        accounts.set_mock_accounts([])
+        assert client.get("/api/v1/accounts").json() == []
@@ -0,0 +1,167 @@
+"""Tests for the fair LLM request scheduler."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.chat import ChatRequest
+from app.services import chatbot as cb
+from app.services.llm_scheduler import LLMScheduler, QueueTimeout, TokenBucket
+
+
+async def _call(scheduler: LLMScheduler, session_id: str, log: list, hold: float = 0.01, **options):
+    async with scheduler.slot(session_id, **options):
+        log.append(("start", session_id))
+        await asyncio.sleep(hold)
+        log.append(("end", session_id))
+
+
+class TestLLMScheduler:
+    """Test cases for admission, ordering and deadlines."""
+
+    def test_concurrency_cap(self):
+        """Test that no more calls than allowed run at once."""
+        scheduler = LLMScheduler(max_concurrency=2)
+        log = []
+
+        async def run():
+            await asyncio.gather(*(_call(scheduler, f"s{index}", log) for index in range(6)))
+
+        asyncio.run(run())
+
+        running = peak = 0
+        for event, _ in log:
+            running += 1 if event == "start" else -1
+            peak = max(peak, running)
+        assert peak == 2
+        assert scheduler.stats()["queued"] == scheduler.stats()["in_flight"] == 0
+
+    def test_session_turns_in_order(self):
+        """Test that calls of one session run one at a time, first in first out."""
+        scheduler = LLMScheduler(max_concurrency=4)
+        order = []
+
+        async def turn(index: int):
+            async with scheduler.slot("same"):
+                order.append(("start", index))
+                await asyncio.sleep(0.01)
+                order.append(("end", index))
+
+        async def run():
+            await asyncio.gather(*(turn(index) for index in range(3)))
+
+        asyncio.run(run())
+
+        assert order == [("start", 0), ("end", 0), ("start", 1), ("end", 1), ("start", 2), ("end", 2)]
+
+    def test_round_robin_across_sessions(self):
+        """Test that a busy session does not starve the others."""
+        scheduler = LLMScheduler(max_concurrency=1)
+        log = []
+
+        async def run():
+            await asyncio.gather(
+                _call(scheduler, "a", log), _call(scheduler, "a", log), _call(scheduler, "a", log),
+                _call(scheduler, "b", log),
+            )
+
+        asyncio.run(run())
+
+        assert [session for event, session in log if event == "start"] == ["a", "b", "a", "a"]
+
+    def test_queue_deadline(self):
+        """Test that a call waiting past its deadline is dropped."""
+        scheduler = LLMScheduler(max_concurrency=1)
+        log = []
+
+        async def run():
+            holder = asyncio.create_task(_call(scheduler, "a", log, hold=0.2))
+            await asyncio.sleep(0)
+            with pytest.raises(QueueTimeout):
+                await _call(scheduler, "b", log, timeout=0.02)
+            assert scheduler.stats()["queued"] == 0
+            await holder
+
+        asyncio.run(run())
+
+        assert ("start", "b") not in log
+
+    def test_token_budget(self):
+        """Test the tokens-per-minute bucket."""
+        now = [0.0]
+        bucket = TokenBucket(600, clock=lambda: now[0])
+
+        assert bucket.wait_time(600) == 0
+        bucket.take(600)
+        assert bucket.wait_time(100) == pytest.approx(10.0)
+        now[0] += 10
+        assert bucket.wait_time(100) == 0
+        assert TokenBucket(0).wait_time(10**9) == 0
+
+    def test_token_budget_delays_admission(self):
+        """Test that calls beyond the budget wait for refill."""
+        scheduler = LLMScheduler(max_concurrency=4, tokens_per_minute=6000)
+        log = []
+
+        async def run():
+            started = time.monotonic()
+            await _call(scheduler, "a", log, tokens=6000)
+            await _call(scheduler, "b", log, tokens=10)
+            return time.monotonic() - started
+
+        assert asyncio.run(run()) >= 0.09
+
+
+class TestChatScheduling:
+    """Test cases for chat turns going through the scheduler."""
+
+    def test_concurrent_turns_of_a_session(self, monkeypatch):
+        """Test that concurrent messages of a session keep user/assistant alternation."""
+        def create(**params):
+            time.sleep(0.02)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=params["messages"][-1]["content"]))],
+                usage=None,
+            )
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        monkeypatch.setattr(cb, "_get_azure_client", lambda: client)
+        session_id = cb.create_session()
+
+        async def run():
+            await asyncio.gather(*(
+                cb.process_chat_message(ChatRequest(message=f"question {index}", session_id=session_id))
+                for index in range(3)
+            ))
+
+        asyncio.run(run())
+
+        messages = cb.get_session(session_id).messages
+        assert [msg.role for msg in messages] == ["user", "assistant"] * 3
+        for question, answer in zip(messages[::2], messages[1::2]):
+            assert answer.content == question.content
+            assert answer.metadata["source"] == "azure"
+
+    def test_timed_out_turn_not_recorded(self, monkeypatch):
+        """Test that a turn refused by the scheduler answers without touching the session."""
+        monkeypatch.setattr(cb, "_get_azure_client", lambda: object())
+        monkeypatch.setattr(cb, "llm_scheduler", LLMScheduler(max_concurrency=1, queue_timeout=0.01))
+        session_id = cb.create_session()
+
+        async def run():
+            async with cb.llm_scheduler.slot("other"):
+                return await cb.process_chat_message(ChatRequest(message="question", session_id=session_id))
+
+        response = asyncio.run(run())
+
+        assert response.message.metadata["source"] == "fallback"
+        assert cb.get_session(session_id).messages == []
+
+    def test_estimate_counts_context(self):
+        """Test that the token estimate includes the financial context of the prompt."""
+        session = cb.get_session(cb.create_session())
+        context = {"accounts": [{"account": f"Compte {index}", "balance": 1000.0 * index} for index in range(50)]}
+
+        assert cb._estimate_tokens(session, "question", context) > cb._estimate_tokens(session, "question")
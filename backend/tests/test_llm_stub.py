@@ -0,0 +1,93 @@
+"""Tests for the OpenAI-compatible stub server and the chat load test."""
+
+import asyncio
+import json
+
+import httpx
+from fastapi.testclient import TestClient
+
+from benchmarks.chat_load import in_process_backend, percentile, run_load
+from benchmarks.llm_stub import StubConfig, create_stub_app, serve_stub
+
+
+FAST = StubConfig(first_token_ms=0, tokens_per_second=0, completion_tokens=5)
+AZURE_PATH = "/openai/deployments/gpt41/chat/completions?api-version=2024-12-01-preview"
+MESSAGES = {"messages": [{"role": "user", "content": "Bonjour"}]}
+
+
+class TestLLMStub:
+    """Test cases for the chat-completions stub."""
+
+    def test_completion(self):
+        """Test a non-streaming completion with usage."""
+        stub = TestClient(create_stub_app(FAST))
+
+        body = stub.post(AZURE_PATH, json=MESSAGES).json()
+
+        assert body["object"] == "chat.completion"
+        assert body["model"] == "gpt41"
+        assert body["choices"][0]["message"]["content"]
+        assert body["usage"]["completion_tokens"] == 5
+
+    def test_streaming(self):
+        """Test server-sent chunks ending with [DONE]."""
+        stub = TestClient(create_stub_app(FAST))
+
+        response = stub.post(
+            "/v1/chat/completions",
+            json={**MESSAGES, "stream": True, "stream_options": {"include_usage": True}},
+        )
+        events = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert events[-1] == "[DONE]"
+        chunks = [json.loads(event) for event in events[:-1]]
+        content = "".join(chunk["choices"][0]["delta"].get("content", "") for chunk in chunks if chunk["choices"])
+        assert len(content.split()) == 5
+        assert chunks[-1]["usage"]["completion_tokens"] == 5
+
+    def test_rate_limits_and_errors(self):
+        """Test 429 responses with Retry-After, and 500 errors."""
+        limited = TestClient(create_stub_app(StubConfig(rate_limit_rate=1.0, retry_after_seconds=2)))
+        failing = TestClient(create_stub_app(StubConfig(error_rate=1.0)))
+
+        response = limited.post(AZURE_PATH, json=MESSAGES)
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "2"
+        assert failing.post(AZURE_PATH, json=MESSAGES).status_code == 500
+        assert limited.get("/stats").json()["counts"]["rate_limited"] == 1
+
+
+class TestChatLoad:
+    """Test cases for the chat load test."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        samples = [float(value) for value in range(1, 101)]
+
+        assert percentile(samples, 50) == 50.0
+        assert percentile(samples, 99) == 99.0
+        assert percentile([], 50) == 0.0
+
+    def test_chat_goes_through_stub(self):
+        """Test that POST /chat reaches the stub through the Azure client."""
+        with serve_stub(FAST) as stub, in_process_backend(stub.base_url) as app:
+            response = TestClient(app).post("/api/v1/chat", json={"message": "Bonjour"})
+
+            assert response.status_code == 200
+            assert response.json()["message"]["metadata"]["source"] == "azure"
+            assert stub.stats.snapshot()["ok"] == 1
+
+    def test_run_load(self):
+        """Test the load report of concurrent sessions."""
+        async def drive(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://backend") as client:
+                return await run_load(client, sessions=3, turns=2, concurrency=3)
+
+        with serve_stub(FAST) as stub, in_process_backend(stub.base_url) as app:
+            report = asyncio.run(drive(app))
+
+        assert report["requests"] == report["ok"] == 6
+        assert report["sources"] == {"azure": 6}
+        assert set(report["latency_ms"]) >= {"p50", "p99"}
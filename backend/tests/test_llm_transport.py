@@ -0,0 +1,185 @@
+"""Tests for the LLM transport: retries, deadlines and circuit breaker."""
+
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from app.services import chatbot as cb
+from app.services.llm_transport import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    LLMTransport,
+    retry_after_seconds,
+)
+
+
+REQUEST = httpx.Request("POST", "http://llm.test/chat/completions")
+COMPLETION = SimpleNamespace(
+    choices=[SimpleNamespace(message=SimpleNamespace(content="Bonjour"))],
+    usage=SimpleNamespace(prompt_tokens=10, completion_tokens=2),
+)
+
+
+def rate_limited(headers=None) -> openai.RateLimitError:
+    response = httpx.Response(429, headers=headers or {}, request=REQUEST)
+    return openai.RateLimitError("Rate limit is exceeded", response=response, body=None)
+
+
+def server_error() -> openai.InternalServerError:
+    response = httpx.Response(500, request=REQUEST)
+    return openai.InternalServerError("Server error", response=response, body=None)
+
+
+class FakeClock:
+    """Monotonic clock advanced by the transport's sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeClient:
+    """Client raising the queued outcomes, then returning a completion."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **params):
+        self.calls.append(params)
+        if self.outcomes:
+            outcome = self.outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+        return COMPLETION
+
+
+def transport(clock: FakeClock, **options) -> LLMTransport:
+    breaker = CircuitBreaker("test", failure_threshold=options.pop("failure_threshold", 2),
+                             reset_timeout=10, clock=clock)
+    return LLMTransport(breaker=breaker, clock=clock, sleep=clock.sleep, **options)
+
+
+class TestRetries:
+    """Test cases for retries and deadlines."""
+
+    def test_retry_after_honored(self):
+        """Test that Retry-After sets the backoff before a retry."""
+        clock = FakeClock()
+        client = FakeClient(rate_limited({"retry-after": "2"}))
+
+        assert transport(clock).complete(client, model="m") is COMPLETION
+        assert clock.sleeps == [2.0]
+        assert len(client.calls) == 2
+
+    def test_jittered_backoff(self):
+        """Test full-jitter delays under an exponentially growing cap."""
+        clock = FakeClock()
+        client = FakeClient(server_error(), server_error())
+
+        transport(clock, max_retries=2, base_delay=1.0).complete(client, model="m")
+
+        assert 0 <= clock.sleeps[0] <= 1.0
+        assert 0 <= clock.sleeps[1] <= 2.0
+
+    def test_attempts_share_the_deadline(self):
+        """Test that each attempt's timeout is the remaining budget."""
+        clock = FakeClock()
+        client = FakeClient(rate_limited({"retry-after": "3"}))
+
+        transport(clock, deadline=10).complete(client, model="m")
+
+        assert [call["timeout"] for call in client.calls] == [10, 7]
+
+    def test_deadline_exceeded(self):
+        """Test that no retry is made when its backoff exceeds the budget."""
+        clock = FakeClock()
+        client = FakeClient(rate_limited({"retry-after": "30"}))
+
+        with pytest.raises(DeadlineExceeded):
+            transport(clock, deadline=5).complete(client, model="m")
+        assert clock.sleeps == []
+
+    def test_client_errors_not_retried(self):
+        """Test that 4xx errors other than 429 fail at once."""
+        clock = FakeClock()
+        response = httpx.Response(400, request=REQUEST)
+        client = FakeClient(openai.BadRequestError("Bad request", response=response, body=None))
+        llm = transport(clock)
+
+        with pytest.raises(openai.BadRequestError):
+            llm.complete(client, model="m")
+        assert len(client.calls) == 1
+        assert llm.breaker.state == CLOSED
+
+    def test_retry_after_formats(self):
+        """Test Retry-After in seconds and milliseconds."""
+        assert retry_after_seconds(rate_limited({"retry-after": "1.5"})) == 1.5
+        assert retry_after_seconds(rate_limited({"retry-after-ms": "250"})) == 0.25
+        assert retry_after_seconds(rate_limited()) is None
+
+
+class TestCircuitBreaker:
+    """Test cases for the breaker states."""
+
+    def test_opens_then_probes(self):
+        """Test open, half-open probe and close cycle."""
+        clock = FakeClock()
+        llm = transport(clock, max_retries=0)
+
+        for _ in range(2):
+            with pytest.raises(openai.InternalServerError):
+                llm.complete(FakeClient(server_error()), model="m")
+        assert llm.breaker.state == OPEN
+
+        client = FakeClient()
+        with pytest.raises(CircuitOpenError):
+            llm.complete(client, model="m")
+        assert client.calls == []
+
+        clock.now += 10
+        assert llm.breaker.state == HALF_OPEN
+        assert llm.breaker.allow() is True
+        assert llm.breaker.allow() is False
+        llm.breaker.record_success()
+        assert llm.breaker.state == CLOSED
+
+    def test_failed_probe_reopens(self):
+        """Test that a failing half-open probe reopens the breaker."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+
+        assert breaker.allow() is True
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert breaker.allow() is False
+
+    def test_chatbot_falls_back_when_open(self, monkeypatch):
+        """Test that an open breaker answers from the fallback without calling the model."""
+        client = FakeClient()
+        monkeypatch.setattr(cb, "_get_azure_client", lambda: client)
+        monkeypatch.setattr(cb, "llm_transport", transport(FakeClock(), failure_threshold=1))
+        cb.llm_transport.breaker.record_failure()
+
+        text, source = cb.generate_ai_response("Bonjour", cb.create_session())
+
+        assert source == "fallback"
+        assert text.startswith("Bonjour")
+        assert client.calls == []
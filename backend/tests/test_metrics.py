@@ -0,0 +1,104 @@
+"""Tests for the metrics registry and /metrics endpoint."""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import chatbot as cb
+from app.services.metrics import MetricsRegistry, http_cache_requests, llm_tokens, query_rows_scanned
+
+
+class TestMetricsRegistry:
+    """Test cases for metric types and text rendering."""
+
+    def test_counter_and_gauge(self):
+        """Test counter and gauge samples."""
+        registry = MetricsRegistry()
+        requests = registry.counter("test_requests_total", "Requests.", ("route",))
+        in_flight = registry.gauge("test_in_flight", "In flight.")
+
+        requests.inc(route="/a")
+        requests.inc(2, route="/a")
+        in_flight.inc()
+        in_flight.dec()
+
+        text = registry.render()
+        assert "# TYPE test_requests_total counter" in text
+        assert 'test_requests_total{route="/a"} 3' in text
+        assert "test_in_flight 0" in text
+        with pytest.raises(ValueError):
+            requests.inc(-1, route="/a")
+        with pytest.raises(ValueError):
+            requests.inc(route="/a", status="200")
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram bucket, sum and count samples."""
+        registry = MetricsRegistry()
+        latency = registry.histogram("test_seconds", "Latency.", buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.5, 5.0):
+            latency.observe(value)
+
+        text = registry.render()
+        assert 'test_seconds_bucket{le="0.1"} 1' in text
+        assert 'test_seconds_bucket{le="1"} 2' in text
+        assert 'test_seconds_bucket{le="+Inf"} 3' in text
+        assert "test_seconds_sum 5.55" in text
+        assert "test_seconds_count 3" in text
+
+    def test_label_values_are_escaped(self):
+        """Test escaping of quotes and backslashes."""
+        registry = MetricsRegistry()
+        registry.counter("test_escape_total", "Escape.", ("value",)).inc(value='a"b\\c')
+
+        assert 'test_escape_total{value="a\\"b\\\\c"} 1' in registry.render()
+
+
+class TestMetricsEndpoint:
+    """Test cases for HTTP and domain metrics."""
+
+    def test_route_metrics(self, client: TestClient, mock_accounts_single_day):
+        """Test per-route request, latency and size metrics."""
+        client.get("/api/v1/chat/history/sess_unknown")
+        client.get("/api/v1/bank-account-balances?date=2026-01-15")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        text = response.text
+        assert 'http_requests_total{method="GET",route="/api/v1/chat/history/{session_id}",status="404"}' in text
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/bank-account-balances",le="+Inf"}' in text
+        assert "http_response_size_bytes_count" in text
+        assert 'http_requests_in_flight{method="GET"} 1' in text
+        assert 'query_cache_misses_total{cache="bank-account-balances"}' in text
+
+    def test_rows_scanned_and_cache_hits(self, client: TestClient, mock_transactions_sample):
+        """Test domain counters for transaction queries and HTTP cache hits."""
+        url = "/api/v1/bank-transactions?from_date=2026-01-01&to_date=2026-01-31"
+        scanned = query_rows_scanned.value(query="bank-transactions")
+        hits = http_cache_requests.value(result="hit")
+
+        client.get(url)
+        client.get(url)
+
+        assert query_rows_scanned.value(query="bank-transactions") == scanned + len(mock_transactions_sample)
+        assert http_cache_requests.value(result="hit") == hits + 1
+
+    def test_llm_latency_and_tokens(self, monkeypatch):
+        """Test LLM metrics recorded around completion calls."""
+        completion = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="Bonjour"))],
+            usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30),
+        )
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: completion)))
+        monkeypatch.setattr(cb, "_get_azure_client", lambda: client)
+        monkeypatch.setenv("MODEL_NAME", "test-model")
+        before = llm_tokens.value(model="test-model", kind="prompt")
+
+        text, source = cb.generate_ai_response("Bonjour", cb.create_session())
+
+        assert (text, source) == ("Bonjour", "azure")
+        assert llm_tokens.value(model="test-model", kind="prompt") == before + 120
+        assert 'llm_request_duration_seconds_count{model="test-model",outcome="success"}' in cb.llm_request_duration.render()
@@ -0,0 +1,107 @@
+"""Tests for the IBAN filters and the per-IBAN partitions behind them."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.dates import date_ordinal
+from app.models.transaction import Transaction
+from app.routes import accounts, analytics, transactions
+from app.services.partitions import IbanPartitions
+from tests.fixtures import MOCK_ACCOUNTS_TIMELINE_30_DAYS, MOCK_TRANSACTIONS_ENRICHED
+
+
+MAIN = "FR7612345678901234567890123"
+SAVINGS = "FR7698765432109876543210987"
+GBP = "GB1234567890123456789012"
+
+
+@pytest.fixture
+def loaded_stores():
+    transactions.set_mock_transactions(MOCK_TRANSACTIONS_ENRICHED)
+    analytics.set_mock_enriched_transactions(MOCK_TRANSACTIONS_ENRICHED)
+    accounts.set_mock_accounts(MOCK_ACCOUNTS_TIMELINE_30_DAYS)
+    yield
+    transactions.set_mock_transactions([])
+    analytics.set_mock_enriched_transactions([])
+    accounts.set_mock_accounts([])
+
+
+def _by_date(rows, field):
+    return sorted(rows, key=lambda row: row[field])
+
+
+class TestIbanPartitions:
+    """Test cases for the partition index."""
+
+    def test_merges_partitions_by_date(self):
+        """Test that runs of several IBANs come out in date, then store, order."""
+        rows = [Transaction(**trans) for trans in MOCK_TRANSACTIONS_ENRICHED]
+        partitions = IbanPartitions(rows, "operation_date")
+        start, end = date_ordinal("2025-12-01"), date_ordinal("2026-01-31")
+
+        selected = partitions.positions([GBP, MAIN], start, end)
+        expected = sorted(
+            (position for position, row in enumerate(rows)
+             if row.iban in (MAIN, GBP) and start <= row.operation_ordinal <= end),
+            key=lambda position: (rows[position].operation_ordinal, position),
+        )
+
+        assert selected == expected
+        assert partitions.positions([MAIN, MAIN], start, end) == partitions.positions([MAIN], start, end)
+        assert partitions.positions(["XX00"], start, end) == []
+        assert set(partitions.ibans) == {row.iban for row in rows}
+
+
+class TestIbanFilters:
+    """Test cases for the iban query parameter of the endpoints."""
+
+    def test_transactions(self, client: TestClient, loaded_stores):
+        """Test that filtered transactions are the matching rows, by date."""
+        url = "/api/v1/bank-transactions?from_date=2025-12-01&to_date=2026-01-31"
+        everything = client.get(url).json()
+        response = client.get(f"{url}&iban={MAIN}&iban={SAVINGS}")
+
+        assert response.status_code == 200
+        expected = [t for t in everything if t["iban"] in (MAIN, SAVINGS)]
+        assert response.json() == _by_date(expected, "operation_date")
+        assert {t["iban"] for t in response.json()} == {MAIN, SAVINGS}
+
+    def test_enriched_transactions(self, client: TestClient, loaded_stores):
+        """Test the filter combined with the other enriched filters."""
+        url = "/api/v1/transactions/enriched?from_date=2025-12-01&to_date=2026-01-31&is_debit=true"
+        everything = client.get(url).json()
+        filtered = client.get(f"{url}&iban={MAIN}").json()
+
+        assert filtered
+        assert filtered == _by_date([t for t in everything if t["iban"] == MAIN], "operation_date")
+
+    def test_trends(self, client: TestClient, loaded_stores):
+        """Test that trends cover the selected accounts only."""
+        url = "/api/v1/transactions/trends?from_date=2025-12-01&to_date=2026-01-31"
+        main_only = client.get(f"{url}&iban={MAIN}").json()
+        rows = client.get(f"/api/v1/transactions/enriched?from_date=2025-12-01&to_date=2026-01-31&iban={MAIN}").json()
+
+        assert main_only["transaction_count"] == len(rows)
+        assert main_only["transaction_count"] < client.get(url).json()["transaction_count"]
+
+    @pytest.mark.parametrize("query", [
+        "date=2026-01-15",
+        "date=2026-01-17&as_of=true",
+        "start_date=2026-01-01&end_date=2026-01-31",
+    ])
+    def test_balances(self, client: TestClient, loaded_stores, query):
+        """Test the filter in the single date, as-of and range modes."""
+        everything = client.get(f"/api/v1/bank-account-balances?{query}").json()
+        response = client.get(f"/api/v1/bank-account-balances?{query}&iban={GBP}&iban={MAIN}")
+
+        assert response.status_code == 200
+        expected = [acc for acc in everything if acc["iban"] in (MAIN, GBP)]
+        assert response.json() == _by_date(expected, "date")
+        assert response.json()
+
+    def test_unknown_iban(self, client: TestClient, loaded_stores):
+        """Test that an unknown IBAN matches nothing."""
+        response = client.get("/api/v1/bank-transactions?from_date=2025-12-01&to_date=2026-01-31&iban=XX00")
+
+        assert response.status_code == 200
+        assert response.json() == []
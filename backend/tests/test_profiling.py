@@ -0,0 +1,115 @@
+"""Tests for Server-Timing phases and on-demand profiling."""
+
+import marshal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.profiling import phase_timings, server_timing_header, set_profiling_enabled, span, start_phase_timing
+
+
+@pytest.fixture
+def profiling_on():
+    """Enable on-demand profiling for one test."""
+    set_profiling_enabled(True)
+    yield
+    set_profiling_enabled(False)
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    """Configure an admin token and return the headers carrying it."""
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    return {"X-Admin-Token": "secret"}
+
+
+class TestPhaseTimers:
+    """Test cases for span timers."""
+
+    def test_spans_accumulate(self):
+        """Test that repeated phases add up in the current context."""
+        start_phase_timing()
+        with span("store"):
+            pass
+        with span("store"):
+            pass
+        with span("aggregate"):
+            pass
+
+        assert set(phase_timings()) == {"store", "aggregate"}
+
+    def test_header_format(self):
+        """Test the Server-Timing header value."""
+        assert server_timing_header({"store": 0.0012, "total": 0.5}) == "store;dur=1.20, total;dur=500.00"
+
+    def test_server_timing_on_responses(self, client: TestClient, mock_enriched_transactions):
+        """Test that endpoint phases are reported on every response."""
+        response = client.get(
+            "/api/v1/transactions/enriched?from_date=2025-12-01&to_date=2026-01-31&is_debit=true"
+        )
+
+        timing = response.headers["server-timing"]
+        assert "store;dur=" in timing
+        assert "filter;dur=" in timing
+        assert "serialize;dur=" in timing
+        assert "total;dur=" in timing
+
+
+class TestOnDemandProfiling:
+    """Test cases for X-Profile requests."""
+
+    URL = "/api/v1/transactions/enriched?from_date=2025-12-01&to_date=2026-01-31"
+
+    def test_disabled_by_default(self, client: TestClient, mock_enriched_transactions):
+        """Test that the header is ignored unless profiling is enabled."""
+        response = client.get(self.URL, headers={"X-Profile": "1"})
+
+        assert "x-profile-id" not in response.headers
+
+    def test_profile_artifact(self, client: TestClient, mock_enriched_transactions, profiling_on, admin):
+        """Test that a profiled request stores a readable artifact."""
+        client.get(self.URL)
+        response = client.get(self.URL, headers={"X-Profile": "1"})
+
+        assert response.status_code == 200
+        assert "x-cache" not in response.headers
+        assert "store;dur=" in response.headers["server-timing"]
+        profile_id = response.headers["x-profile-id"]
+
+        listing = client.get("/debug/profiles", headers=admin).json()
+        assert listing["enabled"] is True
+        assert listing["profiles"][0]["profile_id"] == profile_id
+        assert listing["profiles"][0]["path"] == "/api/v1/transactions/enriched"
+
+        report = client.get(f"/debug/profiles/{profile_id}?sort=tottime&limit=10", headers=admin)
+        assert report.status_code == 200
+        assert "function calls" in report.text
+
+        raw = client.get(f"/debug/profiles/{profile_id}?format=pstats", headers=admin)
+        assert isinstance(marshal.loads(raw.content), dict)
+
+    def test_unknown_profile(self, client: TestClient, admin):
+        """Test 404 for unknown profile ids."""
+        response = client.get("/debug/profiles/prof_missing", headers=admin)
+
+        assert response.status_code == 404
+
+    def test_admin_toggle(self, client: TestClient, mock_enriched_transactions, admin):
+        """Test that an admin switches profiling on and off at runtime."""
+        response = client.put("/debug/profiling?enabled=true", headers=admin)
+        profiled = client.get(self.URL, headers={"X-Profile": "1"})
+        client.put("/debug/profiling?enabled=false", headers=admin)
+
+        assert response.json() == {"enabled": True}
+        assert "x-profile-id" in profiled.headers
+        assert "x-profile-id" not in client.get(self.URL, headers={"X-Profile": "1"}).headers
+
+    def test_admin_token_required(self, client: TestClient, monkeypatch):
+        """Test that the debug endpoints reject requests without the admin token."""
+        monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+        assert client.get("/debug/profiles").status_code == 403
+
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        assert client.get("/debug/profiles").status_code == 401
+        assert client.get("/debug/profiles/prof_missing", headers={"X-Admin-Token": "wrong"}).status_code == 401
+        assert client.put("/debug/profiling?enabled=true").status_code == 401
@@ -0,0 +1,115 @@
+"""Tests for the query-result cache."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.routes import accounts
+from app.routes.accounts import query_account_balances
+from app.services.data_version import bump_data_version
+from app.services.query_cache import QueryCache, cached_query, canonicalize
+from tests.fixtures.mock_accounts import MOCK_ACCOUNTS_SINGLE_DAY
+
+
+class TestQueryCache:
+    """Test cases for memoized queries."""
+
+    def test_positional_and_keyword_calls_share_entries(self):
+        """Test that keys are built from bound arguments with defaults."""
+        calls = []
+
+        @cached_query("test/shared-keys")
+        def query(start, end=None, tags=None):
+            calls.append((start, end, tags))
+            return len(calls)
+
+        assert query("2026-01-01") == 1
+        assert query(start="2026-01-01", end=None) == 1
+        assert query("2026-01-01", tags=["a", "b"]) == 2
+        assert query("2026-01-01", tags=("a", "b")) == 2
+        assert len(calls) == 2
+        assert query.cache.stats()["hits"] == 2
+
+    def test_data_version_invalidates(self):
+        """Test that bumping the data version drops cached results."""
+        calls = []
+
+        @cached_query("test/version")
+        def query(value):
+            calls.append(value)
+            return value
+
+        query(1)
+        bump_data_version()
+        query(1)
+
+        assert calls == [1, 1]
+
+    def test_lru_and_ttl_eviction(self):
+        """Test eviction by entry count and by age."""
+        cache = QueryCache("test/eviction", max_entries=2, ttl_seconds=60)
+        cache.put("a", 1, "A")
+        cache.put("b", 1, "B")
+        cache.get("a", 1)
+        cache.put("c", 1, "C")
+
+        assert cache.get("b", 1) != "B"
+        assert cache.get("a", 1) == "A"
+
+        expired = QueryCache("test/ttl", ttl_seconds=0)
+        expired.put("a", 1, "A")
+        assert expired.get("a", 1) != "A"
+
+    def test_async_functions(self):
+        """Test memoizing coroutine functions."""
+        calls = []
+
+        @cached_query("test/async")
+        async def query(value):
+            calls.append(value)
+            return value * 2
+
+        assert asyncio.run(query(3)) == 6
+        assert asyncio.run(query(3)) == 6
+        assert calls == [3]
+
+    def test_exceptions_are_not_cached(self):
+        """Test that failed queries are recomputed."""
+        calls = []
+
+        @cached_query("test/errors")
+        def query():
+            calls.append(1)
+            raise ValueError("boom")
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                query()
+        assert len(calls) == 2
+
+    def test_canonicalize(self):
+        """Test canonical forms of container parameters."""
+        assert canonicalize({"b": [1], "a": 2}) == (("a", 2), ("b", (1,)))
+        assert canonicalize({"y", "x"}) == ("x", "y")
+
+    def test_in_process_callers_hit_cache(self, mock_accounts_single_day):
+        """Test that helper calls outside HTTP are memoized."""
+        first = query_account_balances(date="2026-01-15")
+        second = query_account_balances("2026-01-15")
+
+        assert second is first
+
+        accounts.set_mock_accounts(MOCK_ACCOUNTS_SINGLE_DAY[:1])
+        assert len(query_account_balances(date="2026-01-15")) == 1
+
+    def test_stats_endpoint(self, client: TestClient, mock_accounts_single_day):
+        """Test the per-route statistics endpoint."""
+        client.get("/api/v1/balance-summary?date=2026-01-15&currency=USD")
+
+        response = client.get("/cache/stats")
+
+        assert response.status_code == 200
+        stats = response.json()["query_caches"]
+        assert stats["balance-summary"]["misses"] >= 1
+        assert {"hits", "misses", "hit_rate", "size"} <= set(stats["bank-account-balances"])
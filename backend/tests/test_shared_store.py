@@ -0,0 +1,166 @@
+"""Tests for the memory-mapped stores shared by worker processes."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.models.transaction import Transaction
+from app.routes import accounts, analytics, transactions
+from app.services.shared_store import SharedRows, share_rows
+from tests.fixtures import MOCK_ACCOUNTS_TIMELINE_30_DAYS, MOCK_TRANSACTIONS_ENRICHED
+
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+URLS = [
+    "/api/v1/bank-account-balances?date=2026-01-15",
+    "/api/v1/bank-account-balances?start_date=2026-01-10&end_date=2026-01-20",
+    "/api/v1/bank-account-balances?date=2026-01-15&as_of=true",
+    "/api/v1/bank-transactions?from_date=2025-12-10&to_date=2026-01-10",
+    "/api/v1/transactions/enriched?from_date=2025-12-01&to_date=2026-01-31&is_debit=true",
+    "/api/v1/transactions/trends?from_date=2025-12-01&to_date=2026-01-31",
+    "/api/v1/balance-summary?date=2026-01-15",
+]
+
+
+def _load():
+    transactions.set_mock_transactions(MOCK_TRANSACTIONS_ENRICHED)
+    analytics.set_mock_enriched_transactions(MOCK_TRANSACTIONS_ENRICHED)
+    accounts.set_mock_accounts(MOCK_ACCOUNTS_TIMELINE_30_DAYS)
+
+
+def _unload():
+    transactions.set_mock_transactions([])
+    analytics.set_mock_enriched_transactions([])
+    accounts.set_mock_accounts([])
+
+
+@pytest.fixture
+def shared_dir(tmp_path, monkeypatch):
+    """Enable shared stores in a temporary directory."""
+    monkeypatch.setenv("SHARED_STORE_DIR", str(tmp_path))
+    yield tmp_path
+    monkeypatch.delenv("SHARED_STORE_DIR")
+    _unload()
+
+
+class TestSharedRows:
+    """Test cases for the list-like store facade."""
+
+    def test_shared_rows_behave_like_a_list(self, shared_dir):
+        """Test length, indexing, iteration and appended rows."""
+        rows = share_rows("transactions-test", MOCK_TRANSACTIONS_ENRICHED, Transaction)
+        expected = [Transaction(**trans) for trans in MOCK_TRANSACTIONS_ENRICHED]
+
+        assert isinstance(rows, SharedRows)
+        assert len(rows) == len(expected)
+        assert list(rows) == expected
+        assert rows[-1] == expected[-1]
+        assert rows[2:4] == expected[2:4]
+
+        rows.extend(expected[:1])
+        assert len(rows) == len(expected) + 1
+        assert rows.equal("operation_date", expected[0].operation_date)[-1] == expected[0]
+
+
+class TestSharedStores:
+    """Test cases for the route stores in shared mode."""
+
+    def test_same_responses_as_in_memory(self, client: TestClient, shared_dir, monkeypatch):
+        """Test that every query answers the same from shared segments."""
+        _load()
+        assert isinstance(transactions._mock_transactions, SharedRows)
+        shared = {url: client.get(url).json() for url in URLS}
+
+        monkeypatch.delenv("SHARED_STORE_DIR")
+        _load()
+        assert isinstance(transactions._mock_transactions, list)
+        in_memory = {url: client.get(url).json() for url in URLS}
+        monkeypatch.setenv("SHARED_STORE_DIR", str(shared_dir))
+
+        assert shared == in_memory
+
+    def test_segment_built_once(self, shared_dir):
+        """Test that loading the same data attaches to the existing segment."""
+        _load()
+        segments = sorted(shared_dir.glob("*.seg"))
+        stamps = [path.stat().st_mtime_ns for path in segments]
+        _load()
+
+        assert len(segments) == 3
+        assert [path.stat().st_mtime_ns for path in sorted(shared_dir.glob("*.seg"))] == stamps
+        assert isinstance(analytics._mock_enriched_transactions, SharedRows)
+
+    def test_posted_balances_rejected(self, client: TestClient, shared_dir):
+        """Test that shared stores are read-only, so every worker serves the same data."""
+        _load()
+        latest = max(MOCK_ACCOUNTS_TIMELINE_30_DAYS, key=lambda acc: acc["date"])
+        response = client.post("/api/v1/bank-account-balances", json=[{**latest, "date": "2027-03-01"}])
+
+        assert response.status_code == 409
+        assert len(accounts._mock_accounts) == len(MOCK_ACCOUNTS_TIMELINE_30_DAYS)
+
+    def test_startup_maps_one_snapshot(self, shared_dir, monkeypatch):
+        """Test that workers map the data snapshot built by the first of them."""
+        monkeypatch.setattr(main, "DATA_SNAPSHOT_PATH", None)
+        with TestClient(main.app):
+            assert isinstance(accounts._mock_accounts, SharedRows)
+        path = shared_dir / "data.snap"
+        stamp = path.stat().st_mtime_ns
+
+        def rebuild():
+            raise AssertionError("fixtures loaded again")
+
+        monkeypatch.setattr(main, "_load_fixtures", rebuild)
+        with TestClient(main.app):
+            assert isinstance(analytics._mock_enriched_transactions, SharedRows)
+        assert path.stat().st_mtime_ns == stamp
+        assert not list(shared_dir.glob("*.seg"))
+
+    def test_new_data_replaces_segment(self, shared_dir):
+        """Test that different data builds a new segment and drops the old one."""
+        share_rows("transactions-test", MOCK_TRANSACTIONS_ENRICHED[:10], Transaction)
+        first = share_rows("transactions", MOCK_TRANSACTIONS_ENRICHED[:10], Transaction)
+        first_paths = set(shared_dir.glob("*.seg"))
+        share_rows("transactions", MOCK_TRANSACTIONS_ENRICHED[:20], Transaction)
+        second_paths = set(shared_dir.glob("*.seg"))
+
+        # Only the segment of the same store is replaced, not one sharing its prefix
+        assert len(first_paths) == len(second_paths) == 2
+        assert len(first_paths & second_paths) == 1
+        assert len(list(shared_dir.glob("transactions-test-*.seg"))) == 1
+        # The old mapping stays readable after its file is removed
+        assert len(list(first)) == 10
+
+    def test_corrupt_segment_is_rebuilt(self, shared_dir):
+        """Test that a segment failing its checksum is written again."""
+        share_rows("transactions", MOCK_TRANSACTIONS_ENRICHED, Transaction)
+        path, = shared_dir.glob("transactions-*.seg")
+        data = bytearray(path.read_bytes())
+        data[-1] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        rows = share_rows("transactions", MOCK_TRANSACTIONS_ENRICHED, Transaction)
+
+        assert list(rows) == [Transaction(**trans) for trans in MOCK_TRANSACTIONS_ENRICHED]
+
+    def test_other_process_attaches(self, shared_dir):
+        """Test that another worker process reads the same segment."""
+        share_rows("transactions", MOCK_TRANSACTIONS_ENRICHED, Transaction)
+        path, = shared_dir.glob("transactions-*.seg")
+        script = (
+            "from app.models.transaction import Transaction;"
+            "from app.services.shared_store import SharedRows;"
+            "from app.services.snapshot import load_snapshot;"
+            f"rows = SharedRows(load_snapshot(r'{path}').table('transactions'), Transaction);"
+            "print(len(rows), rows[0].iban)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=BACKEND, capture_output=True, text=True, check=True
+        ).stdout.split()
+
+        assert output == [str(len(MOCK_TRANSACTIONS_ENRICHED)), MOCK_TRANSACTIONS_ENRICHED[0]["iban"]]
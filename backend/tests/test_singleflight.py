@@ -0,0 +1,141 @@
+"""Tests for single-flight coalescing of identical concurrent queries."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from app.main import app
+from app.routes import analytics
+from app.services.query_cache import cached_query
+from app.services.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for the coalescing layer."""
+
+    def test_threads_share_one_execution(self):
+        """Test that concurrent callers of a key get one computation's result."""
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(1)
+            return object()
+
+        with ThreadPoolExecutor(8) as pool:
+            futures = [pool.submit(flight.do, "key", compute) for _ in range(8)]
+            while flight.coalesced < 7:
+                time.sleep(0.001)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == {"executions": 1, "coalesced": 7, "in_flight": 0}
+
+    def test_errors_reach_every_caller(self):
+        """Test that followers get the leader's exception, and the key is retried afterwards."""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fail():
+            release.wait(1)
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(3) as pool:
+            futures = [pool.submit(flight.do, "key", fail) for _ in range(3)]
+            while flight.coalesced < 2:
+                time.sleep(0.001)
+            release.set()
+            for future in futures:
+                with pytest.raises(ValueError):
+                    future.result()
+
+        assert flight.do("key", lambda: 42) == 42
+
+    def test_coroutines_share_one_execution(self):
+        """Test coalescing of coroutines on one event loop."""
+        flight = SingleFlight()
+        calls = []
+
+        async def compute(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value * 2
+
+        async def run():
+            return await asyncio.gather(*(flight.do_async("key", compute, 21) for _ in range(5)))
+
+        assert asyncio.run(run()) == [42] * 5
+        assert calls == [21]
+
+    def test_cached_query_coalesces_misses(self):
+        """Test that concurrent cache misses of the same parameters compute once."""
+        calls = []
+
+        @cached_query("test-singleflight")
+        def query(value):
+            calls.append(value)
+            time.sleep(0.05)
+            return [value]
+
+        with ThreadPoolExecutor(6) as pool:
+            results = list(pool.map(lambda _: query(7), range(6)))
+
+        assert calls == [7]
+        assert all(result is results[0] for result in results)
+        assert query.cache.stats()["coalesced"] == 5
+
+    def test_concurrent_identical_requests(self, mock_accounts_range, monkeypatch):
+        """Test that a burst of identical /balance-summary requests computes once."""
+        calls = []
+        compute = analytics.calculate_balance_summary
+
+        def slow_summary(*args, **kwargs):
+            calls.append(1)
+            time.sleep(0.05)
+            return compute(*args, **kwargs)
+
+        monkeypatch.setattr(analytics, "calculate_balance_summary", slow_summary)
+        coalesced = analytics.query_balance_summary.cache.flight.coalesced
+
+        async def burst():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*(
+                    client.get("/api/v1/balance-summary?date=2026-01-15") for _ in range(10)
+                ))
+
+        responses = asyncio.run(burst())
+
+        assert {response.status_code for response in responses} == {200}
+        assert len({response.text for response in responses}) == 1
+        assert len(calls) == 1
+        assert analytics.query_balance_summary.cache.flight.coalesced == coalesced + 9
+
+    def test_enriched_transactions_off_the_loop(self, mock_enriched_transactions, monkeypatch):
+        """Test that /transactions/enriched computes in the threadpool, like its siblings."""
+        threads = []
+        select = analytics.filter_transactions
+
+        def recording_filter(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return select(*args, **kwargs)
+
+        monkeypatch.setattr(analytics, "filter_transactions", recording_filter)
+
+        async def request():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.get(
+                    "/api/v1/transactions/enriched?from_date=2025-12-01&to_date=2025-12-02&is_debit=true"
+                )
+
+        assert asyncio.run(request()).status_code == 200
+        assert threads and threads[0] is not threading.main_thread()
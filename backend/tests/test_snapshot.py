@@ -0,0 +1,190 @@
+"""Tests for the binary snapshots of the data stores."""
+
+import struct
+from datetime import date
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.models.transaction import TransactionCategory
+from app.routes import accounts, analytics, transactions
+from app.services import snapshot
+from app.services.aggregates import TransactionAggregates
+from app.services.shared_store import SharedRows
+from app.services.snapshot import SnapshotError, load_snapshot, source_fingerprint, write_snapshot
+from tests.fixtures import MOCK_ACCOUNTS_TIMELINE_30_DAYS, MOCK_TRANSACTIONS_ENRICHED
+
+
+URLS = [
+    "/api/v1/bank-account-balances?date=2026-01-15",
+    "/api/v1/bank-account-balances?date=2026-01-17&as_of=true",
+    "/api/v1/bank-account-balances/series?start_date=2026-01-01&end_date=2026-01-31",
+    "/api/v1/bank-account-balances/reconstructed?date=2026-12-31&intraday=true",
+    "/api/v1/bank-transactions?from_date=2025-12-10&to_date=2026-01-10",
+    "/api/v1/transactions/enriched?from_date=2025-12-01&to_date=2026-01-31&category=salary",
+    "/api/v1/transactions/trends?from_date=2025-12-01&to_date=2026-01-31",
+    "/api/v1/transactions/trends/series?from_date=2025-12-01&to_date=2026-01-31&granularity=week&group_by=category",
+    "/api/v1/transactions/categories/breakdown?from_date=2025-12-01&to_date=2026-01-31",
+    "/api/v1/alerts",
+    "/api/v1/alerts/history?start_date=2025-12-01&end_date=2026-01-31",
+]
+
+ROWS = [
+    {"name": "a", "amount": 1.5, "count": 3, "flag": True, "tags": ["x"], "merchant": None},
+    {"name": "é", "amount": 2.0, "count": 4, "flag": False, "tags": [], "merchant": "Shop"},
+    {"name": "a", "amount": -1.0, "count": 5, "flag": True, "tags": ["x"], "merchant": None},
+]
+FIELDS = ["name", "amount", "count", "flag", "tags", "merchant"]
+
+
+@pytest.fixture
+def snapshot_file(tmp_path):
+    path = tmp_path / "data.snap"
+    write_snapshot(path, {"rows": (ROWS, FIELDS), "empty": ([], ["name"])}, source="v1", meta={"n": 3})
+    return path
+
+
+def _load_fixtures():
+    transactions.set_mock_transactions(MOCK_TRANSACTIONS_ENRICHED)
+    analytics.set_mock_enriched_transactions(MOCK_TRANSACTIONS_ENRICHED)
+    accounts.set_mock_accounts(MOCK_ACCOUNTS_TIMELINE_30_DAYS)
+    return accounts.ingest_transactions(MOCK_TRANSACTIONS_ENRICHED)
+
+
+class TestSnapshotFormat:
+    """Test cases for writing and mapping snapshot files."""
+
+    def test_round_trip(self, snapshot_file):
+        """Test fixed-width and dictionary-encoded columns."""
+        loaded = load_snapshot(snapshot_file, source="v1")
+        table = loaded.table("rows")
+
+        assert loaded.meta == {"n": 3}
+        assert table.records(np.arange(3)) == ROWS
+        assert list(table.dictionaries["name"]) == ["a", "é"]
+        assert table.columns["amount"].dtype == np.float64
+        assert table.columns["name"].dtype == np.int32
+        assert not table.columns["amount"].flags.writeable
+        assert table.between("name", "a", "a").tolist() == [0, 2]
+        assert table.equal("count", 4).tolist() == [1]
+        assert table.values("merchant") == [None, "Shop", None]
+        assert len(loaded.table("empty")) == 0
+
+    def test_columns_are_aligned(self, snapshot_file):
+        """Test that every column starts on a 64-byte boundary of the file."""
+        loaded = load_snapshot(snapshot_file)
+        base = np.frombuffer(loaded._mmap, dtype=np.uint8).ctypes.data
+
+        for column in loaded.table("rows").columns.values():
+            assert (column.ctypes.data - base) % snapshot.ALIGNMENT == 0
+
+    def test_stale_source(self, snapshot_file):
+        """Test that a snapshot built from other data is rejected."""
+        with pytest.raises(SnapshotError, match="stale"):
+            load_snapshot(snapshot_file, source="v2")
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing snapshot is reported as such."""
+        with pytest.raises(SnapshotError, match="does not exist"):
+            load_snapshot(tmp_path / "missing.snap")
+
+    def test_corrupt_file(self, snapshot_file):
+        """Test that a flipped byte fails the checksum."""
+        data = bytearray(snapshot_file.read_bytes())
+        data[len(data) // 2] ^= 0xFF
+        snapshot_file.write_bytes(bytes(data))
+
+        with pytest.raises(SnapshotError, match="checksum"):
+            load_snapshot(snapshot_file)
+
+    def test_other_format_version(self, snapshot_file):
+        """Test that files of another format version are rejected."""
+        data = bytearray(snapshot_file.read_bytes())
+        struct.pack_into("<I", data, 8, snapshot.FORMAT_VERSION + 1)
+        snapshot_file.write_bytes(bytes(data))
+
+        with pytest.raises(SnapshotError, match="format version"):
+            load_snapshot(snapshot_file)
+
+    def test_source_fingerprint(self, tmp_path):
+        """Test that fingerprints follow file contents."""
+        source = tmp_path / "data.py"
+        source.write_text("ROWS = 1")
+        before = source_fingerprint([source])
+        source.write_text("ROWS = 2")
+
+        assert source_fingerprint([source]) != before
+        assert source_fingerprint([source], extra="seed=1") != source_fingerprint([source])
+
+
+class TestAggregateTables:
+    """Test cases for persisting the rollup tables."""
+
+    def test_restored_aggregates_answer_the_same(self, tmp_path):
+        """Test that aggregates restored from a snapshot equal the built ones."""
+        analytics.set_mock_enriched_transactions(MOCK_TRANSACTIONS_ENRICHED)
+        built = analytics._trend_aggregates
+        path = tmp_path / "aggregates.snap"
+        write_snapshot(path, built.to_tables())
+
+        restored = TransactionAggregates.from_tables(load_snapshot(path).tables, TransactionCategory)
+        start, end = date(2025, 12, 1), date(2026, 1, 31)
+
+        for granularity in ("day", "week", "month"):
+            assert restored.series(start, end, granularity, "category") == built.series(start, end, granularity, "category")
+        assert restored.category_breakdown(start, end) == built.category_breakdown(start, end)
+        analytics.set_mock_enriched_transactions([])
+
+
+class TestDataSnapshot:
+    """Test cases for saving and mapping the application stores."""
+
+    def test_endpoints_answer_the_same(self, client: TestClient, tmp_path):
+        """Test that stores mapped from a snapshot serve identical responses."""
+        path = str(tmp_path / "data.snap")
+        reconstructed = _load_fixtures()
+        expected = {url: client.get(url).json() for url in URLS}
+        main.save_data_snapshot(path, "fixtures")
+
+        transactions.set_mock_transactions([])
+        analytics.set_mock_enriched_transactions([])
+        accounts.set_mock_accounts([])
+        assert main.load_data_snapshot(path, "fixtures") == reconstructed
+
+        assert isinstance(analytics._mock_enriched_transactions, SharedRows)
+        assert {url: client.get(url).json() for url in URLS} == expected
+        _load_fixtures()
+
+    def test_startup_rebuilds_stale_snapshot(self, client: TestClient, tmp_path, monkeypatch):
+        """Test that startup writes a snapshot, then maps it while it is current."""
+        path = tmp_path / "data.snap"
+        monkeypatch.setattr(main, "DATA_SNAPSHOT_PATH", str(path))
+        monkeypatch.delenv("SHARED_STORE_DIR", raising=False)
+        write_snapshot(path, {}, source="old fixtures")
+
+        with TestClient(main.app):
+            assert isinstance(analytics._mock_enriched_transactions, list)
+        assert load_snapshot(path).source == main.data_source_fingerprint()
+
+        with TestClient(main.app):
+            assert isinstance(analytics._mock_enriched_transactions, SharedRows)
+            assert client.get("/api/v1/bank-account-balances?date=2026-01-15").json()
+        _load_fixtures()
+
+    def test_snapshot_missing_table_is_rebuilt(self, tmp_path):
+        """Test that a well-formed snapshot lacking a store fails as a SnapshotError."""
+        path = tmp_path / "data.snap"
+        write_snapshot(path, {"transactions": ([], ["iban"])}, source="fixtures")
+
+        with pytest.raises(SnapshotError, match="cannot restore"):
+            main.load_data_snapshot(str(path), "fixtures")
+        _load_fixtures()
+
+    def test_fingerprint_covers_stored_columns(self, monkeypatch):
+        """Test that a change of the stored columns invalidates the snapshot."""
+        before = main.data_source_fingerprint()
+        monkeypatch.setattr(main, "model_columns", lambda model: ["iban"])
+
+        assert main.data_source_fingerprint() != before
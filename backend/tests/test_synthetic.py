@@ -0,0 +1,97 @@
+"""Tests for the large-scale synthetic data generator."""
+
+import json
+
+import numpy as np
+import pytest
+
+from app.routes import analytics
+from app.services.enrichment import CATEGORIES
+from tests.fixtures.synthetic import (
+    chunk_records,
+    generate_synthetic_accounts,
+    generate_synthetic_balances,
+    generate_synthetic_transactions,
+    write_jsonl,
+    write_parquet,
+)
+
+
+def _transactions(num: int, seed: int = 7, chunk_size: int = 1_000):
+    accounts = generate_synthetic_accounts(20, seed=seed)
+    return list(generate_synthetic_transactions(
+        num, accounts, "2025-01-01", "2025-12-31", seed=seed, chunk_size=chunk_size
+    ))
+
+
+class TestSyntheticGenerator:
+    """Test cases for the seeded, chunked generators."""
+
+    def test_same_seed_same_data(self):
+        """Test that a seed always yields the same dataset."""
+        first = _transactions(2_500)
+        second = _transactions(2_500)
+
+        for left, right in zip(first, second):
+            for name in left:
+                assert np.array_equal(left[name], right[name])
+
+    def test_different_seed_different_data(self):
+        """Test that seeds change the data."""
+        first = _transactions(500, seed=1)[0]
+        second = _transactions(500, seed=2)[0]
+
+        assert not np.array_equal(first["amount"], second["amount"])
+
+    def test_chunks_sorted_and_complete(self):
+        """Test row counts, date range and global date order across chunks."""
+        chunks = _transactions(2_500)
+        dates = np.concatenate([chunk["operation_date"] for chunk in chunks])
+
+        assert [len(chunk["amount"]) for chunk in chunks] == [1_000, 1_000, 500]
+        assert list(dates) == sorted(dates)
+        assert dates[0] >= "2025-01-01" and dates[-1] <= "2025-12-31"
+
+    def test_valid_categories_and_amounts(self):
+        """Test that rows use known categories and positive amounts."""
+        chunk = _transactions(1_000)[0]
+
+        assert set(chunk["category_id"]) <= set(CATEGORIES)
+        assert (chunk["amount"] > 0).all()
+
+    def test_balances_per_account(self):
+        """Test one balance snapshot per account and sampled day."""
+        accounts = generate_synthetic_accounts(5, seed=3)
+        chunks = list(generate_synthetic_balances(accounts, "2025-01-01", 30, every=10, seed=3))
+        records = [record for chunk in chunks for record in chunk_records(chunk)]
+
+        assert len(records) == 5 * 3
+        assert {record["iban"] for record in records} == set(accounts["iban"])
+
+    def test_records_load_in_analytics_store(self, client):
+        """Test that generated records are valid enriched transactions."""
+        records = [record for chunk in _transactions(300) for record in chunk_records(chunk)]
+        try:
+            analytics.set_mock_enriched_transactions(records)
+            response = client.get("/api/v1/transactions/enriched?from_date=2025-01-01&to_date=2025-12-31")
+            assert response.status_code == 200
+            assert len(response.json()) == 300
+        finally:
+            analytics.set_mock_enriched_transactions([])
+
+    def test_write_jsonl(self, tmp_path):
+        """Test the JSON Lines writer."""
+        path = tmp_path / "transactions.jsonl"
+        count = write_jsonl(_transactions(1_500), path)
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert count == len(lines) == 1_500
+        assert json.loads(lines[0])["category"]["id"] in CATEGORIES
+
+    def test_write_parquet(self, tmp_path):
+        """Test the Parquet writer when pyarrow is installed."""
+        parquet = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "transactions.parquet"
+        count = write_parquet(_transactions(1_500), path)
+
+        assert count == parquet.read_table(path).num_rows == 1_500